@@ -7,8 +7,14 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-from webexpythonsdk import WebexAPI # Import the WebexAPI class from the Webex Python SDK
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
+from webexone.people import iter_people # Streaming helpers for the People API.
 
 # Load environment variables from the .env file.
 load_dotenv()
@@ -18,8 +24,12 @@ bot_token = os.getenv("BOT_TOKEN")
 # Email address for user lookup.
 email = os.getenv("EMAIL")
 
-# Initialize the WebexAPI client with the bot token.
-webex = WebexAPI(bot_token)
+# Get the shared WebexAPI client for the bot token.
+webex = get_client(bot_token)
+
+# Optional directory index. If PEOPLE_INDEX_PATH points at an index built with 08_people_index.py,
+# email lookups are served from it and only misses hit the network.
+people_index = PeopleIndex(webex, path=os.getenv("PEOPLE_INDEX_PATH"))
 
 def all_people():
     """
@@ -27,9 +37,8 @@ def all_people():
     accessible by the authenticated Webex bot/user.
     """
     try:
-        # List all people in the organization.
-        # webex.people.list() returns a GeneratorContainer, which is iterable.
-        all_people_iterator = webex.people.list()
+        # Stream all people in the organization, one page at a time.
+        all_people_iterator = iter_people(webex)
         # Iterate through the people and print their details.
         for person in all_people_iterator:
             print(f"Name: {person.displayName}, Email: {person.emails}")
@@ -46,11 +55,10 @@ def find_people(email_address: str):
         email_address (str): The email address of the person to find.
     """
     try:
-        # List people, filtering by the provided email address.
-        # webex.people.list() returns a GeneratorContainer, which is iterable.
-        found_people_iterator = webex.people.list(email=email_address)
-        # Iterate through the (potentially single) person found and print their details.
-        for person in found_people_iterator:
+        # Resolve the email through the directory index (one list query only on a miss).
+        person = people_index.lookup(email_address)
+        # Print the details of the person found.
+        if person:
             print(f"Name: {person.displayName}, Email: {person.emails}")
     except Exception as e:
         # Catch and print any exceptions that occur during the API call.
@@ -7,8 +7,13 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-from webexpythonsdk import WebexAPI # Import the WebexAPI class from the Webex Python SDK
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
 
 # Load environment variables from the .env file.
 load_dotenv()
@@ -18,8 +23,12 @@ bot_token = os.getenv("BOT_TOKEN")
 # Email address for user lookup and message recipient.
 email = os.getenv("EMAIL")
 
-# Initialize the main WebexAPI client with the bot token.
-webex = WebexAPI(bot_token)
+# Get the shared WebexAPI client for the bot token.
+webex = get_client(bot_token)
+
+# Optional directory index. If PEOPLE_INDEX_PATH points at an index built with 08_people_index.py,
+# email lookups are served from it and only misses hit the network.
+people_index = PeopleIndex(webex, path=os.getenv("PEOPLE_INDEX_PATH"))
 
 def send_teams_message(bot_token: str, message: str, person_email: str):
     """
@@ -30,8 +39,8 @@ def send_teams_message(bot_token: str, message: str, person_email: str):
         message (str): The content of the message to send (supports Markdown).
         person_email (str): The email address of the recipient.
     """
-    # Initialize a new WebexAPI client for sending messages.
-    webexbot = WebexAPI(bot_token)
+    # Reuse the long-lived client for this token instead of building a new one per message.
+    webexbot = get_client(bot_token)
     # Create a direct message to the specified person's email with the given markdown content.
     webexbot.messages.create(toPersonEmail=person_email, markdown=message)
 
@@ -46,13 +55,12 @@ def find_people(email_address: str):
         webexpythonsdk.models.Person: The first person object found, or None if an error occurs or no person is found.
     """
     try:
-        # List people, filtering by the provided email address.
-        # webex.people.list() returns a GeneratorContainer, so convert it to a list for indexing.
-        found_people = list(webex.people.list(email=email_address))
-        
+        # Resolve the email through the directory index (one list query only on a miss).
+        found_person = people_index.lookup(email_address)
+
         # Return the first person object found.
-        if found_people:
-            return found_people[0]
+        if found_person:
+            return found_person
         else:
             print(f"No person found with email: {email_address}.")
             return None
@@ -7,8 +7,13 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-from webexpythonsdk import WebexAPI # Import the WebexAPI class from the Webex Python SDK
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
 
 # Load environment variables from the .env file.
 load_dotenv()
@@ -18,8 +23,12 @@ bot_token = os.getenv("BOT_TOKEN")
 # Your email address, used to find your user ID.
 email = os.getenv("EMAIL")
 
-# Initialize the WebexAPI client with the bot token.
-webex = WebexAPI(bot_token)
+# Get the shared WebexAPI client for the bot token.
+webex = get_client(bot_token)
+
+# Optional directory index. If PEOPLE_INDEX_PATH points at an index built with 08_people_index.py,
+# email lookups are served from it and only misses hit the network.
+people_index = PeopleIndex(webex, path=os.getenv("PEOPLE_INDEX_PATH"))
 
 def create_webex_room(room_title: str):
     """
@@ -54,12 +63,10 @@ def add_person_to_room(room_id: str, person_email: str):
     try:
         # 1. Find the user by email to get their person ID
         print(f"Attempting to find user with email: '{person_email}'...")
-        # webex.people.list() returns a GeneratorContainer, which is iterable.
-        found_people = list(webex.people.list(email=person_email))
-        
-        if found_people:
-            # Assuming the first result is the correct person
-            person_to_add = found_people[0]
+        # Resolve the email through the directory index (one list query only on a miss).
+        person_to_add = people_index.lookup(person_email)
+
+        if person_to_add:
             print(f"Found user: {person_to_add.displayName}, Person ID: {person_to_add.id}")
 
             # 2. Add the user to the specified room
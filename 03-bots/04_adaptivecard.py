@@ -7,9 +7,14 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 from webexpythonsdk import WebexAPI # Import the WebexAPI class from the Webex Python SDK
 
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.cards import get_card # Adaptive Card templates, validated against the 1.3 schema when loaded.
+
 # Load environment variables from the .env file.
 load_dotenv()
 
@@ -21,54 +26,12 @@ email = os.getenv("EMAIL")
 # Initialize the WebexAPI client with the bot token.
 webex = WebexAPI(bot_token)
 
-# Define the Adaptive Card structure.
-# The 'content' field should contain a valid JSON Adaptive Card payload.
-card = {
-    "contentType": "application/vnd.microsoft.card.adaptive",
-    "content":
-        # PASTE YOUR ADAPTIVE CARD JSON HERE!
-        # This is a placeholder for the actual Adaptive Card JSON structure.
-        # Example structure is provided below in 'card_example'.
-        {} # Placeholder for actual card content
-}
+# Load the Adaptive Card from 'cards/first_card.json'.
+# PASTE YOUR ADAPTIVE CARD JSON IN THAT FILE (or add a new file to the 'cards' folder)!
+# Every card is checked against the Adaptive Card 1.3 schema when it is loaded, so a broken
+# card stops the script here with the path of the bad element instead of failing at Webex.
+card = get_card("first_card").render()
 
 # Send a message with the Adaptive Card as an attachment to the specified person.
 # The 'text' parameter can be an optional fallback text if the card cannot be rendered.
 webex.messages.create(toPersonEmail=email, text="Your client does not support Adaptive Cards. Please update your client.", attachments=[card])
-
-'''
-# Example Adaptive Card structure (commented out for reference).
-card_content_example = {
-    "type": "AdaptiveCard",
-    "body": [
-        {
-            "type": "ColumnSet",
-            "columns": [
-                {
-                    "type": "Column",
-                    "items": [
-                        {
-                            "type": "TextBlock",
-                            "weight": "Bolder",
-                            "text": "WebexOne",
-                            "horizontalAlignment": "Left",
-                            "wrap": True,
-                            "color": "Light",
-                            "size": "Large",
-                            "spacing": "Small"
-                        }
-                    ],
-                        "width": "stretch"
-                }
-            ]
-        },
-        {
-            "type": "TextBlock",
-            "text": "This is my first Adaptive Card!",
-            "wrap": True
-        }
-    ],
-    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-    "version": "1.3"
-}
-'''
@@ -7,11 +7,15 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 # Import specific command (EchoCommand) if needed for custom bot functionality.
 from webex_bot.commands.echo import EchoCommand
-# Import the main WebexBot class from the webex_bot library.
-from webex_bot.webex_bot import WebexBot
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Creates a WebexBot (websocket, sharded or webhook mode, see .env).
+from webexone.sharding import create_bot
 
 # Load environment variables from the .env file.
 load_dotenv()
@@ -20,9 +24,9 @@ load_dotenv()
 bot_token = os.getenv("BOT_TOKEN")
 
 # Create a Webex Bot object.
-bot = WebexBot(teams_bot_token=bot_token,         # Authenticate the bot with the provided token.
-               bot_name="WebexOne2025",            # Assign a name to the bot.
-               include_demo_commands=True)         # Include default demonstration commands (e.g., 'echo', 'help').
+bot = create_bot(teams_bot_token=bot_token,         # Authenticate the bot with the provided token.
+                 bot_name="WebexOne2025",            # Assign a name to the bot.
+                 include_demo_commands=True)         # Include default demonstration commands (e.g., 'echo', 'help').
 
 # Start the bot and make it listen for incoming messages.
 bot.run()
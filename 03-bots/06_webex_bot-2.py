@@ -7,10 +7,14 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-from webex_bot.webex_bot import WebexBot # Import the main WebexBot class.
 from webex_bot.models.command import Command # Import the Command base class for creating custom commands.
-from webexpythonsdk import WebexAPI # Import the Webex API SDK for direct API calls.
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.clients import get_client  # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.sharding import create_bot  # Creates a WebexBot (websocket, sharded or webhook mode, see .env).
 
 # Load environment variables from the .env file.
 load_dotenv()
@@ -23,10 +27,10 @@ domain = os.getenv("DOMAIN")
 email = os.getenv("EMAIL")
 
 # Create a Webex Bot object.
-bot = WebexBot(teams_bot_token=bot_token,         # Authenticate the bot with the provided token.
-               bot_name="WebexOne2025",            # Assign a name to the bot.
-               approved_domains=domain,            # Restrict bot interaction to users from this domain.
-               include_demo_commands=False)        # Exclude default demonstration commands.
+bot = create_bot(teams_bot_token=bot_token,         # Authenticate the bot with the provided token.
+                 bot_name="WebexOne2025",            # Assign a name to the bot.
+                 approved_domains=domain,            # Restrict bot interaction to users from this domain.
+                 include_demo_commands=False)        # Exclude default demonstration commands.
 
 class SendMessage(Command):
     """
@@ -59,8 +63,8 @@ class SendMessage(Command):
         # Get the personId of the user who submitted the card from attachment_actions
         personid = attachment_actions.personId
 
-        # Initialize a WebexAPI client with the bot token to send a message.
-        webexbot = WebexAPI(bot_token)
+        # Reuse the long-lived client for the bot token (warm connection pool) to send a message.
+        webexbot = get_client(bot_token)
         # Create a direct message to the person using their ID.
         webexbot.messages.create(toPersonId=personid, markdown="Hello!")
 
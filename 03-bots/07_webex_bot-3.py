@@ -7,12 +7,17 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-from webex_bot.webex_bot import WebexBot  # Import the main WebexBot class for creating and managing the bot.
 from webex_bot.models.command import Command  # Import the Command base class for creating custom bot commands.
 from webex_bot.models.response import Response  # Import Response for sending rich replies, like Adaptive Cards.
 from webex_bot.formatting import quote_info  # Import quote_info for formatting messages as quoted text.
-from webexpythonsdk import WebexAPI  # Import the Webex API SDK for making direct Webex API calls.
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.cards import get_card  # Adaptive Card templates loaded once from the 'cards' folder.
+from webexone.clients import get_client  # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.sharding import create_bot  # Creates a WebexBot (websocket, sharded or webhook mode, see .env).
 
 # Load environment variables from the .env file.
 load_dotenv()
@@ -25,10 +30,10 @@ domain = os.getenv("DOMAIN")
 email = os.getenv("EMAIL")
 
 # Create a Webex Bot object.
-bot = WebexBot(teams_bot_token=bot_token,         # Authenticate the bot using its token.
-               bot_name="WebexOne2025",            # Assign a name to the bot.
-               approved_domains=domain,            # Set an approved domain to restrict bot usage.
-               include_demo_commands=False)        # Exclude default demonstration commands for a cleaner bot.
+bot = create_bot(teams_bot_token=bot_token,         # Authenticate the bot using its token.
+                 bot_name="WebexOne2025",            # Assign a name to the bot.
+                 approved_domains=domain,            # Set an approved domain to restrict bot usage.
+                 include_demo_commands=False)        # Exclude default demonstration commands for a cleaner bot.
 
 class SendMessage(Command):
     """
@@ -61,8 +66,8 @@ class SendMessage(Command):
         # Get the personId of the user who submitted the card from attachment_actions.
         personid = attachment_actions.personId
 
-        # Initialize a WebexAPI client with the bot token to send a message.
-        webexbot = WebexAPI(bot_token)
+        # Reuse the long-lived client for the bot token (warm connection pool) to send a message.
+        webexbot = get_client(bot_token)
         # Create a direct message to the person using their ID with the extracted message content.
         webexbot.messages.create(toPersonId=personid, markdown=message_content)
 
@@ -82,6 +87,8 @@ class AskMessage(Command):
             help_message="Send Message",    # The help text displayed for this command.
             chained_commands=[SendMessage()], # Links this command to the SendMessage callback for card submissions.
             delete_previous_message=True)   # Deletes the Adaptive Card message after submission.
+        # The Adaptive Card for user input, loaded and validated once from 'cards/ask_message.json'.
+        self.card_template = get_card("ask_message")
 
     def execute(self, message, attachment_actions, activity):
         """
@@ -96,39 +103,10 @@ class AskMessage(Command):
         Returns:
             Response: A Response object containing the Adaptive Card to be displayed.
         """
-        # Define the Adaptive Card structure for user input.
-        card = {
-            "contentType": "application/vnd.microsoft.card.adaptive",
-            "content": {
-                "type": "AdaptiveCard",
-                "body": [
-                    {
-                        "type": "Input.Text",
-                        "placeholder": "Message",
-                        "id": "message",
-                        "isRequired": True,
-                        "errorMessage": "Message is required",
-                        "label": "Message:"
-                    }
-                ],
-                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                "version": "1.3",
-                "actions": [
-                    {
-                        "type": "Action.Submit",
-                        "title": "Submit",
-                        "data": {
-                            "callback_keyword": "message_callback" # This links to the SendMessage command.
-                        }
-                    }
-                ]
-            }
-        }
-
         # Create a Response object to send the Adaptive Card.
         response = Response()
         response.text = "Please enter your message:" # Fallback text if the card fails to render.
-        response.attachments = card # Attach the Adaptive Card to the response.
+        response.attachments = self.card_template.render() # Attach the Adaptive Card to the response.
 
         return response
 
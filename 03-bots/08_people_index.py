@@ -0,0 +1,45 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
+
+# Load environment variables from the .env file.
+load_dotenv()
+
+# Access token able to list everyone in the organization (admin token). Falls back to the bot token.
+access_token = os.getenv("WEBEX_ACCESS_TOKEN") or os.getenv("BOT_TOKEN")
+# File the index is stored in. Point PEOPLE_INDEX_PATH at it so the other scripts use it.
+index_path = os.getenv("PEOPLE_INDEX_PATH", "people_index.json")
+# Entries older than this (seconds) are re-fetched when refreshing an existing index.
+max_age = float(os.getenv("PEOPLE_INDEX_MAX_AGE", "86400"))
+
+# Get the shared WebexAPI client for the access token.
+webex = get_client(access_token)
+
+people_index = PeopleIndex(webex, path=index_path)
+
+if len(people_index) == 0 or "--rebuild" in sys.argv:
+    # First run: build the index from one bulk listing of the organization.
+    print("Building people index from a bulk listing...")
+    count = people_index.build()
+    print(f"Indexed {count} people.")
+else:
+    # Later runs: only re-fetch the entries that are older than the maximum age.
+    print(f"Refreshing people index ({len(people_index)} people) entries older than {max_age:.0f}s...")
+    refreshed = people_index.refresh(max_age=max_age)
+    print(f"Refreshed {refreshed} entries, {len(people_index)} people indexed.")
+
+people_index.save()
+print(f"People index saved to {index_path}")
@@ -0,0 +1,63 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Bulk room provisioning.
+
+Usage:
+    python 03-bots/09_bulk_rooms.py rooms.csv [--report results.csv]
+
+rooms.csv has a 'title' column and a 'members' column with emails separated by ';'
+(a JSON list of {"title": ..., "members": [...]} works too). Re-running the same plan
+is safe: existing rooms and memberships are skipped.
+"""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.broadcast import Broadcaster # Concurrent, rate-limit-aware fan-out engine.
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
+from webexone.rooms import load_room_specs, provision_rooms # Bulk room provisioning.
+
+# Load environment variables from the .env file.
+load_dotenv()
+
+# Webex Bot Token for API authentication. The bot creates the rooms and adds the members.
+bot_token = os.getenv("BOT_TOKEN")
+
+parser = argparse.ArgumentParser(description="Create Webex rooms and add their members in bulk.")
+parser.add_argument("plan", help="CSV or JSON file with room titles and member emails")
+parser.add_argument("--report", help="Optional CSV file to write the per-item results to")
+parser.add_argument("--workers", type=int, default=int(os.getenv("BROADCAST_WORKERS", "8")),
+                    help="Requests running at the same time")
+parser.add_argument("--rate", type=float, default=float(os.getenv("BROADCAST_RATE", "5")),
+                    help="Maximum requests per second")
+args = parser.parse_args()
+
+# The Broadcaster handles rate limits, so the SDK must raise on '429' instead of sleeping.
+webex = get_client(bot_token, wait_on_rate_limit=False)
+# Member emails are resolved through the directory index (loaded from disk if PEOPLE_INDEX_PATH exists).
+people_index = PeopleIndex(get_client(bot_token), path=os.getenv("PEOPLE_INDEX_PATH"))
+
+specs = load_room_specs(args.plan)
+print(f"Provisioning {len(specs)} rooms with {sum(len(s.members) for s in specs)} memberships...")
+
+report = provision_rooms(webex, specs, people_index=people_index,
+                         broadcaster=Broadcaster(max_workers=args.workers, rate=args.rate))
+
+# Print the per-item results followed by the totals and throughput.
+for result in report.results:
+    print(f"{result.kind:<10} {result.status:<9} {result.title} {result.email} {result.detail}")
+print(report)
+
+if args.report:
+    report.write_csv(args.report)
+    print(f"Results written to {args.report}")
@@ -0,0 +1,42 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Replays webhook payloads against a bot running in webhook mode.
+
+Usage:
+    python 03-bots/10_webhook_replay.py payloads.jsonl [--url http://localhost:8080/]
+    python 03-bots/10_webhook_replay.py 03-bots/webhook_samples.json --resign
+
+Start the bot first with BOT_INGRESS="webhook" (and WEBEX_BASE_URL pointing at a mock
+server to stay fully local). Payloads recorded with WEBHOOK_RECORD_PATH are replayed
+with their original signatures; hand-written ones (like webhook_samples.json) must be
+signed again with WEBHOOK_SECRET (--resign).
+"""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.webhooks import replay # Posts recorded webhook payloads to a receiver.
+
+# Load environment variables from the .env file.
+load_dotenv()
+
+parser = argparse.ArgumentParser(description="Replay recorded webhook payloads against a local bot.")
+parser.add_argument("payloads", help="JSON Lines file recorded with WEBHOOK_RECORD_PATH, or a JSON list of payloads")
+parser.add_argument("--url", default=f"http://localhost:{os.getenv('WEBHOOK_PORT', '8080')}/",
+                    help="URL of the webhook receiver")
+parser.add_argument("--resign", action="store_true", help="Sign the payloads again with WEBHOOK_SECRET")
+args = parser.parse_args()
+
+statuses = replay(args.url, args.payloads, secret=os.getenv("WEBHOOK_SECRET") if args.resign else None)
+for number, status in enumerate(statuses, start=1):
+    print(f"Payload {number}: {status}")
+print(f"Replayed {len(statuses)} payloads, {statuses.count(200)} accepted")
@@ -6,12 +6,17 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 - Phil Bellanti
 """
 
-import requests
 import json
 import os
+import sys
 import datetime
 from dotenv import load_dotenv
 
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.oauth import TokenManager # Proactive OAuth token refresh.
+from webexone.session import api_url, get_session # Shared keep-alive connection pool with timeouts and retries.
+
 # This environment variable is often set for local development to allow insecure HTTP for OAuth.
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
@@ -32,28 +37,18 @@ refresh_token = os.getenv("REFRESH_TOKEN") # Refresh token obtained after admin
 email = os.getenv("EMAIL") # Email address of the host for meeting creation.
 
 """
-Function Name : get_tokens_refresh()
-Description : This is a utility function that leverages the refresh token
-              in exchange for a fresh access_token and refresh_token
-              when a 401 is received when using an invalid access_token
-              while making an api_call().
-              NOTE: in production, auth tokens would not be stored
-              in a Session. This app will request a new token each time
-              it runs which will not be able to check against expired tokens. 
+Token management : The TokenManager tracks when the access token expires and
+                   refreshes it (with the refresh token) shortly before that happens,
+                   both on demand and from a background thread, so API calls never
+                   have to fail with a 401 first. The token pair is saved to
+                   TOKEN_STORE_PATH, so the next run reuses it instead of
+                   requesting a new token each time it starts.
 """
-def get_tokens_refresh():
-    print("function : get_token_refresh()")
-    
-    url = "https://webexapis.com/v1/access_token"
-    headers = {'accept':'application/json','content-type':'application/x-www-form-urlencoded'}
-    payload = ("grant_type=refresh_token&client_id={0}&client_secret={1}&"
-                    "refresh_token={2}").format(clientID, secretID, refresh_token)
-    req = requests.post(url=url, data=payload, headers=headers)
-    results = json.loads(req.text)
-
-    print("Token returned in refresh result : ", results["access_token"])
-    print("Refresh Token returned in refresh result : ", results["refresh_token"])
-    return results["access_token"], results["refresh_token"]
+token_manager = TokenManager(clientID, secretID,
+                             access_token=access_token,
+                             refresh_token=refresh_token,
+                             store_path=os.getenv("TOKEN_STORE_PATH", "service_app_tokens.json"))
+token_manager.start()
 
 """
 Function Name : create_meeting()
@@ -73,12 +68,19 @@ def create_meeting() :
     'hostEmail' : email
     }
 
+    # Always a valid token: the manager refreshes it before it expires.
+    current_token = token_manager.get_access_token()
     headers = {
-        'Authorization': f'Bearer {access_token}',         # https://oauth.net/2/bearer-tokens/
+        'Authorization': f'Bearer {current_token}',        # https://oauth.net/2/bearer-tokens/
         'Content-Type': 'application/json',                # https://developer.mozilla.org/en-US/docs/Learn/JavaScript/Objects/JSON
     }
 
-    response = requests.post('https://webexapis.com/v1/meetings', headers=headers, data=json.dumps(body)) # https://developer.webex.com/docs/meetings
+    response = get_session().post(api_url("meetings"), headers=headers, data=json.dumps(body)) # https://developer.webex.com/docs/meetings
+
+    if response.status_code == 401:
+        # Safety net for tokens revoked before their expiry: refresh once and retry.
+        headers['Authorization'] = f'Bearer {token_manager.refresh(stale_token=current_token)}'
+        response = get_session().post(api_url("meetings"), headers=headers, data=json.dumps(body))
 
     if response.status_code == 200:
         print('statusCode:', response.status_code)
@@ -87,12 +89,4 @@ def create_meeting() :
         print('Error:', response.status_code, response.text)
     return response
 
-#the below line is commented out, but will force the app to produce a 401 and invoke the refresh token function
-#access_token += 'joe'
-
-#print("before call", access_token)
 response = create_meeting()
-
-if (response.status_code == 401) :
-    access_token, refresh_token = get_tokens_refresh()
-    create_meeting()
@@ -0,0 +1,65 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Bulk meeting scheduler.
+
+Usage:
+    python 04-serviceapps/02_bulk_meetings.py schedule.csv [--checkpoint schedule.checkpoint.jsonl]
+
+schedule.csv has the columns hostEmail,title,start,end (ISO 8601 times). Progress is written
+to the checkpoint file, so running the same command again after a crash resumes the batch
+without double-booking meetings that were already created.
+"""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.broadcast import Broadcaster # Concurrent, rate-limit-aware fan-out engine.
+from webexone.checkpoint import Checkpoint # Append-only progress file for resumable batches.
+from webexone.meetings import load_schedule, schedule_meetings # Bulk meeting scheduling.
+from webexone.oauth import TokenManager # Proactive OAuth token refresh.
+
+# Load environment variables from the .env file
+load_dotenv()
+
+clientID = os.getenv("CLIENTID") # Client ID for your Webex service app
+secretID = os.getenv("SECRETID") # Client Secret for your Webex service app
+access_token = os.getenv("WEBEX_ACCESS_TOKEN") # Access token obtained after admin authorization
+refresh_token = os.getenv("REFRESH_TOKEN") # Refresh token obtained after admin authorization
+
+parser = argparse.ArgumentParser(description="Create many Webex meetings from a schedule file.")
+parser.add_argument("schedule", help="CSV or JSON file with hostEmail, title, start and end")
+parser.add_argument("--checkpoint", help="Progress file (default: <schedule>.checkpoint.jsonl)")
+parser.add_argument("--workers", type=int, default=int(os.getenv("BROADCAST_WORKERS", "8")),
+                    help="Requests running at the same time")
+parser.add_argument("--rate", type=float, default=float(os.getenv("BROADCAST_RATE", "5")),
+                    help="Maximum requests per second")
+args = parser.parse_args()
+
+# The token manager refreshes the service app token before it expires.
+token_manager = TokenManager(clientID, secretID,
+                             access_token=access_token,
+                             refresh_token=refresh_token,
+                             store_path=os.getenv("TOKEN_STORE_PATH", "service_app_tokens.json"))
+
+rows = load_schedule(args.schedule)
+checkpoint = Checkpoint(args.checkpoint or f"{args.schedule}.checkpoint.jsonl")
+print(f"Scheduling {len(rows)} meetings (checkpoint: {checkpoint.path})...")
+
+report = schedule_meetings(token_manager, rows, checkpoint,
+                           broadcaster=Broadcaster(max_workers=args.workers, rate=args.rate))
+checkpoint.close()
+
+# Print the per-row status report followed by the totals and throughput.
+for result in report.results:
+    print(f"Row {result.row.number:>4}: {result.status:<17} {result.row.host_email} '{result.row.title}' "
+          f"{result.row.start} {result.detail}")
+print(report)
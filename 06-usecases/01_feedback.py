@@ -6,17 +6,34 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 - Phil Bellanti
 """
 
+import logging
 import os
+import sys
+from datetime import date
 from dotenv import load_dotenv
-from webex_bot.webex_bot import WebexBot  # Import the main WebexBot class for creating and managing the bot.
 from webex_bot.models.command import Command  # Import the Command base class for creating custom bot commands.
-from webex_bot.models.response import Response  # Import Response for sending rich replies, like Adaptive Cards.
+from webex_bot.models.response import Response  # Import Response for sending rich replies, like Adaptive Cards, or files.
 from webex_bot.formatting import quote_info  # Import quote_info for formatting messages as quoted text.
-from webexpythonsdk import WebexAPI  # Import the Webex API SDK for making direct Webex API calls.
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.cache import PersonCache  # TTL + LRU cache in front of the People API.
+from webexone.cards import get_card, send_card  # Pre-serialized Adaptive Card templates.
+from webexone.clients import get_client  # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.sharding import create_bot  # Creates a WebexBot (websocket, sharded or webhook mode, see .env).
+from webexone.feedback import FeedbackStore  # Local store of the feedback submissions (digests, reports, CSV).
+from webexone.jobs import JobQueue, JobStatusCommand  # Durable background jobs that survive restarts.
+from webexone.ledger import DELIVERED, FAILED, LedgerStore  # Per-recipient delivery ledger of each broadcast.
+from webexone.logs import sampled, setup_logging  # Buffered JSON logging (LOG_LEVEL, LOG_SAMPLE_RATE).
+from webexone.people import iter_people  # Streaming helpers for the People API.
 
 # Load environment variables from the .env file.
 load_dotenv()
 
+# JSON logs, written by a background thread so the broadcast never waits on the console.
+setup_logging()
+log = logging.getLogger("feedback_bot")
+
 # Webex Bot Token for authentication with the Webex API.
 bot_token = os.getenv("BOT_TOKEN")
 # Approved domain for bot interactions.
@@ -26,15 +43,35 @@ access_token = os.getenv("WEBEX_ACCESS_TOKEN")
 # The specific email address that is allowed to execute restricted commands AND will receive feedback.
 email = os.getenv("EMAIL")
 
-# Initialize the global WebexAPI client with the bot token.
+# Get the shared WebexAPI client for the bot token.
 # This client can be used for general API calls, like getting user details.
-webex = WebexAPI(bot_token)
+webex = get_client(bot_token)
+
+# Person lookups shared by every command. The sender of a command is usually resolved
+# several times in a row (email lookup, access check), so repeated lookups hit the cache.
+person_cache = PersonCache(webex,
+                           ttl=float(os.getenv("PERSON_CACHE_TTL", "300")),  # Seconds a person stays cached.
+                           negative_ttl=60)                                   # Seconds a "not found" ID stays cached.
+
+# Persistent queue the feedback broadcast runs on. One task per recipient is stored in a
+# local SQLite file, so a restarted bot resumes a broadcast instead of starting it over.
+jobs = JobQueue(os.getenv("JOB_QUEUE_PATH", "jobs.sqlite3"),
+                workers=int(os.getenv("BROADCAST_WORKERS", "8")),  # Sends running at the same time.
+                rate=float(os.getenv("BROADCAST_RATE", "5")))     # Maximum sends per second.
+
+# One append-only delivery ledger per broadcast ID. Running a broadcast again with the same ID
+# skips everyone who already got the card and only retries the failures.
+ledgers = LedgerStore(os.getenv("LEDGER_PATH", "ledgers"))
+
+# Feedback submissions are stored locally (written in batches) instead of being forwarded one
+# by one; the admin gets a periodic digest and can ask for a full report with 'feedback report'.
+feedback_store = FeedbackStore(os.getenv("FEEDBACK_STORE_PATH", "feedback.sqlite3"))
 
 # Create a Webex Bot object.
-bot = WebexBot(teams_bot_token=bot_token,         # Authenticate the bot using its token.
-               bot_name="WebexOne2025",            # Assign a name to the bot.
-               approved_domains=domain,            # Set an approved domain to restrict bot usage.
-               include_demo_commands=False)        # Exclude default demonstration commands for a cleaner bot.
+bot = create_bot(teams_bot_token=bot_token,         # Authenticate the bot using its token.
+                 bot_name="WebexOne2025",            # Assign a name to the bot.
+                 approved_domains=domain,            # Set an approved domain to restrict bot usage.
+                 include_demo_commands=False)        # Exclude default demonstration commands for a cleaner bot.
 
 def get_sender_email_from_person_id(person_id: str) -> str:
     """
@@ -47,12 +84,12 @@ def get_sender_email_from_person_id(person_id: str) -> str:
         str: The primary email address of the person, or "unknown@example.com" if not found/error.
     """
     try:
-        person = webex.people.get(person_id)
-        if person.emails:
+        person = person_cache.get(person_id)
+        if person and person.emails:
             return person.emails[0]
         return "unknown@example.com"
     except Exception as e:
-        print(f"DEBUG: Error retrieving email for person ID {person_id}: {e}")
+        log.warning("Error retrieving the email of a person: %s", e, extra={"person_id": person_id})
         return "unknown@example.com"
 
 def is_allowed_sender(person_id: str) -> bool:
@@ -66,26 +103,27 @@ def is_allowed_sender(person_id: str) -> bool:
         bool: True if the user's email matches Admin Email, False otherwise.
     """
     if not email:
-        print("DEBUG: Admin Email is not set in .env. All users are implicitly blocked from restricted commands.")
+        log.warning("Admin Email is not set in .env. All users are implicitly blocked from restricted commands.")
         return False # If no allowed email is configured, no one is allowed.
 
     try:
-        # Retrieve the person's details using their ID.
-        person = webex.people.get(person_id)
-        current_user_email = person.emails[0].lower() if person.emails else ""
-        print(f"DEBUG: Checking sender {current_user_email} (ID: {person_id}) against allowed email {email.lower()}")
+        # Retrieve the person's details using their ID (served from the cache when possible).
+        person = person_cache.get(person_id)
+        current_user_email = person.emails[0].lower() if person and person.emails else ""
+        log.debug("Checking the sender against the allowed email", extra={"email": current_user_email, "person_id": person_id})
         # Compare the user's primary email to the allowed email. Case-insensitive comparison.
         if current_user_email == email.lower():
             return True
         return False
     except Exception as e:
-        print(f"DEBUG: Error retrieving person details for {person_id} for access check: {e}")
+        log.warning("Error retrieving the person details for the access check: %s", e, extra={"person_id": person_id})
         return False
 
 class SubmitFeedbackCommand(Command):
     """
     This class handles the submission of the feedback Adaptive Card.
     It's a chained command, triggered by the card's submit action.
+    Storing a submission is a local write, so it runs inline and only the thank-you is posted.
     """
     def __init__(self):
         super().__init__(
@@ -99,37 +137,34 @@ class SubmitFeedbackCommand(Command):
         sender_person_id = attachment_actions.personId
         sender_email = get_sender_email_from_person_id(sender_person_id)
 
-        print(f"DEBUG: Feedback submitted by {sender_email} (ID: {sender_person_id})")
-        print(f"DEBUG: Feedback content: '{feedback_text}'")
+        # One event per submission: sampled, and without the feedback text itself.
+        log.info("Feedback submitted", extra=sampled(email=sender_email, person_id=sender_person_id,
+                                                     length=len(feedback_text or "")))
 
-        # Initialize a WebexAPI client to send the feedback to the designated email.
-        webexbot_for_sending = WebexAPI(bot_token)
-        
         try:
-            # Construct the message to be sent to the feedback recipient (your email).
-            feedback_message_to_you = f"**New Feedback Received!**\n\n" \
-                                      f"**From:** {sender_email}\n" \
-                                      f"**Feedback:**\n```\n{feedback_text}\n```"
-            
-            # Send the feedback to the Admin Email.
-            webexbot_for_sending.messages.create(toPersonEmail=email, markdown=feedback_message_to_you)
-            print(f"DEBUG: Feedback successfully forwarded to {email}")
+            # Store the feedback. The admin receives it with the next digest (or 'feedback report').
+            feedback_store.add(sender_person_id, sender_email, feedback_text)
 
             # Return a confirmation message to the user who submitted the feedback.
             return quote_info("Thank you for your feedback! It has been submitted.")
         except Exception as e:
-            print(f"DEBUG: Error sending feedback to {email}: {e}")
+            log.error("Error storing feedback: %s", e, extra={"email": sender_email})
             return quote_info(f"There was an error submitting your feedback. Please try again later. Error: {e}")
 
 class SendFeedbackToAllCommand(Command):
     """
     This command, when triggered by an authorized user, sends an Adaptive Card
     to ALL users in the organization to collect feedback.
+    The broadcast runs as a background job; 'status <job ID>' shows its progress.
+
+    Usage: 'feedback [broadcast ID]'. The broadcast ID defaults to 'feedback-<today's date>';
+    sending the same broadcast ID again only reaches the people who didn't get the card yet.
+    'feedback report' answers with a summary of the submissions and a CSV export of all of them.
     """
     def __init__(self):
         super().__init__(
             command_keyword="feedback", # The keyword users type to activate this command.
-            help_message="Send feedback card to all users in the organization",
+            help_message="Send feedback card to all users in the organization ('feedback report' for the results)",
             chained_commands=[SubmitFeedbackCommand()], # Links to SubmitFeedbackCommand for card submission.
             delete_previous_message=True) 
 
@@ -138,84 +173,111 @@ class SendFeedbackToAllCommand(Command):
         sender_person_id = attachment_actions.personId
         sender_email = get_sender_email_from_person_id(sender_person_id)
 
-        print(f"DEBUG: SendFeedbackToAllCommand triggered by {sender_email} (ID: {sender_person_id})")
+        log.info("SendFeedbackToAllCommand triggered", extra={"email": sender_email, "person_id": sender_person_id})
 
         # --- Access Check ---
         if not is_allowed_sender(sender_person_id):
-            print(f"DEBUG: Unauthorized user {sender_email} attempted to execute SendFeedbackToAllCommand.")
+            log.warning("Unauthorized user attempted to execute SendFeedbackToAllCommand", extra={"email": sender_email})
             return quote_info("Error: You are not authorized to send feedback requests to the entire organization.")
-        print(f"DEBUG: Authorized sender {sender_email} executing SendFeedbackToAllCommand.")
+        log.debug("Authorized sender executing SendFeedbackToAllCommand", extra={"email": sender_email})
         # --- End Access Check ---
 
-        # Initialize a WebexAPI client using the admin-level access_token
-        # to list all people in the organization.
-        webex_admin_client = WebexAPI(access_token=access_token)
-        
-        # Define the Adaptive Card structure for feedback input.
-        feedback_card_content = {
-            "type": "AdaptiveCard",
-            "body": [
-                {
-                    "type": "TextBlock",
-                    "text": "We'd love to hear your thoughts!",
-                    "wrap": True,
-                    "size": "Medium",
-                    "weight": "Bolder"
-                },
-                {
-                    "type": "Input.Text",
-                    "placeholder": "Enter your feedback here...",
-                    "id": "feedback_input", # This ID will be used to extract the input value.
-                    "isMultiline": True,
-                    "isRequired": True,
-                    "errorMessage": "Feedback cannot be empty.",
-                    "label": "Your Feedback:"
-                }
-            ],
-            "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-            "version": "1.3",
-            "actions": [
-                {
-                    "type": "Action.Submit",
-                    "title": "Submit Feedback",
-                    "data": {
-                        "callback_keyword": "feedback_submit" # This links to SubmitFeedbackCommand.
-                    }
-                }
-            ]
-        }
-        feedback_card = {
-            "contentType": "application/vnd.microsoft.card.adaptive",
-            "content": feedback_card_content
-        }
+        if message.strip().lower() == "report":
+            return feedback_report()
 
-        try:
-            # List all people in the organization.
-            all_people = list(webex_admin_client.people.list())
-            print(f"DEBUG: Found {len(all_people)} people in the organization to send feedback card to.")
-
-            # Send the Adaptive Card to each person.
-            for person in all_people:
-                if person.emails: # Ensure the person has an email address.
-                    try:
-                        webex.messages.create(
-                            toPersonEmail=person.emails[0],
-                            text="Please provide your feedback:", # Fallback text.
-                            attachments=[feedback_card]
-                        )
-                        print(f"DEBUG: Feedback card sent to {person.emails[0]}")
-                    except Exception as send_e:
-                        print(f"DEBUG: Error sending feedback card to {person.emails[0]}: {send_e}")
-            
-            return quote_info("Feedback cards have been sent to all users in the organization.")
+        # Queue the broadcast. The job workers list the organization and send the cards.
+        broadcast_id = message.strip() or f"feedback-{date.today().isoformat()}"
+        job_id = jobs.enqueue("feedback_broadcast", {"requested_by": sender_email, "broadcast_id": broadcast_id},
+                              room_id=attachment_actions.roomId)
+        log.info("Feedback broadcast queued", extra={"broadcast_id": broadcast_id, "job_id": job_id})
+        return quote_info(f"Sending the feedback card to all users in the organization (broadcast {broadcast_id}, job {job_id}). "
+                          f"Type 'status {job_id}' to follow its progress; I'll post a summary here when it's done.")
 
-        except Exception as e:
-            print(f"DEBUG: Error when sending feedback cards to all users: {e}")
-            return quote_info(f"An error occurred while trying to send feedback cards to all users: {e}")
+def feedback_report() -> Response:
+    """
+    Summarizes every feedback submission in one message, with the CSV export attached.
+    """
+    feedback_store.flush()  # Include the submissions still waiting to be written.
+    response = Response()
+    response.markdown = feedback_store.report()
+    if feedback_store.count():
+        export_path = os.getenv("FEEDBACK_EXPORT_PATH", "feedback.csv")
+        exported = feedback_store.export_csv(export_path)
+        log.info("Exported %d feedback submission(s) to %s", exported, export_path)
+        response.files = export_path
+    return response
 
+# The feedback Adaptive Card, loaded once from 'cards/feedback.json'. Its JSON is pre-serialized,
+# so sending it to one more person only fills in the title instead of serializing the whole card.
+feedback_card = get_card("feedback")
+# Title shown on the feedback card (the card's '${title}' field).
+feedback_title = os.getenv("FEEDBACK_TITLE", "We'd love to hear your thoughts!")
+
+def plan_feedback_broadcast(payload: dict):
+    """
+    Lists the recipients of a feedback broadcast: one task per person with an email address,
+    keyed by the email so a re-planned job never sends the card twice to the same person.
+    People the broadcast's ledger already has as delivered (an earlier run) are skipped.
+    """
+    ledger = ledgers.get(payload["broadcast_id"])
+    # Stream all people in the organization with the admin-level access token.
+    for person in iter_people(get_client(access_token)):
+        if person.emails and not ledger.delivered(person.emails[0].lower()):
+            yield person.emails[0].lower(), {"email": person.emails[0], "broadcast_id": payload["broadcast_id"]}
+
+def send_feedback_card(task: dict):
+    """
+    Sends the Adaptive Card to one person. The request body is posted as pre-rendered JSON
+    through the pooled session; errors (including '429') are retried by the job queue.
+    Every attempt is recorded in the broadcast's ledger (the last attempt wins).
+    """
+    ledger = ledgers.get(task["broadcast_id"])
+    try:
+        send_card(bot_token, feedback_card,
+                  text="Please provide your feedback:", # Fallback text.
+                  to_person_email=task["email"],
+                  title=feedback_title)
+    except Exception as e:
+        ledger.record(task["email"].lower(), FAILED, str(e))
+        raise
+    ledger.record(task["email"].lower(), DELIVERED)
+    # Per-recipient event: only a sample is logged, the ledger has them all.
+    log.info("Feedback card sent", extra=sampled(email=task["email"], broadcast_id=task["broadcast_id"]))
+
+def post_broadcast_summary(job: dict, progress: dict):
+    """
+    Posts the outcome of a feedback broadcast to the room that asked for it.
+    """
+    for task in jobs.results(job["id"], status="failed"):
+        log.warning("Error sending the feedback card: %s", task["error"], extra={"email": task["key"], "job_id": job["id"]})
+    log.info("Feedback broadcast finished. %s", jobs.describe(job["id"]), extra={"job_id": job["id"]})
+    if job["status"] == "failed":
+        text = f"An error occurred while trying to send feedback cards to all users: {job['error']}"
+    else:
+        # The ledger counts every run of this broadcast, not only this job.
+        broadcast_id = job["payload"]["broadcast_id"]
+        summary = ledgers.get(broadcast_id).summary()
+        text = (f"Feedback cards have been sent to all users in the organization. "
+                f"Delivered: {progress['done']}, Failed: {progress['failed']} (job {job['id']}). "
+                f"Broadcast {broadcast_id} so far: {summary[DELIVERED]} delivered, {summary[FAILED]} failed.")
+        if summary[FAILED]:
+            text += f" Type 'feedback {broadcast_id}' to retry the failures."
+    webex.messages.create(roomId=job["room_id"], markdown=quote_info(text))
+
+jobs.register("feedback_broadcast", send_feedback_card, plan=plan_feedback_broadcast, on_complete=post_broadcast_summary)
 
 # Add the custom commands to the bot.
 bot.add_command(SendFeedbackToAllCommand())
+bot.add_command(JobStatusCommand(jobs))
+
+# Start the job workers. Broadcasts interrupted by a restart are resumed.
+jobs.start()
+
+# Send the admin a digest of the new feedback every FEEDBACK_DIGEST_INTERVAL seconds (0 disables it).
+digest_interval = float(os.getenv("FEEDBACK_DIGEST_INTERVAL", "3600"))
+if email and digest_interval > 0:
+    feedback_store.start_digest(lambda markdown: webex.messages.create(toPersonEmail=email, markdown=markdown),
+                                digest_interval)
 
 # Start the bot and make it listen for incoming messages.
 bot.run()
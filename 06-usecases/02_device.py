@@ -6,22 +6,40 @@ Webex One 2025 - Exploring the possibilities of Webex APIs
 - Phil Bellanti
 """
 
-from webex_bot.webex_bot import WebexBot
 from webex_bot.formatting import quote_info
 from webex_bot.models.command import Command
 from webex_bot.models.response import Response
 from dotenv import load_dotenv
+import logging
 import os
+import sys
 import requests
-import re
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.cards import get_card
+from webexone.clients import get_client
+from webexone.sharding import create_bot
+from webexone.devices import is_valid_mac_address, provision_device
+from webexone.jobs import JobQueue, JobStatusCommand
+from webexone.logs import sampled, setup_logging
 
 # Load environment variables from the .env file.
 load_dotenv()
 
+setup_logging()
+log = logging.getLogger("device_bot")
+
 bot_token = os.getenv("BOT_TOKEN")
 domain = os.getenv("DOMAIN")
 access_token = os.getenv("WEBEX_ACCESS_TOKEN")
 
+webex = get_client(bot_token)
+
+# Provisioning requests are stored in a persistent job queue and run by background workers,
+# so they don't block the bot's message loop and survive a restart of the bot.
+jobs = JobQueue(os.getenv("JOB_QUEUE_PATH", "jobs.sqlite3"), workers=4)
+
 class AutoProvisioning(Command):
 
     def __init__(self):
@@ -30,6 +48,8 @@ class AutoProvisioning(Command):
             help_message="Provision your new IP Phone",
             chained_commands=[ProvisionCallback()],
             delete_previous_message=True)
+        # Loaded and validated once, when the bot starts, from 'cards/auto_provisioning.json'.
+        self.card_template = get_card("auto_provisioning")
 
     def execute(self, message, attachment_actions, activity):
         """
@@ -40,93 +60,12 @@ class AutoProvisioning(Command):
         :return: a string or Response object (or a list of either). Use Response if you want to return another card.
         """
 
-        card = {
-            "contentType": "application/vnd.microsoft.card.adaptive",
-            "content": {
-                "type": "AdaptiveCard",
-                "body": [
-                    {
-                        "type": "ColumnSet",
-                        "columns": [
-                            {
-                                "type": "Column",
-                                "items": [
-                                    {
-                                        "type": "TextBlock",
-                                        "weight": "Bolder",
-                                        "text": "Welcome to the Auto-Provisioning Bot!\n",
-                                        "horizontalAlignment": "Left",
-                                        "wrap": True,
-                                        "color": "Light",
-                                        "size": "Large",
-                                        "spacing": "Small"
-                                    }
-                                ],
-                                "width": "stretch"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "TextBlock",
-                        "text": "Please, insert the MAC address of your new phone:",
-                        "wrap": True
-                    },
-                    {
-                        "type": "Input.ChoiceSet",
-                        "choices": [
-                            {
-                                "title": "DMS Cisco 8851",
-                                "value": "DMS Cisco 8851"
-                            },
-                            {
-                                "title": "DMS Cisco 8861",
-                                "value": "DMS Cisco 8861"
-                            },
-                            {
-                                "title": "DMS Cisco 8865",
-                                "value": "DMS Cisco 8865"
-                            }
-                        ],
-                        "placeholder": "Phone model",
-                        "id": "model",
-                        "isRequired": True,
-                        "errorMessage": "model is required",
-                        "label": "Select mode:"
-                    },
-                    {
-                        "type": "Input.Text",
-                        "placeholder": "MAC Address",
-                        "id": "mac_address",
-                        "isRequired": True,
-                        "errorMessage": "MAC is required",
-                        "label": "MAC Address:"
-                    }
-                ],
-                "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                "version": "1.3",
-                "actions": [
-                    {
-                        "type": "Action.Submit",
-                        "title": "Submit",
-                        "data": {
-                            "callback_keyword": "provision_callback"
-                        }
-                    }
-                ]
-            }
-        }
-
         response = Response()
         response.text = "Text"
-        response.attachments = card
+        response.attachments = self.card_template.render()
 
         return response
 
-def is_valid_mac_address(mac):
-    # Regular expression for a MAC address
-    pattern = r'^[0-9A-Fa-f]{12}$'
-    return bool(re.match(pattern, mac))
-
 class ProvisionCallback(Command):
 
     def __init__(self):
@@ -142,38 +81,47 @@ class ProvisionCallback(Command):
         if not is_valid_mac_address(mac_address):
             return quote_info("MAC Address format is incorrect. Introduce MAC Address like A1B2C3D4E5F6")
 
-        url = "https://webexapis.com/v1/devices"
-
-        payload = {
-            "mac": mac_address,
-            "model": model,
-            "personId": personid
-        }
-
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": f"Bearer {access_token}"
-        }
-
-        response = requests.request('POST', url, headers=headers, json=payload)
-        print(f"{payload} {headers}")
-
-        if response.status_code == 200:
-            return quote_info("MAC Address added successfully")
-        elif response.status_code == 409:
-            return quote_info("MAC Address is duplicated")
-        else:
-            return quote_info("There was an error")
+        # One task, keyed by the MAC address (its idempotency key).
+        job_id = jobs.enqueue("provision_device", room_id=attachment_actions.roomId,
+                              tasks=[(mac_address.upper(), {"mac": mac_address, "model": model, "personId": personid})])
+        return quote_info(f"Provisioning your phone (job {job_id}). I'll let you know here when it's done.")
+
+def provision_task(task):
+    response = provision_device(access_token, task["mac"], task["model"], task["personId"])
+    log.info("Device provisioning answered %s", response.status_code,
+             extra=sampled(mac=task["mac"], model=task["model"], person_id=task["personId"]))
+
+    if response.status_code == 200:
+        return "added"
+    elif response.status_code == 409:
+        return "duplicated"
+    # Raised with the response, so the job queue retries '429' and '5xx' answers.
+    raise requests.HTTPError(f"{response.status_code} - {response.text}", response=response)
+
+def post_provisioning_result(job, progress):
+    result = jobs.results(job["id"])[0]
+    if result["result"] == "added":
+        text = "MAC Address added successfully"
+    elif result["result"] == "duplicated":
+        text = "MAC Address is duplicated"
+    else:
+        text = "There was an error"
+    webex.messages.create(roomId=job["room_id"], markdown=quote_info(text))
+
+jobs.register("provision_device", provision_task, on_complete=post_provisioning_result)
 
 # Create a Bot Object
-bot = WebexBot(teams_bot_token=bot_token,
-               bot_name="WebexOne2025",
-               approved_domains=domain,
-               )
+bot = create_bot(teams_bot_token=bot_token,
+                 bot_name="WebexOne2025",
+                 approved_domains=domain,
+                 )
 
 # Add new commands for the bot to listen out for.
 bot.add_command(AutoProvisioning())
+bot.add_command(JobStatusCommand(jobs))
+
+# Start the job workers. Requests left over by a previous run are picked up again.
+jobs.start()
 
 # Call `run` for the bot to wait for incoming messages.
 bot.run()
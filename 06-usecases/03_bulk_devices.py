@@ -0,0 +1,70 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Bulk device auto-provisioning.
+
+Usage:
+    python 06-usecases/03_bulk_devices.py devices.csv [--results devices.results.csv]
+
+devices.csv has the columns mac, model and email, e.g.:
+    mac,model,email
+    A1B2C3D4E5F6,8851,alice@example.com
+
+Every row is validated before anything is sent. Devices whose MAC address is already
+provisioned are reported as duplicates.
+"""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.broadcast import Broadcaster # Concurrent, rate-limit-aware fan-out engine.
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.devices import load_device_rows, provision_devices, validate_rows # Device provisioning.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
+
+# Load environment variables from the .env file.
+load_dotenv()
+
+# Admin access token allowed to add devices and look up people.
+access_token = os.getenv("WEBEX_ACCESS_TOKEN")
+
+parser = argparse.ArgumentParser(description="Provision many IP phones from a CSV file.")
+parser.add_argument("devices", help="CSV file with mac, model and email columns")
+parser.add_argument("--results", help="Results CSV file (default: <devices>.results.csv)")
+parser.add_argument("--workers", type=int, default=int(os.getenv("BROADCAST_WORKERS", "8")),
+                    help="Requests running at the same time")
+parser.add_argument("--rate", type=float, default=float(os.getenv("BROADCAST_RATE", "5")),
+                    help="Maximum requests per second")
+args = parser.parse_args()
+
+rows = load_device_rows(args.devices)
+
+# Validate everything up front: a broken file is rejected before any device is submitted.
+errors = validate_rows(rows)
+if errors:
+    for error in errors:
+        print(f"Row {error.row.number}: {error.detail}")
+    print(f"{len(errors)} invalid rows. Nothing was provisioned.")
+    sys.exit(1)
+
+# People are resolved in one batch through the directory index (loaded from disk if PEOPLE_INDEX_PATH exists).
+people_index = PeopleIndex(get_client(access_token), path=os.getenv("PEOPLE_INDEX_PATH"))
+
+print(f"Provisioning {len(rows)} devices...")
+report = provision_devices(access_token, rows, people_index,
+                           broadcaster=Broadcaster(max_workers=args.workers, rate=args.rate))
+
+results_path = args.results or f"{os.path.splitext(args.devices)[0]}.results.csv"
+report.write_csv(results_path)
+
+# Print the totals and throughput.
+print(report)
+print(f"Results written to {results_path}")
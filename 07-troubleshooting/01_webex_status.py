@@ -1 +1,159 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
 
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Health and latency probe of the Webex API endpoints these scripts depend on.
+
+Usage:
+    python 07-troubleshooting/01_webex_status.py                  # One-shot: 5 rounds, then a report.
+    python 07-troubleshooting/01_webex_status.py --samples 20
+    python 07-troubleshooting/01_webex_status.py --watch 10       # Continuous: probe every 10s,
+                                                                  # report over the last 5 minutes.
+
+Every round calls all the endpoints at the same time and records, per endpoint, the
+latency (p50/p95/p99), the status codes, the error rate (connection errors, 5xx and 429
+answers) and the rate-limit headroom ('X-RateLimit-Remaining' when Webex sends it, and
+the last 'Retry-After' of a 429). An endpoint only has to answer to be healthy: a 400 or
+403 (e.g. '/messages' without a room, '/meetings' without the meeting scopes) still
+proves the platform is up, and its latency is measured all the same.
+
+When the bot is slow but every endpoint here is healthy, the problem is on our side.
+Requests are never retried, so what is reported is what Webex answered. The one-shot
+mode exits with status 1 if any endpoint had errors.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.latency import LatencyWindow # Rolling latency percentiles and error rates.
+from webexone.session import api_url, build_adapter # Webex API URLs (WEBEX_BASE_URL) and pooled adapters.
+
+# Load environment variables from the .env file.
+load_dotenv()
+
+# Any token works; the admin access token can also reach '/meetings' and '/devices'.
+token = os.getenv("WEBEX_ACCESS_TOKEN") or os.getenv("BOT_TOKEN")
+
+parser = argparse.ArgumentParser(description="Probe the latency and health of the Webex API endpoints.")
+parser.add_argument("--samples", type=int, default=5, help="Rounds of probes in one-shot mode")
+parser.add_argument("--watch", type=float, metavar="SECONDS",
+                    help="Continuous mode: probe every SECONDS and print a rolling report")
+parser.add_argument("--window", type=float, default=300, help="Seconds covered by the rolling report (continuous mode)")
+parser.add_argument("--timeout", type=float, default=10, help="Timeout of a single probe, in seconds")
+parser.add_argument("--room", default=os.getenv("STATUS_ROOM_ID"),
+                    help="Optional room ID, so '/messages' lists a real room instead of answering 400")
+args = parser.parse_args()
+
+# (name, method, path, authenticated)
+PROBES = [
+    ("/people", "GET", "people/me", True),
+    ("/messages", "GET", f"messages?max=1&roomId={args.room}" if args.room else "messages?max=1", True),
+    ("/rooms", "GET", "rooms?max=1", True),
+    ("/memberships", "GET", "memberships?max=1", True),
+    ("/meetings", "GET", "meetings?max=1", True),
+    ("/devices", "GET", "devices?max=1", True),
+    ("/access_token", "POST", "access_token", False), # No credentials: measures the OAuth endpoint (400 expected).
+]
+
+# A dedicated session without retries: a probe reports exactly what Webex answered.
+session = requests.Session()
+adapter = build_adapter(pool_size=len(PROBES), retries=0, retry_statuses=())
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+windows = {name: LatencyWindow(window=args.window if args.watch else None) for name, *_ in PROBES}
+statuses = {name: Counter() for name, *_ in PROBES}
+rate_limits = {name: {} for name, *_ in PROBES}
+
+def probe(name: str, method: str, path: str, authenticated: bool):
+    """
+    Calls one endpoint and records its latency, status and rate-limit headers.
+    """
+    headers = {"Authorization": f"Bearer {token}"} if authenticated else {}
+    started = time.perf_counter()
+    try:
+        response = session.request(method, api_url(path), headers=headers, timeout=args.timeout)
+    except requests.RequestException as e:
+        windows[name].add(time.perf_counter() - started, ok=False)
+        statuses[name][type(e).__name__] += 1
+        return
+    windows[name].add(time.perf_counter() - started, ok=response.status_code < 500 and response.status_code != 429)
+    statuses[name][str(response.status_code)] += 1
+
+    limits = rate_limits[name]
+    remaining = response.headers.get("X-RateLimit-Remaining") or response.headers.get("RateLimit-Remaining")
+    if remaining is not None:
+        limits["remaining"] = remaining
+        limits["limit"] = response.headers.get("X-RateLimit-Limit") or response.headers.get("RateLimit-Limit")
+    # The headroom shows the latest answer: limited until an answer other than 429 comes back.
+    if response.status_code == 429:
+        limits["retry_after"] = response.headers.get("Retry-After", "?")
+    else:
+        limits.pop("retry_after", None)
+
+def headroom(name: str) -> str:
+    limits = rate_limits[name]
+    if "retry_after" in limits:
+        return f"LIMITED (Retry-After {limits['retry_after']}s)"
+    if "remaining" in limits:
+        return f"{limits['remaining']}/{limits['limit'] or '?'} left"
+    return "ok"
+
+def run_round(executor: ThreadPoolExecutor):
+    # Every endpoint is probed at the same time, so a round takes as long as the slowest one.
+    list(executor.map(lambda spec: probe(*spec), PROBES))
+
+def report() -> bool:
+    """
+    Prints one line per endpoint. Returns True if every endpoint is healthy.
+    """
+    print(f"{'Endpoint':<15}{'Samples':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Errors':>8}  {'Statuses':<22}Rate limit")
+    failing = []
+    for name, *_ in PROBES:
+        stats = windows[name].snapshot()
+        codes = " ".join(f"{code}x{count}" for code, count in sorted(statuses[name].items()))
+        print(f"{name:<15}{stats['count']:>8}{stats['p50'] * 1000:>9.0f}{stats['p95'] * 1000:>9.0f}"
+              f"{stats['p99'] * 1000:>9.0f}{stats['error_rate']:>8.0%}  {codes:<22}{headroom(name)}")
+        if stats["errors"]:
+            failing.append(name)
+        if statuses[name]["401"]:
+            print(f"{'':<15}401: the token is invalid or expired")
+
+    if not failing:
+        print("All endpoints are healthy: if the bot is slow, look at the bot (or its network) first.")
+    elif len(failing) == len(PROBES):
+        print("Every endpoint is failing: check the network path to Webex and https://status.webex.com")
+    else:
+        print(f"Failing endpoints: {', '.join(failing)}. Check https://status.webex.com")
+    return not failing
+
+with ThreadPoolExecutor(max_workers=len(PROBES), thread_name_prefix="probe") as executor:
+    if args.watch:
+        print(f"Probing {api_url('')} every {args.watch:g}s (report over the last {args.window:g}s). Ctrl+C to stop.")
+        try:
+            while True:
+                started = time.monotonic()
+                run_round(executor)
+                # The status counters are cumulative; the latencies and error rates cover the window.
+                print(f"\n{time.strftime('%Y-%m-%d %H:%M:%S')}")
+                report()
+                time.sleep(max(0, args.watch - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(f"Probing {api_url('')} ({args.samples} rounds)...")
+        for _ in range(args.samples):
+            run_round(executor)
+        sys.exit(0 if report() else 1)
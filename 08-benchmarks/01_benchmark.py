@@ -0,0 +1,168 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Benchmark harness: the bulk paths of these scripts against a local mock Webex API.
+
+Usage:
+    python 08-benchmarks/01_benchmark.py
+    python 08-benchmarks/01_benchmark.py --scenarios broadcast,pagination --org-size 20000
+    python 08-benchmarks/01_benchmark.py --latency 0.1 --throttle 0.02 --output results.jsonl
+
+Each run starts a 'MockWebex' server in this process (see 'webexone.mock_server'), points
+WEBEX_BASE_URL at it and measures, per scenario, the throughput and the client-side
+latency percentiles of every HTTP request (taken from the 'requests' response hooks of
+the pooled session and of the SDK clients):
+
+- broadcast:  the feedback card sent to 'recipients' people (Broadcaster + send_card),
+- pagination: the whole organization listed with the prefetching Paginator,
+- rooms:      'rooms' rooms created with 'members' members each (provision_rooms); the
+              items are the rooms, the memberships are printed apart,
+- devices:    'devices' phones provisioned for as many people (provision_devices).
+
+The mock's latency, jitter, 429 rate and seed are fixed by the arguments, so the same
+command measures every performance change the same way. '--output' appends the results
+(with the arguments) as one JSON line, to compare runs. The adaptive concurrency limit
+each endpoint ended with is printed too (ADAPTIVE_CONCURRENCY=0 runs without it).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.broadcast import Broadcaster # Concurrent, rate-limit-aware fan-out engine.
+from webexone.cards import get_card, send_card # Pre-serialized Adaptive Card templates.
+from webexone.clients import get_client # Shared, long-lived WebexAPI clients keyed by token.
+from webexone.devices import SUPPORTED_MODELS, DeviceRow, provision_devices # Bulk device provisioning.
+from webexone.directory import PeopleIndex # Email/personId index of the organization directory.
+from webexone.latency import LatencyWindow # Latency percentiles.
+from webexone.mock_server import MockWebex # Local mock of the Webex API.
+from webexone.paginator import Paginator # Prefetching 'Link: next' walker.
+from webexone.ratelimit import get_concurrency # Adaptive per-endpoint concurrency limits.
+from webexone.rooms import RoomSpec, provision_rooms # Bulk room provisioning.
+from webexone.session import api_url, get_session # Shared keep-alive connection pool.
+
+SCENARIOS = ("broadcast", "pagination", "rooms", "devices")
+
+parser = argparse.ArgumentParser(description="Benchmark the bulk paths against a local mock Webex API.")
+parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+parser.add_argument("--org-size", type=int, default=5000, help="People in the mock organization")
+parser.add_argument("--latency", type=float, default=0.02, help="Seconds the mock waits before every answer")
+parser.add_argument("--jitter", type=float, default=0.01, help="Extra random wait of the mock, up to this many seconds")
+parser.add_argument("--throttle", type=float, default=0.0, help="Fraction of the requests answered with a 429")
+parser.add_argument("--retry-after", type=int, default=1, help="'Retry-After' of the 429 answers, in seconds")
+parser.add_argument("--seed", type=int, default=2025, help="Seed of the mock's jitter and throttling")
+parser.add_argument("--workers", type=int, default=16, help="Concurrent requests of the bulk paths")
+parser.add_argument("--rate", type=float, default=200, help="Maximum requests per second of the bulk paths")
+parser.add_argument("--recipients", type=int, default=1000, help="Recipients of the broadcast scenario")
+parser.add_argument("--page-size", type=int, default=100, help="Page size of the pagination scenario")
+parser.add_argument("--rooms", type=int, default=20, help="Rooms of the rooms scenario")
+parser.add_argument("--members", type=int, default=10, help="Members per room of the rooms scenario")
+parser.add_argument("--devices", type=int, default=500, help="Devices of the devices scenario")
+parser.add_argument("--output", help="Optional JSON Lines file the results are appended to")
+args = parser.parse_args()
+
+token = "mock-token"
+latencies = None  # LatencyWindow of the requests of the running scenario.
+
+def record_latency(response, *hook_args, **hook_kwargs):
+    # 'requests' response hook: 'elapsed' is the time until the response headers arrived.
+    if latencies is not None:
+        latencies.add(response.elapsed.total_seconds(), ok=response.status_code < 500 and response.status_code != 429)
+
+def instrument(req_session):
+    if record_latency not in req_session.hooks["response"]:
+        req_session.hooks["response"].append(record_latency)
+
+def sdk_client(**options):
+    client = get_client(token, **options)
+    instrument(client._session._req_session)
+    return client
+
+def bench_broadcast() -> int:
+    card = get_card("feedback")
+    recipients = [f"user{number}@example.com" for number in range(min(args.recipients, args.org_size))]
+    summary = Broadcaster(max_workers=args.workers, rate=args.rate, keep_results=False).run(
+        recipients, lambda recipient: send_card(token, card, "Please provide your feedback:",
+                                                to_person_email=recipient, title="Benchmark"))
+    return summary.delivered
+
+def bench_pagination() -> int:
+    return sum(1 for _ in Paginator(api_url("people"), token, page_size=args.page_size))
+
+def bench_rooms() -> int:
+    run = time.strftime("%H%M%S")
+    specs = [RoomSpec(f"Benchmark {run} #{number}",
+                      [f"user{(number * args.members + member) % args.org_size}@example.com" for member in range(args.members)])
+             for number in range(args.rooms)]
+    # Same clients as 03-bots/09_bulk_rooms.py: the Broadcaster handles the 429s of the provisioning calls.
+    report = provision_rooms(sdk_client(wait_on_rate_limit=False), specs, people_index=PeopleIndex(sdk_client()),
+                             broadcaster=Broadcaster(max_workers=args.workers, rate=args.rate))
+    created = [result for result in report.results if result.status == "created"]
+    memberships = sum(1 for result in created if result.kind == "membership")
+    print(f"{'':<12}{memberships} memberships added to the rooms")
+    return sum(1 for result in created if result.kind == "room")
+
+def bench_devices() -> int:
+    # A different range of MAC addresses on every run, so no device is a duplicate.
+    base = int(time.time() * 1000) % (16 ** 8) << 16
+    rows = [DeviceRow(number, f"{base + number:012X}", SUPPORTED_MODELS[number % len(SUPPORTED_MODELS)],
+                      f"user{number % args.org_size}@example.com") for number in range(args.devices)]
+    report = provision_devices(token, rows, PeopleIndex(sdk_client()),
+                               broadcaster=Broadcaster(max_workers=args.workers, rate=args.rate))
+    return report.count("provisioned")
+
+mock = MockWebex(org_size=args.org_size, latency=args.latency, jitter=args.jitter, throttle=args.throttle,
+                 retry_after=args.retry_after, seed=args.seed).start()
+os.environ["WEBEX_BASE_URL"] = mock.base_url
+instrument(get_session())
+print(f"Mock Webex API on {mock.base_url}: {args.org_size} people, latency {args.latency * 1000:.0f}"
+      f"+{args.jitter * 1000:.0f} ms, {args.throttle:.1%} throttled")
+
+results = {}
+print(f"{'Scenario':<12}{'Items':>8}{'Seconds':>9}{'Items/s':>10}{'Requests':>10}{'429s':>6}"
+      f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+for scenario in args.scenarios.split(","):
+    scenario = scenario.strip()
+    if scenario not in SCENARIOS:
+        parser.error(f"unknown scenario '{scenario}' (choose from {', '.join(SCENARIOS)})")
+    latencies = LatencyWindow(window=None, maxlen=1_000_000)
+    mock.reset_stats()
+    started = time.perf_counter()
+    try:
+        items = globals()[f"bench_{scenario}"]()
+    except Exception as e:
+        # Keep measuring the other scenarios; a failure under 429s is a result too.
+        print(f"{scenario:<12}failed: {e}")
+        results[scenario] = {"error": str(e)}
+        continue
+    elapsed = time.perf_counter() - started
+    stats = mock.stats()
+    snapshot = latencies.snapshot()
+    results[scenario] = {"items": items, "seconds": round(elapsed, 3),
+                         "items_per_second": round(items / elapsed, 1) if elapsed else 0.0,
+                         "requests": stats["total"], "throttled": stats["total_throttled"],
+                         "p50_ms": round(snapshot["p50"] * 1000, 1), "p95_ms": round(snapshot["p95"] * 1000, 1),
+                         "p99_ms": round(snapshot["p99"] * 1000, 1)}
+    r = results[scenario]
+    print(f"{scenario:<12}{items:>8}{elapsed:>9.2f}{r['items_per_second']:>10.1f}{r['requests']:>10}{r['throttled']:>6}"
+          f"{r['p50_ms']:>9.0f}{r['p95_ms']:>9.0f}{r['p99_ms']:>9.0f}")
+
+mock.stop()
+
+concurrency = get_concurrency()
+if concurrency:
+    results["concurrency_limits"] = concurrency.limits()
+    print("Adaptive concurrency limits: " + ", ".join(f"{endpoint} {limit}" for endpoint, limit in results["concurrency_limits"].items()))
+
+if args.output:
+    with open(args.output, "a") as f:
+        f.write(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "args": vars(args), "results": results}) + "\n")
+    print(f"Results appended to {args.output}")
@@ -0,0 +1,42 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Runs the mock Webex API on its own, to try any script of this repository offline.
+
+Usage:
+    python 08-benchmarks/02_mock_server.py --port 8900 --org-size 10000 --latency 0.05 --throttle 0.01
+
+Then, in another terminal:
+    WEBEX_BASE_URL="http://127.0.0.1:8900/v1/" python 07-troubleshooting/01_webex_status.py
+"""
+
+import argparse
+import os
+import sys
+
+# Make the shared 'webexone' helpers at the repository root importable from this script.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webexone.mock_server import MockWebex # Local mock of the Webex API.
+
+parser = argparse.ArgumentParser(description="Serve a local mock of the Webex API.")
+parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+parser.add_argument("--port", type=int, default=8900, help="Port to listen on")
+parser.add_argument("--org-size", type=int, default=1000, help="People in the mock organization")
+parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock waits before every answer")
+parser.add_argument("--jitter", type=float, default=0.0, help="Extra random wait, up to this many seconds")
+parser.add_argument("--throttle", type=float, default=0.0, help="Fraction of the requests answered with a 429")
+parser.add_argument("--retry-after", type=int, default=1, help="'Retry-After' of the 429 answers, in seconds")
+parser.add_argument("--seed", type=int, help="Seed of the jitter and throttling")
+args = parser.parse_args()
+
+mock = MockWebex(org_size=args.org_size, latency=args.latency, jitter=args.jitter, throttle=args.throttle,
+                 retry_after=args.retry_after, seed=args.seed, host=args.host, port=args.port)
+print(f"Mock Webex API listening on {mock.base_url} (set WEBEX_BASE_URL to it). Ctrl+C to stop.")
+try:
+    mock.serve_forever()
+except KeyboardInterrupt:
+    print(f"Requests served: {mock.stats()['requests']}")
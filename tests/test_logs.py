@@ -0,0 +1,44 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+The bots built by 'create_bot' log through the queue: redacted, sampled JSON lines.
+"""
+
+import json
+import logging
+from types import SimpleNamespace
+
+from webex_bot.webex_bot import WebexBot
+from webex_bot.websockets.webex_websocket_client import WebexWebsocketClient
+
+from webexone import logs
+from webexone.sharding import create_bot
+
+
+def test_create_bot_keeps_only_the_queue_handler(monkeypatch, capsys):
+    # No network: the bot's identity and device URL are stubbed.
+    me = SimpleNamespace(displayName="Test bot", emails=["bot@example.com"], type="bot", avatar=None)
+    monkeypatch.setattr(WebexBot, "get_me_info", lambda self: me)
+    monkeypatch.setattr(WebexWebsocketClient, "_get_device_url", lambda self: "https://wdm.example.com")
+    for name in ("BOT_INGRESS", "BOT_PARTITIONS", "METRICS_PORT", "LOG_FORMAT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("LOG_SAMPLE_RATE", "0")
+
+    create_bot(teams_bot_token="not-a-real-token", bot_name="Test bot")
+
+    root = logging.getLogger()
+    assert root.handlers == [logs._handler]
+
+    log = logging.getLogger("test")
+    log.warning("Authorization: Bearer supersecrettoken123")
+    log.info("Feedback card sent", extra=logs.sampled(email="someone@example.com"))
+    logs._stop_listener()
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith("{")]
+    messages = [line["message"] for line in lines if line["logger"] == "test"]
+    assert len(messages) == 1
+    assert "supersecrettoken123" not in messages[0] and logs.REDACTED in messages[0]
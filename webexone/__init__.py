@@ -0,0 +1,13 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Shared helpers used by the example scripts in this repository.
+
+The example scripts live in numbered folders (e.g. '03-bots', '06-usecases') that
+cannot be imported as Python packages, so reusable building blocks live here instead.
+Scripts add the repository root to 'sys.path' before importing from 'webexone'.
+"""
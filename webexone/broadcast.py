@@ -0,0 +1,180 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Concurrent, rate-limit-aware fan-out engine.
+
+Any command that sends the same kind of request to many recipients (e.g. an Adaptive
+Card to everyone in the organization) can hand the recipients and a 'send' function
+to a 'Broadcaster'. It runs the sends on a bounded pool of worker threads, keeps the
+request rate under a token bucket, honors Webex '429 Retry-After' answers, retries
+transient failures with exponential backoff and returns a delivered/failed/skipped summary.
+A 5xx or a network error may come after the request took effect, so only the sends marked
+'idempotent' are retried on those; any other send (e.g. posting a message) only on a 429.
+'max_workers' is an upper bound: the requests the sends make through the pooled sessions
+also wait for the adaptive per-endpoint limit (see 'webexone.ratelimit.AdaptiveLimit').
+"""
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from webexone.ratelimit import TokenBucket, is_retryable, retry_after_from, status_code_from
+
+DELIVERED = "delivered"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class DeliveryResult:
+    """
+    The outcome of sending to a single recipient.
+    """
+    recipient: object
+    status: str
+    attempts: int = 0
+    error: str = None
+
+
+@dataclass
+class BroadcastSummary:
+    """
+    The final delivered/failed/skipped counts of a broadcast.
+    """
+    delivered: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    results: list = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.delivered + self.failed + self.skipped
+
+    @property
+    def rate(self) -> float:
+        """Delivered messages per second."""
+        return self.delivered / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"Delivered: {self.delivered}, Failed: {self.failed}, Skipped: {self.skipped} "
+                f"in {self.elapsed:.1f}s ({self.rate:.1f} msg/s)")
+
+
+class Broadcaster:
+    """
+    Sends to many recipients concurrently while respecting Webex rate limits.
+
+    Example:
+        broadcaster = Broadcaster(max_workers=8, rate=5)
+        summary = broadcaster.run(people, send=lambda person: webex.messages.create(...))
+        print(summary)
+    """
+
+    def __init__(self, max_workers: int = 8, rate: float = 5.0, burst: int = None,
+                 max_retries: int = 5, backoff: float = 1.0, max_backoff: float = 60.0,
+                 keep_results: bool = True):
+        """
+        Args:
+            max_workers (int): Number of sends running at the same time.
+            rate (float): Maximum number of sends started per second.
+            burst (int): Token bucket capacity. Defaults to one second worth of sends.
+            max_retries (int): How many times a recipient is retried after a transient failure.
+            backoff (float): Initial backoff (seconds) between retries, doubled on every attempt.
+            max_backoff (float): Upper bound for the backoff between retries.
+            keep_results (bool): Keep a 'DeliveryResult' per recipient in the summary.
+                                 Disable it for very large broadcasts where only the counts matter.
+        """
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.keep_results = keep_results
+
+    def run(self, recipients, send, skip=None, idempotent: bool = False) -> BroadcastSummary:
+        """
+        Sends to every recipient and waits until all of them are done.
+
+        Recipients are consumed lazily, so a generator (e.g. a paged people listing)
+        can be passed in and sending starts before the listing is complete.
+
+        Args:
+            recipients (iterable): The recipients to send to.
+            send (callable): Called as 'send(recipient)'. Raising an exception marks the attempt as failed.
+            skip (callable): Optional. Called as 'skip(recipient)'; a truthy return value (the reason)
+                             skips the recipient without sending.
+            idempotent (bool): Optional. 'send' is safe to call again after a 5xx or a network error
+                               (it checks for what an earlier attempt created, or sending twice does no
+                               harm). Otherwise a recipient is only retried after a 429.
+
+        Returns:
+            BroadcastSummary: The delivered/failed/skipped counts and per-recipient results.
+        """
+        summary = BroadcastSummary()
+        lock = threading.Lock()
+        # Bound the number of queued recipients so a huge listing is never held in memory at once.
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+        started = time.monotonic()
+
+        def record(result: DeliveryResult):
+            with lock:
+                if result.status == DELIVERED:
+                    summary.delivered += 1
+                elif result.status == FAILED:
+                    summary.failed += 1
+                else:
+                    summary.skipped += 1
+                if self.keep_results:
+                    summary.results.append(result)
+
+        def worker(recipient):
+            try:
+                record(self._deliver(recipient, send, idempotent))
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for recipient in recipients:
+                reason = skip(recipient) if skip else None
+                if reason:
+                    record(DeliveryResult(recipient, SKIPPED, error=str(reason)))
+                    continue
+                in_flight.acquire()
+                # Run with the caller's context, so the sends are charged to its command (see 'webexone.metrics').
+                executor.submit(contextvars.copy_context().run, worker, recipient)
+
+        summary.elapsed = time.monotonic() - started
+        return summary
+
+    def _deliver(self, recipient, send, idempotent: bool = False) -> DeliveryResult:
+        """
+        Sends to one recipient, retrying transient failures (only 429s unless 'idempotent').
+        """
+        attempts = 0
+        while True:
+            attempts += 1
+            self.bucket.acquire()
+            try:
+                send(recipient)
+                return DeliveryResult(recipient, DELIVERED, attempts)
+            except Exception as e:
+                retryable = is_retryable(e) if idempotent else status_code_from(e) == 429
+                if attempts > self.max_retries or not retryable:
+                    return DeliveryResult(recipient, FAILED, attempts, str(e))
+
+                retry_after = retry_after_from(e)
+                if retry_after is not None:
+                    # Rate limited: pause every worker, not just this one.
+                    self.bucket.pause(retry_after)
+                else:
+                    # Exponential backoff with jitter so retries do not line up.
+                    delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+                    time.sleep(delay * random.uniform(0.5, 1.0))
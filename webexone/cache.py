@@ -0,0 +1,250 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+In-memory caches for repeated Webex lookups.
+
+Bots resolve the same people over and over (the sender of every command, the admin
+check, ...), and each 'webex.people.get()' is a full API round trip. 'PersonCache'
+keeps recently seen people in a bounded LRU cache with TTL expiry, remembers IDs that
+do not exist (negative caching) and counts hits and misses. Email lookups go through the
+directory index instead ('webexone.directory.PeopleIndex').
+
+Misses go through 'SingleFlight': when many card submissions from the same person arrive
+at once (e.g. right after an org-wide broadcast), only the first lookup calls the API and
+the concurrent ones wait for its answer instead of sending the same request again.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from webexone.metrics import metrics
+from webexone.ratelimit import status_code_from
+
+# Returned by 'TTLCache.get' when the key is not cached (None is a valid cached value).
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """
+    Hit/miss counters of a cache.
+    """
+    hits: int = 0
+    negative_hits: int = 0   # Hits on a cached "not found".
+    misses: int = 0
+    evictions: int = 0
+    coalesced: int = 0       # Misses that shared the API call of a concurrent identical lookup.
+
+    @property
+    def saved_calls(self) -> int:
+        """
+        API calls avoided by the cache and by request coalescing.
+        """
+        return self.hits + self.negative_hits + self.coalesced
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    def __str__(self):
+        return (f"hits={self.hits} negative_hits={self.negative_hits} misses={self.misses} "
+                f"evictions={self.evictions} coalesced={self.coalesced} saved_calls={self.saved_calls} "
+                f"hit_ratio={self.hit_ratio:.0%}")
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache whose entries expire after a time-to-live.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        """
+        Args:
+            maxsize (int): Maximum number of entries. The least recently used entry is evicted first.
+            ttl (float): Default time-to-live (seconds) of an entry.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the cached value, or MISSING if the key is not cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            if entry[0] is None:
+                self.stats.negative_hits += 1
+            else:
+                self.stats.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl: float = None):
+        """
+        Stores a value. A value of None caches a "not found" answer.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+            ttl (float): Optional. Time-to-live (seconds) for this entry instead of the default.
+        """
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single call.
+
+    The first caller of a key runs the function; callers arriving while it runs wait and
+    get the same result (or the same exception). Nothing is kept once the call finishes,
+    so combine it with a cache for the answers themselves.
+
+    Example:
+        flight = SingleFlight()
+        person = flight.do(("id", person_id), lambda: webex.people.get(person_id))
+    """
+
+    def __init__(self, stats: CacheStats = None):
+        """
+        Args:
+            stats (CacheStats): Optional. Counters to report the coalesced calls to (e.g. the stats of the cache in front).
+        """
+        self.stats = stats or CacheStats()
+        self.calls = 0  # Calls actually executed.
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """
+        Runs 'function()' unless a call with the same key is already running, then waits for that one.
+
+        Returns:
+            The result of the (possibly shared) call.
+
+        Raises:
+            Exception: Whatever the (possibly shared) call raised.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.stats.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class PersonCache:
+    """
+    Caches people by personId in front of the People API.
+
+    Example:
+        person_cache = PersonCache(webex)
+        person = person_cache.get(person_id)           # webex.people.get(), cached
+    """
+
+    def __init__(self, webex, maxsize: int = 4096, ttl: float = 300, negative_ttl: float = 60,
+                 name: str = "person_cache"):
+        """
+        Args:
+            webex (WebexAPI): The client used on cache misses.
+            maxsize (int): Maximum number of cached lookups.
+            ttl (float): How long (seconds) a person is cached.
+            negative_ttl (float): How long (seconds) a "not found" answer is cached.
+            name (str): The name its counters are exported under (on '/metrics' and in 'stats').
+        """
+        self.webex = webex
+        self.negative_ttl = negative_ttl
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.flight = SingleFlight(self.cache.stats)
+        metrics.register_cache(name, self.cache.stats)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def get(self, person_id: str):
+        """
+        Returns the person with this ID, or None if it does not exist.
+
+        Raises:
+            ApiError: For errors other than "not found" (those are not cached).
+        """
+        key = ("id", person_id)
+        person = self.cache.get(key)
+        if person is MISSING:
+            person = self.flight.do(key, lambda: self._fetch(key, person_id))
+        return person
+
+    def _fetch(self, key, person_id: str):
+        try:
+            person = self.webex.people.get(person_id)
+        except Exception as e:
+            if status_code_from(e) != 404:
+                raise
+            person = None
+        # Cached before the waiting lookups are released, so later ones hit the cache.
+        self._store(key, person)
+        return person
+
+    def _store(self, key, person):
+        if person is None:
+            self.cache.set(key, None, ttl=self.negative_ttl)
+        else:
+            self.cache.set(key, person)
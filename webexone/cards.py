@@ -0,0 +1,166 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Precompiled Adaptive Card templates.
+
+Card definitions live as JSON files in the 'cards' folder at the root of the repository
+(or CARDS_PATH) and are loaded and validated (see 'webexone.cardschema') once. A card may
+contain '${name}' placeholders in its string values. When a template is loaded, the whole
+attachment is serialized to JSON a single time and split around its placeholders, so
+rendering a card is only a join of the static segments with the (JSON-escaped) values:
+
+    template = get_card("feedback")
+    response.attachments = template.render(title="We'd love to hear your thoughts!")
+
+For broadcasts, 'send_card' posts a pre-rendered JSON body straight through the pooled
+HTTP session, without building or serializing any dict per recipient.
+"""
+
+import json
+import os
+import re
+import threading
+
+import requests
+
+from webexone.cardschema import check_card
+from webexone.session import api_url, get_session
+
+CONTENT_TYPE = "application/vnd.microsoft.card.adaptive"
+DEFAULT_CARDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cards")
+
+PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+
+class CardTemplate:
+    """
+    An Adaptive Card attachment compiled into static JSON segments and '${name}' fields.
+    """
+
+    def __init__(self, name: str, content: dict):
+        """
+        Args:
+            name (str): The card name (its file name without '.json').
+            content (dict): The Adaptive Card ('"type": "AdaptiveCard"', body, actions, ...).
+
+        Raises:
+            CardValidationError: If the card doesn't follow the Adaptive Card 1.3 schema.
+        """
+        check_card(content, name)
+        self.name = name
+        self.content = content
+        attachment = json.dumps({"contentType": CONTENT_TYPE, "content": content}, separators=(",", ":"))
+        # re.split with a group alternates: static, field, static, field, ..., static.
+        parts = PLACEHOLDER.split(attachment)
+        self.segments = parts[0::2]
+        self.fields = parts[1::2]
+        self._static = json.loads(attachment) if not self.fields else None
+
+    def render_json(self, **data) -> str:
+        """
+        Returns the attachment as a JSON string with the fields filled in.
+
+        Raises:
+            KeyError: If a field of the card has no value.
+        """
+        if not self.fields:
+            return self.segments[0]
+        parts = [self.segments[0]]
+        for field, segment in zip(self.fields, self.segments[1:]):
+            # The placeholder sits inside a JSON string: escape the value, without its quotes.
+            parts.append(json.dumps(str(data[field]))[1:-1])
+            parts.append(segment)
+        return "".join(parts)
+
+    def render(self, **data) -> dict:
+        """
+        Returns the attachment as a dict (e.g. for 'Response.attachments').
+        Cards without fields return the same shared dict every time: don't modify it.
+        """
+        if self._static is not None:
+            return self._static
+        return json.loads(self.render_json(**data))
+
+
+class CardRegistry:
+    """
+    Loads the card templates of a folder once and hands them out by name.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): Optional. Folder with the '<name>.json' card files. Defaults to CARDS_PATH or 'cards/'.
+        """
+        self.path = path or os.getenv("CARDS_PATH", DEFAULT_CARDS_PATH)
+        self._templates = None
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        """
+        Loads, validates and compiles every card of the folder (only the first call reads the files).
+        Call it at startup to fail fast on a broken card.
+
+        Returns:
+            dict: Card name -> CardTemplate.
+        """
+        if self._templates is None:
+            with self._lock:
+                if self._templates is None:
+                    templates = {}
+                    for file_name in sorted(os.listdir(self.path)):
+                        if file_name.endswith(".json"):
+                            with open(os.path.join(self.path, file_name)) as f:
+                                name = file_name[:-len(".json")]
+                                templates[name] = CardTemplate(name, json.load(f))
+                    self._templates = templates
+        return self._templates
+
+    def get(self, name: str) -> CardTemplate:
+        return self.load()[name]
+
+    def names(self) -> list:
+        return list(self.load())
+
+
+_registry = CardRegistry()
+
+
+def get_card(name: str) -> CardTemplate:
+    """
+    Returns a card template from the default registry ('cards/' or CARDS_PATH).
+    The first call loads and validates every card of the registry.
+    """
+    return _registry.get(name)
+
+
+def send_card(access_token: str, template: CardTemplate, text: str, to_person_email: str = None,
+              room_id: str = None, **data) -> requests.Response:
+    """
+    Sends a card through the pooled HTTP session, building the request body by string concatenation.
+
+    Args:
+        access_token (str): The bot token.
+        template (CardTemplate): The card to send.
+        text (str): Fallback text for clients that can't render cards.
+        to_person_email (str): The recipient (or 'room_id').
+        room_id (str): The destination room (or 'to_person_email').
+        **data: Values of the card's '${name}' fields.
+
+    Returns:
+        requests.Response: The API response.
+
+    Raises:
+        requests.HTTPError: If Webex doesn't accept the message ('429' keeps its 'Retry-After').
+    """
+    destination = f'"toPersonEmail":{json.dumps(to_person_email)}' if to_person_email else f'"roomId":{json.dumps(room_id)}'
+    body = f'{{{destination},"text":{json.dumps(text)},"attachments":[{template.render_json(**data)}]}}'
+    headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
+    response = get_session().post(api_url("messages"), data=body.encode(), headers=headers)
+    if response.status_code != 200:
+        raise requests.HTTPError(f"{response.status_code} - {response.text}", response=response)
+    return response
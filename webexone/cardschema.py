@@ -0,0 +1,215 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Structural validation of Adaptive Cards against the Adaptive Card 1.3 schema (the
+version Webex renders).
+
+A malformed card is rejected by Webex for every single recipient, so a broadcast with a
+broken card fails once per person over the network. The card registry validates every
+card once, when the cards are loaded, and refuses to start, reporting the precise path
+of every bad element, e.g.:
+
+    feedback: $.body[1].choices[0]: missing required property 'value'
+
+Only what Webex enforces (and what typically goes wrong) is checked: element and action
+types, required properties, enumerated values, property types, unique input IDs and the
+card version. No third-party schema package is needed.
+"""
+
+import functools
+import json
+
+SUPPORTED_VERSIONS = ("1.0", "1.1", "1.2", "1.3")
+
+# Element type -> required properties.
+ELEMENTS = {
+    "TextBlock": ("text",),
+    "Image": ("url",),
+    "Media": ("sources",),
+    "RichTextBlock": ("inlines",),
+    "ActionSet": ("actions",),
+    "Container": ("items",),
+    "ColumnSet": (),
+    "FactSet": ("facts",),
+    "ImageSet": ("images",),
+    "Input.Text": ("id",),
+    "Input.Number": ("id",),
+    "Input.Date": ("id",),
+    "Input.Time": ("id",),
+    "Input.Toggle": ("id", "title"),
+    "Input.ChoiceSet": ("id",),
+}
+
+# Action type -> required properties.
+ACTIONS = {
+    "Action.OpenUrl": ("url",),
+    "Action.Submit": (),
+    "Action.ShowCard": ("card",),
+    "Action.ToggleVisibility": ("targetElements",),
+}
+
+# (Element type, property) -> allowed values (compared case-insensitively, like the renderers
+# do). A type of None applies to any element; a type-specific entry takes precedence, since
+# the same property can mean different things ('size' of a TextBlock vs. of an Image).
+ENUMS = {
+    ("TextBlock", "size"): ("default", "small", "medium", "large", "extralarge"),
+    ("Image", "size"): ("auto", "stretch", "small", "medium", "large"),
+    ("ImageSet", "imageSize"): ("auto", "stretch", "small", "medium", "large"),
+    (None, "weight"): ("default", "lighter", "bolder"),
+    (None, "color"): ("default", "dark", "light", "accent", "good", "warning", "attention"),
+    (None, "horizontalAlignment"): ("left", "center", "right"),
+    (None, "verticalContentAlignment"): ("top", "center", "bottom"),
+    (None, "spacing"): ("default", "none", "small", "medium", "large", "extralarge", "padding"),
+    (None, "fontType"): ("default", "monospace"),
+}
+
+BOOLEANS = ("wrap", "isSubtle", "separator", "isVisible", "isRequired", "isMultiline", "isMultiSelect",
+            "bleed", "rtl", "italic", "strikethrough", "highlight", "underline")
+
+
+class CardValidationError(ValueError):
+    """
+    Raised when a card doesn't follow the Adaptive Card schema.
+    """
+
+    def __init__(self, errors: list, name: str = None):
+        self.errors = errors
+        self.name = name
+        prefix = f"{name}: " if name else ""
+        super().__init__("\n".join(prefix + error for error in errors))
+
+
+def _is_template(value) -> bool:
+    # '${name}' fields are only known at render time: don't check their value.
+    return isinstance(value, str) and "${" in value
+
+
+class _Validator:
+    def __init__(self):
+        self.errors = []
+        self.input_ids = {}
+
+    def error(self, path: str, message: str):
+        self.errors.append(f"{path}: {message}")
+
+    def card(self, card, path: str, top_level: bool = True):
+        if not isinstance(card, dict):
+            return self.error(path, "a card must be an object")
+        if card.get("type") != "AdaptiveCard":
+            self.error(f"{path}.type", f"expected 'AdaptiveCard', got {card.get('type')!r}")
+        if top_level:
+            version = card.get("version")
+            if version is None:
+                self.error(path, "missing required property 'version'")
+            elif str(version) not in SUPPORTED_VERSIONS:
+                self.error(f"{path}.version", f"unsupported version {version!r} (Webex supports up to 1.3)")
+        self.elements(card.get("body", []), f"{path}.body")
+        self.actions(card.get("actions", []), f"{path}.actions")
+
+    def properties(self, item: dict, path: str, required: tuple, kind: str = None):
+        for name in required:
+            if name not in item:
+                self.error(path, f"missing required property {name!r}")
+        for name, value in item.items():
+            allowed = ENUMS.get((kind, name)) or ENUMS.get((None, name))
+            if allowed and isinstance(value, str) and not _is_template(value) and value.lower() not in allowed:
+                self.error(f"{path}.{name}", f"invalid value {value!r}")
+        for name in BOOLEANS:
+            if name in item and not isinstance(item[name], bool) and not _is_template(item[name]):
+                self.error(f"{path}.{name}", f"expected true or false, got {item[name]!r}")
+
+    def elements(self, elements, path: str):
+        if not isinstance(elements, list):
+            return self.error(path, "expected a list of elements")
+        for index, element in enumerate(elements):
+            self.element(element, f"{path}[{index}]")
+
+    def element(self, element, path: str):
+        if not isinstance(element, dict):
+            return self.error(path, "an element must be an object")
+        kind = element.get("type")
+        if kind not in ELEMENTS:
+            return self.error(f"{path}.type", f"unknown element type {kind!r}")
+        self.properties(element, path, ELEMENTS[kind], kind)
+
+        if kind.startswith("Input."):
+            input_id = element.get("id")
+            if input_id in self.input_ids:
+                self.error(f"{path}.id", f"duplicate input id {input_id!r} (also used at {self.input_ids[input_id]})")
+            elif input_id is not None:
+                self.input_ids[input_id] = path
+        if kind == "Container":
+            self.elements(element.get("items", []), f"{path}.items")
+        elif kind == "ColumnSet":
+            for index, column in enumerate(element.get("columns", [])):
+                column_path = f"{path}.columns[{index}]"
+                if not isinstance(column, dict) or column.get("type", "Column") != "Column":
+                    self.error(column_path, "a ColumnSet can only contain Column objects")
+                    continue
+                self.properties(column, column_path, (), "Column")
+                self.elements(column.get("items", []), f"{column_path}.items")
+        elif kind == "FactSet":
+            for index, fact in enumerate(element.get("facts", [])):
+                self.properties(fact, f"{path}.facts[{index}]", ("title", "value"))
+        elif kind == "ImageSet":
+            for index, image in enumerate(element.get("images", [])):
+                self.properties(image, f"{path}.images[{index}]", ("url",), "Image")
+        elif kind == "Input.ChoiceSet":
+            for index, choice in enumerate(element.get("choices", [])):
+                self.properties(choice, f"{path}.choices[{index}]", ("title", "value"))
+        elif kind == "ActionSet":
+            self.actions(element.get("actions", []), f"{path}.actions")
+        if "selectAction" in element:
+            self.action(element["selectAction"], f"{path}.selectAction")
+
+    def actions(self, actions, path: str):
+        if not isinstance(actions, list):
+            return self.error(path, "expected a list of actions")
+        for index, action in enumerate(actions):
+            self.action(action, f"{path}[{index}]")
+
+    def action(self, action, path: str):
+        if not isinstance(action, dict):
+            return self.error(path, "an action must be an object")
+        kind = action.get("type")
+        if kind not in ACTIONS:
+            return self.error(f"{path}.type", f"unknown action type {kind!r} (Adaptive Card 1.3)")
+        self.properties(action, path, ACTIONS[kind], kind)
+        if kind == "Action.Submit" and "data" in action and not isinstance(action["data"], (dict, str)):
+            self.error(f"{path}.data", "expected an object or a string")
+        if kind == "Action.ShowCard":
+            self.card(action.get("card"), f"{path}.card", top_level=False)
+
+
+@functools.lru_cache(maxsize=256)
+def _validate_json(content_json: str) -> tuple:
+    validator = _Validator()
+    validator.card(json.loads(content_json), "$")
+    return tuple(validator.errors)
+
+
+def validate_card(content: dict) -> list:
+    """
+    Checks an Adaptive Card (the 'content' of the attachment) against the 1.3 schema.
+    Results are cached, so validating the same card again costs a dictionary lookup.
+
+    Returns:
+        list: Error messages ("<path>: <problem>"), empty if the card is valid.
+    """
+    return list(_validate_json(json.dumps(content, sort_keys=True)))
+
+
+def check_card(content: dict, name: str = None):
+    """
+    Like 'validate_card', but raises instead of returning the errors.
+
+    Raises:
+        CardValidationError: With every problem found, each one with its path.
+    """
+    errors = validate_card(content)
+    if errors:
+        raise CardValidationError(errors, name)
@@ -0,0 +1,73 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Append-only checkpoint file for resumable batch jobs.
+
+Every state change of a batch item is appended as one JSON line and flushed right away,
+so after a crash the file tells exactly which items were finished, which failed and
+which were in flight. The last line written for a key wins.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class Checkpoint:
+    """
+    Records the state of batch items by key in an append-only JSON Lines file.
+
+    Example:
+        checkpoint = Checkpoint("meetings.checkpoint.jsonl")
+        if checkpoint.status(key) != "done":
+            checkpoint.record(key, "submitting")
+            ...
+            checkpoint.record(key, "done", id=meeting_id)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The checkpoint file. Existing entries are loaded, new ones are appended.
+        """
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # A line cut short by a crash.
+                    self._entries[entry["key"]] = entry
+        self._file = open(path, "a")
+
+    def get(self, key: str) -> dict:
+        """
+        Returns the last entry recorded for the key, or None.
+        """
+        return self._entries.get(key)
+
+    def status(self, key: str) -> str:
+        entry = self._entries.get(key)
+        return entry["status"] if entry else None
+
+    def record(self, key: str, status: str, **details):
+        """
+        Appends a new state for the key and flushes it to disk immediately.
+        """
+        entry = {"key": key, "status": status, "time": time.time(), **details}
+        with self._lock:
+            self._entries[key] = entry
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
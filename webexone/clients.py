@@ -0,0 +1,85 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Process-wide registry of 'WebexAPI' clients, keyed by access token.
+
+Building a 'WebexAPI' object for every command execution costs an object construction
+and, worse, a cold HTTP connection (TCP + TLS handshake) for the first request it sends.
+'get_client()' hands out one long-lived client per token (and options) instead, so its
+connection pool stays warm across calls. The underlying 'requests.Session' is safe to
+share between threads, so the same client can serve concurrent commands.
+"""
+
+import os
+import threading
+
+from webexpythonsdk import WebexAPI
+
+from webexone.metrics import metrics
+from webexone.ratelimit import get_concurrency
+from webexone.session import DEFAULT_POOL_SIZE, api_url, build_adapter
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(access_token: str, **options) -> WebexAPI:
+    """
+    Returns the shared 'WebexAPI' client for this token, creating it on first use.
+
+    Args:
+        access_token (str): The bot or user access token.
+        **options: Extra 'WebexAPI' arguments (e.g. wait_on_rate_limit=False). Clients created
+                   with different options are kept apart.
+
+    Returns:
+        WebexAPI: A long-lived client with a warm connection pool.
+    """
+    key = (access_token, tuple(sorted(options.items())))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _create_client(access_token, **options)
+                _clients[key] = client
+    return client
+
+
+def _create_client(access_token: str, **options) -> WebexAPI:
+    """
+    Creates a 'WebexAPI' client whose connection pool is sized for concurrent use.
+    """
+    # Honor WEBEX_BASE_URL so every client can be pointed at a local mock server.
+    options.setdefault("base_url", api_url(""))
+    client = WebexAPI(access_token=access_token, **options)
+
+    # The SDK keeps a plain 'requests.Session' (10 pooled connections per host). Mount an adapter
+    # with a bigger pool so concurrent workers do not open and drop extra connections.
+    # Rate limits stay with the SDK (wait_on_rate_limit) or the caller, so no status retries here;
+    # the requests in flight per endpoint still follow the adaptive limit (see 'webexone.ratelimit').
+    req_session = getattr(getattr(client, "_session", None), "_req_session", None)
+    if req_session is not None:
+        adapter = build_adapter(pool_size=int(os.getenv("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                                retry_statuses=(), concurrency=get_concurrency())
+        req_session.mount("https://", adapter)
+        req_session.mount("http://", adapter)
+        metrics.instrument_session(req_session)
+    return client
+
+
+def _close_inherited_connections():
+    # A forked worker process must not share keep-alive sockets with its parent:
+    # drop the connections of every client; they reconnect on their next request.
+    for client in list(_clients.values()):
+        req_session = getattr(getattr(client, "_session", None), "_req_session", None)
+        if req_session is not None:
+            req_session.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_close_inherited_connections)
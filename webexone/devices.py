@@ -0,0 +1,224 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Device auto-provisioning helpers, single and bulk.
+
+A bulk rollout reads a CSV of MAC address / phone model / person email, validates every
+row up front (nothing is sent if the file is broken), resolves all the people in one batch
+and then submits the devices concurrently to '/v1/devices' under the Broadcaster's rate
+limit. '409 Conflict' answers mean the MAC address is already provisioned and are reported
+as duplicates rather than failures; '429' answers pause all workers for 'Retry-After'.
+"""
+
+import csv
+import re
+import time
+from dataclasses import dataclass, field
+
+import requests
+
+from webexone.broadcast import DELIVERED, Broadcaster
+from webexone.session import api_url, get_session
+
+# Phone models offered by the auto-provisioning card.
+SUPPORTED_MODELS = ("DMS Cisco 8851", "DMS Cisco 8861", "DMS Cisco 8865")
+
+PROVISIONED = "provisioned"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+UNKNOWN_PERSON = "unknown person"
+FAILED = "failed"
+
+
+def is_valid_mac_address(mac):
+    # Regular expression for a MAC address
+    pattern = r'^[0-9A-Fa-f]{12}$'
+    return bool(re.match(pattern, mac))
+
+
+def provision_device(access_token: str, mac_address: str, model: str, person_id: str) -> requests.Response:
+    """
+    Adds a device for a person through the '/v1/devices' API.
+
+    Returns:
+        requests.Response: The API response (200 on success, 409 if the MAC address is duplicated).
+    """
+    payload = {
+        "mac": mac_address,
+        "model": model,
+        "personId": person_id
+    }
+
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Authorization": f"Bearer {access_token}"
+    }
+
+    return get_session().post(api_url("devices"), headers=headers, json=payload)
+
+
+@dataclass
+class DeviceRow:
+    """
+    One device of the rollout file.
+    """
+    number: int
+    mac: str
+    model: str
+    email: str
+
+
+@dataclass
+class DeviceResult:
+    row: DeviceRow
+    status: str
+    detail: str = ""
+
+
+@dataclass
+class DeviceReport:
+    """
+    Per-device results and throughput of a bulk provisioning run.
+    """
+    results: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def devices_per_second(self) -> float:
+        return self.count(PROVISIONED) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"Provisioned: {self.count(PROVISIONED)}, Duplicates: {self.count(DUPLICATE)}, "
+                f"Unknown people: {self.count(UNKNOWN_PERSON)}, Failed: {self.count(FAILED)} "
+                f"in {self.elapsed:.1f}s ({self.devices_per_second:.1f} devices/s)")
+
+    def write_csv(self, path: str):
+        """
+        Writes the per-device results to a CSV file.
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "mac", "model", "email", "status", "detail"])
+            for r in sorted(self.results, key=lambda r: r.row.number):
+                writer.writerow([r.row.number, r.row.mac, r.row.model, r.row.email, r.status, r.detail])
+
+
+def normalize_model(model: str) -> str:
+    """
+    Accepts either a full model name ("DMS Cisco 8851") or just its number ("8851").
+    """
+    model = model.strip()
+    for supported in SUPPORTED_MODELS:
+        if model.lower() in (supported.lower(), supported.split()[-1]):
+            return supported
+    return model
+
+
+def load_device_rows(path: str) -> list:
+    """
+    Reads a rollout CSV with the columns mac, model and email.
+
+        mac,model,email
+        A1B2C3D4E5F6,8851,alice@example.com
+
+    MAC addresses may use ':' or '-' separators; they are removed.
+
+    Returns:
+        list: DeviceRow objects, numbered from 1 in file order.
+    """
+    with open(path, newline="") as f:
+        return [DeviceRow(number,
+                          re.sub(r"[:\-.]", "", row["mac"].strip()).upper(),
+                          normalize_model(row["model"]),
+                          row["email"].strip())
+                for number, row in enumerate(csv.DictReader(f), start=1)]
+
+
+def validate_rows(rows: list) -> list:
+    """
+    Checks every row before anything is sent.
+
+    Returns:
+        list: DeviceResult objects with status 'invalid' for each broken row (empty if all rows are valid).
+    """
+    errors = []
+    seen = {}
+    for row in rows:
+        if not is_valid_mac_address(row.mac):
+            errors.append(DeviceResult(row, INVALID, "MAC Address format is incorrect. Use a MAC Address like A1B2C3D4E5F6"))
+        elif row.mac in seen:
+            errors.append(DeviceResult(row, INVALID, f"MAC Address already listed in row {seen[row.mac]}"))
+        elif row.model not in SUPPORTED_MODELS:
+            errors.append(DeviceResult(row, INVALID, f"Unsupported model '{row.model}'"))
+        elif not row.email:
+            errors.append(DeviceResult(row, INVALID, "Missing person email"))
+        seen.setdefault(row.mac, row.number)
+    return errors
+
+
+def provision_devices(access_token: str, rows: list, people_index, broadcaster: Broadcaster = None) -> DeviceReport:
+    """
+    Provisions many devices concurrently. Rows should have been checked with 'validate_rows' first.
+
+    Args:
+        access_token (str): Admin access token allowed to add devices.
+        rows (list): DeviceRow objects.
+        people_index (PeopleIndex): Index used to resolve all person emails in one batch.
+        broadcaster (Broadcaster): Optional. Runs the requests concurrently under a rate limit.
+
+    Returns:
+        DeviceReport: Per-device results and throughput.
+    """
+    broadcaster = broadcaster or Broadcaster(max_workers=8, rate=5)
+    report = DeviceReport()
+    started = time.monotonic()
+
+    # Resolve every person email in one batch.
+    people = people_index.resolve_many(row.email for row in rows)
+    pending = []
+    for row in rows:
+        if people.get(row.email) is None:
+            report.results.append(DeviceResult(row, UNKNOWN_PERSON, f"No person found with email {row.email}"))
+        else:
+            pending.append(row)
+
+    duplicates = set()
+    # Rows whose request failed after it may have reached Webex (5xx, timeout): a 409 on their
+    # retry means the earlier attempt added the device, not that the MAC was already in use.
+    uncertain = set()
+
+    def submit(row: DeviceRow):
+        try:
+            response = provision_device(access_token, row.mac, row.model, people[row.email].id)
+        except (requests.ConnectionError, requests.Timeout):
+            uncertain.add(row.number)
+            raise
+        if response.status_code == 409:
+            if row.number not in uncertain:
+                duplicates.add(row.number)
+        elif response.status_code != 200:
+            if response.status_code >= 500:
+                uncertain.add(row.number)
+            # Raised with the response, so the Broadcaster can honor 429 'Retry-After'.
+            raise requests.HTTPError(f"{response.status_code} - {response.text}", response=response)
+
+    summary = broadcaster.run(pending, submit, idempotent=True)
+    for result in summary.results:
+        row = result.recipient
+        if result.status != DELIVERED:
+            report.results.append(DeviceResult(row, FAILED, result.error))
+        elif row.number in duplicates:
+            report.results.append(DeviceResult(row, DUPLICATE, "MAC Address is duplicated"))
+        else:
+            report.results.append(DeviceResult(row, PROVISIONED))
+
+    report.elapsed = time.monotonic() - started
+    return report
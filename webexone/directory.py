@@ -0,0 +1,235 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+In-memory (and optionally on-disk) index of the organization directory.
+
+Resolving an email with 'webex.people.list(email=...)' costs one API call per lookup,
+which adds up quickly for bulk jobs that resolve thousands of emails. A 'PeopleIndex'
+is built once from a bulk listing, keyed by lowercase email and personId, and then
+kept up to date incrementally: misses are looked up and added, and stale entries are
+re-fetched in batches. Only misses ever hit the network: concurrent lookups of the same
+email share one API call ('SingleFlight'), and an email nobody has is remembered for a
+minute only, so a person created since is found.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from webexpythonsdk import Person
+
+from webexone.cache import MISSING, CacheStats, SingleFlight, TTLCache
+from webexone.metrics import metrics
+from webexone.people import first_person, iter_people
+
+# The People API accepts up to 85 person IDs in a single 'id' filter.
+MAX_IDS_PER_REQUEST = 85
+
+
+class PeopleIndex:
+    """
+    Directory index keyed by lowercase email and personId.
+
+    Example:
+        people_index = PeopleIndex(webex, path="people_index.json")
+        people_index.build()                                  # One bulk listing.
+        person = people_index.lookup("user@example.com")      # No API call on a hit.
+        found = people_index.resolve_many(emails)             # API calls only for misses.
+        people_index.save()
+    """
+
+    def __init__(self, webex, path: str = None, name: str = "people_index", negative_ttl: float = 60,
+                 max_missing: int = 4096):
+        """
+        Args:
+            webex (WebexAPI): The client used to list and look up people.
+            path (str): Optional. JSON file the index is loaded from (if it exists) and saved to.
+            name (str): The name its hit/miss counters are exported under (on '/metrics' and in 'stats').
+            negative_ttl (float): How long (seconds) an email looked up without a match is remembered.
+            max_missing (int): Maximum number of such emails remembered.
+        """
+        self.webex = webex
+        self.path = path
+        self.stats = CacheStats()
+        metrics.register_cache(name, self.stats)
+        self._by_id = {}       # personId -> (Person, time fetched)
+        self._by_email = {}    # lowercase email -> personId
+        # Emails already looked up without a match (its own counters stay out of 'stats').
+        self._missing = TTLCache(maxsize=max_missing, ttl=negative_ttl)
+        self._flight = SingleFlight(self.stats)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def add(self, person: Person, fetched: float = None):
+        """
+        Adds or replaces a person in the index.
+        """
+        with self._lock:
+            previous = self._by_id.get(person.id)
+            if previous:
+                for old_email in previous[0].emails or []:
+                    self._by_email.pop(old_email.lower(), None)
+            self._by_id[person.id] = (person, fetched or time.time())
+            for person_email in person.emails or []:
+                self._by_email[person_email.lower()] = person.id
+                self._missing.invalidate(person_email.lower())
+
+    def remove(self, person_id: str):
+        """
+        Removes a person (e.g. deleted from the organization) from the index.
+        """
+        with self._lock:
+            entry = self._by_id.pop(person_id, None)
+            if entry:
+                for person_email in entry[0].emails or []:
+                    self._by_email.pop(person_email.lower(), None)
+
+    def build(self, page_size: int = 1000) -> int:
+        """
+        (Re)builds the index from one bulk listing of the whole organization.
+
+        Returns:
+            int: The number of people indexed.
+        """
+        started = time.time()
+        for person in iter_people(self.webex, page_size=page_size):
+            self.add(person, started)
+        # Anyone not returned by the listing is no longer in the organization.
+        for person_id, (_, fetched) in list(self._by_id.items()):
+            if fetched < started:
+                self.remove(person_id)
+        return len(self)
+
+    def get(self, person_id: str):
+        """
+        Returns the indexed person with this ID, or None if it is not indexed.
+        """
+        entry = self._by_id.get(person_id)
+        return entry[0] if entry else None
+
+    def _peek(self, email: str):
+        """
+        Returns (True, person or None) when the index knows the answer, (False, None) otherwise.
+        """
+        key = email.lower()
+        person_id = self._by_email.get(key)
+        if person_id is not None:
+            return True, self.get(person_id)
+        return self._missing.get(key) is not MISSING, None
+
+    def lookup(self, email: str):
+        """
+        Returns the person with this email address, looking it up (and indexing it) on a miss.
+
+        Returns:
+            webexpythonsdk.models.Person: The person, or None if nobody has this email.
+        """
+        known, person = self._peek(email)
+        if known:
+            self.stats.hits += 1
+            return person
+
+        self.stats.misses += 1
+        return self._flight.do(email.lower(), lambda: self._fetch(email))
+
+    def _fetch(self, email: str):
+        person = first_person(self.webex, email=email)
+        # Indexed before the waiting lookups are released, so later ones hit the index.
+        if person:
+            self.add(person)
+        else:
+            self._missing.set(email.lower(), None)
+        return person
+
+    def resolve_many(self, emails, max_workers: int = 8) -> dict:
+        """
+        Resolves many emails at once. Hits are served from the index; misses are looked up concurrently.
+
+        Args:
+            emails (iterable): Email addresses to resolve.
+            max_workers (int): Number of concurrent lookups for the misses.
+
+        Returns:
+            dict: email -> Person (or None when nobody has that email).
+        """
+        results = {}
+        misses = []
+        for email_address in dict.fromkeys(emails):
+            known, person = self._peek(email_address)
+            if known:
+                self.stats.hits += 1
+                results[email_address] = person
+            else:
+                misses.append(email_address)
+        if misses:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results.update(zip(misses, executor.map(self.lookup, misses)))
+        return results
+
+    def refresh(self, max_age: float = 86400) -> int:
+        """
+        Incrementally refreshes entries older than 'max_age' seconds.
+
+        Stale people are re-fetched in batches of up to 85 IDs per request instead of
+        relisting the whole organization. People no longer returned are removed.
+
+        Args:
+            max_age (float): Entries fetched longer ago than this (seconds) are refreshed.
+
+        Returns:
+            int: The number of entries refreshed.
+        """
+        cutoff = time.time() - max_age
+        stale = [person_id for person_id, (_, fetched) in list(self._by_id.items()) if fetched < cutoff]
+        for start in range(0, len(stale), MAX_IDS_PER_REQUEST):
+            batch = stale[start:start + MAX_IDS_PER_REQUEST]
+            fetched = time.time()
+            returned = set()
+            for person in iter_people(self.webex, id=",".join(batch)):
+                self.add(person, fetched)
+                returned.add(person.id)
+            for person_id in set(batch) - returned:
+                self.remove(person_id)
+        # Someone may have been given one of these emails since.
+        self._missing.clear()
+        return len(stale)
+
+    def save(self, path: str = None):
+        """
+        Writes the index to a JSON file. The write is atomic, so a crash never leaves a truncated file.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given to save the people index to")
+        with self._lock:
+            data = {"people": [{"person": person.to_dict(), "fetched": fetched}
+                               for person, fetched in self._by_id.values()]}
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".people_index-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, path: str = None):
+        """
+        Loads the index from a JSON file written by 'save()'.
+        """
+        with open(path or self.path) as f:
+            data = json.load(f)
+        for entry in data.get("people", []):
+            self.add(Person(entry["person"]), entry["fetched"])
@@ -0,0 +1,138 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Background execution of bot commands.
+
+'WebexBot' runs 'Command.execute' inline on its message loop, so a slow command (an
+org-wide broadcast, a device provisioning call) stalls every other user talking to the
+bot. A 'BackgroundCommand' answers right away with an acknowledgment, runs its work on a
+shared, bounded 'Dispatcher' thread pool and posts the final reply to the room when the
+job completes. Each command also limits how many of its jobs run at the same time;
+extra jobs wait in a per-command queue without holding a worker thread.
+"""
+
+import contextvars
+import logging
+import threading
+import types
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from webex_bot.formatting import quote_info
+from webex_bot.models.command import Command
+from webex_bot.models.response import Response
+
+from webexone.metrics import metrics
+
+log = logging.getLogger(__name__)
+
+
+class Dispatcher:
+    """
+    A bounded pool of worker threads shared by the background commands of a bot.
+    """
+
+    def __init__(self, webex, max_workers: int = 8):
+        """
+        Args:
+            webex (WebexAPI): Client (bot token) used to post the final replies.
+            max_workers (int): Number of command jobs running at the same time across all commands.
+        """
+        self.webex = webex
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="command")
+
+    def submit(self, fn, *args):
+        # Run with the caller's context, so the API calls made by 'fn' are charged to its command.
+        return self.executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def deliver(self, reply, room_id: str):
+        """
+        Posts a command reply to a room. Accepts the same replies as 'WebexBot': a markdown string,
+        a 'Response', or a list/generator of either.
+        """
+        if not reply:
+            return
+        if isinstance(reply, (list, types.GeneratorType)):
+            for item in reply:
+                self.deliver(item, room_id)
+        elif isinstance(reply, Response):
+            message = reply.as_dict()
+            message.setdefault("roomId", room_id)
+            self.webex.messages.create(**message)
+        else:
+            self.webex.messages.create(roomId=room_id, markdown=reply)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+
+class BackgroundCommand(Command):
+    """
+    A 'Command' whose work runs on a 'Dispatcher' instead of the bot's message loop.
+
+    Subclasses implement 'run()' (same arguments and return values as 'execute()').
+    'execute()' returns the acknowledgment immediately and the value returned by 'run()'
+    is posted to the room once the job completes.
+    """
+
+    acknowledgment = "Working on it..."
+
+    def __init__(self, dispatcher: Dispatcher, max_concurrency: int = 1, **kwargs):
+        """
+        Args:
+            dispatcher (Dispatcher): The pool the command's jobs run on.
+            max_concurrency (int): Maximum number of jobs of this command running at the same time.
+            **kwargs: Passed on to 'Command' (command_keyword, card_callback_keyword, ...).
+        """
+        super().__init__(**kwargs)
+        self.dispatcher = dispatcher
+        self.max_concurrency = max_concurrency
+        self._running = 0
+        self._pending = deque()
+        self._lock = threading.Lock()
+
+    def run(self, message, attachment_actions, activity):
+        """
+        The actual work of the command. Override in subclasses.
+        """
+        raise NotImplementedError
+
+    def execute(self, message, attachment_actions, activity):
+        # Typed commands pass the message, card submissions the attachment action; both carry the room.
+        room_id = getattr(attachment_actions, "roomId", None) or activity.get("target", {}).get("globalId")
+        job = (message, attachment_actions, activity, room_id)
+        with self._lock:
+            if self._running >= self.max_concurrency:
+                ahead = self._running + len(self._pending)
+                self._pending.append(job)
+                return quote_info(f"Queued: {ahead} request(s) ahead of yours. "
+                                  f"I'll reply here when it's done.")
+            self._running += 1
+        self.dispatcher.submit(self._run_job, job)
+        return quote_info(self.acknowledgment)
+
+    def _run_job(self, job):
+        message, attachment_actions, activity, room_id = job
+        try:
+            try:
+                # Timed apart from 'execute', which only acknowledges the request.
+                with metrics.command(f"{self.command_keyword or self.card_callback_keyword} (background)"):
+                    reply = self.run(message, attachment_actions, activity)
+            except Exception as e:
+                log.exception("Background command failed", extra={"command": self.command_keyword or self.card_callback_keyword})
+                reply = quote_info(f"Something went wrong while processing your request: {e}")
+            self.dispatcher.deliver(reply, room_id)
+        except Exception as e:
+            log.warning("Could not deliver the reply: %s", e, extra={"room_id": room_id})
+        finally:
+            # Start the next queued job of this command, if any, on the freed slot.
+            with self._lock:
+                next_job = self._pending.popleft() if self._pending else None
+                if next_job is None:
+                    self._running -= 1
+            if next_job is not None:
+                self.dispatcher.submit(self._run_job, next_job)
@@ -0,0 +1,274 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Local store for feedback submissions, with batched writes, digests and CSV export.
+
+Forwarding every submission as a direct message floods the admin (and the API) after an
+org-wide feedback request. Submissions are instead queued in memory and written to a
+SQLite file by a single writer thread, many rows per transaction. The admin gets:
+
+- a periodic digest: one message summarizing the submissions received since the last one,
+- a report on demand ('report()', used by the 'feedback report' bot command),
+- a CSV export of every submission ('export_csv()').
+
+A submission is on disk at most 'flush_interval' seconds after 'add()' returns; 'close()'
+(registered at exit) writes whatever is still queued. A batch that can't be written (e.g.
+the database is locked) is retried until it is, so an acknowledged submission isn't lost.
+The writer thread is started by the first 'add()' of each process: a worker forked after
+the store was created (webhook mode) gets its own.
+"""
+
+import atexit
+import csv
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    person_id TEXT,
+    email TEXT,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+CSV_COLUMNS = ("id", "created", "person_id", "email", "text")
+
+
+class FeedbackStore:
+    """
+    Feedback submissions in a SQLite file, written in batches by a background thread.
+
+    Example:
+        store = FeedbackStore("feedback.sqlite3")
+        store.add(person_id, email, text)       # Returns immediately.
+        print(store.report())                   # Markdown summary of every submission.
+        store.export_csv("feedback.csv")
+    """
+
+    def __init__(self, path: str, batch_size: int = 100, flush_interval: float = 1.0):
+        """
+        Args:
+            path (str): The SQLite database file. Created if it doesn't exist.
+            batch_size (int): Maximum submissions written in one transaction.
+            flush_interval (float): Maximum seconds a submission waits in memory before it is written.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._reset()
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+        atexit.register(self.close)
+
+    def _reset(self):
+        # State owned by one process. A forked child must not use its parent's connections,
+        # and the parent's writer thread doesn't exist in the child.
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._writer = None
+
+    def _check_process(self):
+        if self._pid != os.getpid():
+            with self._writer_lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _start_writer(self):
+        self._check_process()
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="feedback-writer", daemon=True)
+                    self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the SQLite connection of the current thread (connections can't be shared between threads).
+        """
+        self._check_process()
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")  # Reports don't block the writer.
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def add(self, person_id: str, email: str, text: str):
+        """
+        Queues a submission. It is written with the next batch.
+        """
+        self._start_writer()
+        self._queue.put((time.time(), person_id, email, text or ""))
+
+    def _write_loop(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Collect what else arrives within the flush interval, up to a full batch.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch: list):
+        """
+        Writes one batch, retrying with backoff until it is committed. When the store is closing,
+        it gives up after a few attempts rather than blocking the exit forever.
+        """
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                db = self._connect()
+                with db:
+                    db.execute("BEGIN IMMEDIATE")
+                    db.executemany("INSERT INTO feedback (created, person_id, email, text) VALUES (?, ?, ?, ?)", batch)
+                return
+            except sqlite3.Error as e:
+                if self._stop.is_set() and attempts >= 5:
+                    log.error("Could not write %d feedback submission(s), giving up: %s", len(batch), e)
+                    return
+                delay = min(30.0, 0.5 * 2 ** (attempts - 1))
+                log.warning("Could not write %d feedback submission(s), retrying in %.1fs: %s", len(batch), delay, e)
+                time.sleep(delay)
+
+    def flush(self):
+        """
+        Waits until every queued submission is written.
+        """
+        self._check_process()
+        self._queue.join()
+
+    def close(self):
+        """
+        Writes the queued submissions and stops the writer thread.
+        """
+        self._check_process()
+        if not self._stop.is_set():
+            self._stop.set()
+            if self._writer is not None:
+                self._writer.join()
+
+    def count(self, after_id: int = 0, until_id: int = None) -> int:
+        return self.summary(after_id, latest=0, until_id=until_id)["count"]
+
+    def summary(self, after_id: int = 0, latest: int = 5, until_id: int = None) -> dict:
+        """
+        Aggregates the submissions with an ID above 'after_id' (and up to 'until_id', if given).
+
+        Returns:
+            dict: 'count', 'people' (distinct senders), 'first' / 'last' (timestamps),
+                  'last_id' and the 'latest' submissions (newest first).
+        """
+        db = self._connect()
+        where, bounds = "id > ?", (after_id,)
+        if until_id is not None:
+            where, bounds = "id > ? AND id <= ?", (after_id, until_id)
+        row = db.execute("SELECT COUNT(*), COUNT(DISTINCT email), MIN(created), MAX(created), MAX(id) "
+                         f"FROM feedback WHERE {where}", bounds).fetchone()
+        rows = db.execute(f"SELECT * FROM feedback WHERE {where} ORDER BY id DESC LIMIT ?", (*bounds, latest))
+        return {"count": row[0], "people": row[1], "first": row[2], "last": row[3], "last_id": row[4] or after_id,
+                "latest": [dict(r) for r in rows]}
+
+    def report(self, after_id: int = 0, title: str = "Feedback report", latest: int = 5, until_id: int = None) -> str:
+        """
+        Summarizes the submissions with an ID above 'after_id' (and up to 'until_id') in one markdown message.
+        """
+        summary = self.summary(after_id, latest, until_id)
+        if not summary["count"]:
+            return f"**{title}**\n\nNo feedback received."
+        day = "%Y-%m-%d %H:%M"
+        lines = [f"**{title}**", "",
+                 f"{summary['count']} submission(s) from {summary['people']} person(s), "
+                 f"{time.strftime(day, time.localtime(summary['first']))} to "
+                 f"{time.strftime(day, time.localtime(summary['last']))}.", "",
+                 "Latest:"]
+        for item in summary["latest"]:
+            text = " ".join(item["text"].split())
+            lines.append(f"- **{item['email']}**: {text[:200] + '...' if len(text) > 200 else text}")
+        return "\n".join(lines)
+
+    def export_csv(self, path: str, after_id: int = 0) -> int:
+        """
+        Writes the submissions to a CSV file (streamed, so any number of rows fits).
+
+        Returns:
+            int: Number of submissions exported.
+        """
+        exported = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            for row in self._connect().execute("SELECT * FROM feedback WHERE id > ? ORDER BY id", (after_id,)):
+                writer.writerow([row["id"], time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["created"])),
+                                 row["person_id"], row["email"], row["text"]])
+                exported += 1
+        return exported
+
+    def digest(self, send) -> int:
+        """
+        Sends one digest of the submissions received since the last digest.
+        The position of the last digest is stored with the submissions, so a restart doesn't repeat it.
+
+        Args:
+            send (callable): send(markdown) posts the digest. If it raises, the next digest covers these submissions too.
+
+        Returns:
+            int: Number of submissions in the digest (0 when nothing new was received, nothing is sent then).
+        """
+        self.flush()
+        db = self._connect()
+        row = db.execute("SELECT value FROM meta WHERE key = 'digest_id'").fetchone()
+        after_id = int(row[0]) if row else 0
+        # Bound the digest first: submissions written while it is built belong to the next one.
+        last_id = db.execute("SELECT MAX(id) FROM feedback").fetchone()[0] or 0
+        if last_id <= after_id:
+            return 0
+        count = self.count(after_id, last_id)
+        send(self.report(after_id, title="Feedback digest", until_id=last_id))
+        db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('digest_id', ?)", (str(last_id),))
+        return count
+
+    def start_digest(self, send, interval: float):
+        """
+        Sends a digest every 'interval' seconds from a background thread (see 'digest').
+        """
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    count = self.digest(send)
+                    if count:
+                        log.info("Sent a feedback digest", extra={"submissions": count})
+                except Exception as e:
+                    log.warning("Could not send the feedback digest: %s", e)
+
+        threading.Thread(target=loop, name="feedback-digest", daemon=True).start()
@@ -0,0 +1,447 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Durable background job queue backed by a local SQLite file.
+
+A long-running command (an org-wide broadcast, a device rollout) is stored as a job made
+of one task per recipient or device. Bot commands only enqueue the job and answer right
+away; a pool of worker threads drains the tasks. Everything is persisted, so the bot can
+be restarted (or several bot processes can share the file) without redoing or dropping
+half-finished work:
+
+- A job is first "planned": its planner lists the tasks (e.g. every person of the
+  organization). Tasks are keyed by an idempotency key (the recipient email, the device
+  MAC address), so planning again after a crash never duplicates them.
+- Workers lease tasks for a limited time. A task whose worker died is leased again once
+  its lease expires (at-least-once delivery). A worker renews the lease of each task right
+  before running it (after any rate-limit wait) and skips a task whose lease it lost, and
+  it only records the outcome while it still owns the lease, so a slow worker never runs a
+  task another worker took over, nor overwrites its result. Transient failures are
+  retried with backoff; '429' answers pause every worker for 'Retry-After'.
+- When the last task of a job finishes, the job's completion callback runs once.
+"""
+
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+
+from webex_bot.formatting import quote_info
+from webex_bot.models.command import Command
+
+from webexone.metrics import metrics
+from webexone.ratelimit import TokenBucket, is_retryable, retry_after_from
+
+log = logging.getLogger(__name__)
+
+# Job states.
+PLANNING = "planning"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Task states. A 'leased' task whose lease expired is available again.
+PENDING = "pending"
+LEASED = "leased"
+# DONE and FAILED are shared with jobs.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    room_id TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    created REAL NOT NULL,
+    finished REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    job_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_available ON tasks (status, available_at);
+"""
+
+
+class JobQueue:
+    """
+    A persistent queue of jobs split into leased, idempotent tasks.
+
+    Example:
+        jobs = JobQueue("jobs.sqlite3", workers=8, rate=5)
+        jobs.register("broadcast", send_one, plan=list_recipients, on_complete=post_summary)
+        jobs.start()
+        job_id = jobs.enqueue("broadcast", {"text": "Hi!"}, room_id=room_id)
+    """
+
+    def __init__(self, path: str, workers: int = 4, rate: float = None, lease: float = 60.0,
+                 max_attempts: int = 5, backoff: float = 1.0, max_backoff: float = 60.0,
+                 batch_size: int = 10, poll_interval: float = 0.5):
+        """
+        Args:
+            path (str): The SQLite database file. Created if it doesn't exist.
+            workers (int): Number of worker threads draining the tasks.
+            rate (float): Optional. Maximum number of tasks started per second, shared by all workers.
+            lease (float): Seconds a worker owns the tasks it leased before they become available again.
+            max_attempts (int): Attempts of a task (or a job's planning) before it is marked as failed.
+            backoff (float): Initial delay (seconds) before retrying a transient failure. Doubles each time.
+            max_backoff (float): Upper bound for the delay between retries.
+            batch_size (int): Tasks leased at once by a worker.
+            poll_interval (float): Seconds an idle worker waits before looking for work again.
+        """
+        self.path = path
+        self.workers = workers
+        self.bucket = TokenBucket(rate) if rate else None
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._handlers = {}
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._threads = []
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the SQLite connection of the current thread (connections can't be shared between threads).
+        """
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")  # Readers (status) don't block the workers.
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def register(self, kind: str, handler, plan=None, on_complete=None):
+        """
+        Registers how jobs of a kind are run. Only registered kinds are picked up by this queue's workers.
+
+        Args:
+            kind (str): Name of the job kind.
+            handler (callable): Runs one task: handler(task_payload) -> optional result string.
+                                Raise to fail the task (transient errors are retried).
+            plan (callable): Optional. planner(job_payload) -> iterable of (key, task_payload).
+                             Without a planner, tasks are given to 'enqueue' directly.
+            on_complete (callable): Optional. on_complete(job, progress) once every task has finished.
+        """
+        self._handlers[kind] = (handler, plan, on_complete)
+
+    def enqueue(self, kind: str, payload: dict = None, room_id: str = None, tasks=None) -> str:
+        """
+        Stores a new job.
+
+        Args:
+            kind (str): A registered job kind.
+            payload (dict): Job parameters, passed to the planner.
+            room_id (str): Optional. Room that asked for the job (progress and results are shown there).
+            tasks (iterable): Optional. (key, task_payload) pairs, when the job has no planner.
+
+        Returns:
+            str: The job ID.
+        """
+        job_id = uuid.uuid4().hex[:8]
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("INSERT INTO jobs (id, kind, room_id, payload, status, available_at, created) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (job_id, kind, room_id, json.dumps(payload or {}), PLANNING if tasks is None else RUNNING, now, now))
+            if tasks is not None:
+                self._insert_tasks(db, job_id, kind, tasks)
+        if tasks is not None:
+            self._check_complete(job_id)
+        return job_id
+
+    @staticmethod
+    def _insert_tasks(db, job_id: str, kind: str, tasks) -> int:
+        # INSERT OR IGNORE: a task key that already exists in the job is not added again.
+        cursor = db.executemany("INSERT OR IGNORE INTO tasks (job_id, key, kind, payload) VALUES (?, ?, ?, ?)",
+                                ((job_id, key, kind, json.dumps(payload)) for key, payload in tasks))
+        return cursor.rowcount
+
+    def start(self):
+        """
+        Starts the worker threads. Work left over by a previous run is picked up once its leases expire.
+        """
+        for number in range(self.workers - len(self._threads)):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait: bool = True):
+        """
+        Stops the workers after their current batch. Unfinished tasks stay in the database.
+        """
+        self._stop.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                worked = self._plan_one() or self._run_batch()
+            except sqlite3.OperationalError as e:
+                log.debug("Job queue database busy, retrying: %s", e)
+                worked = False
+            if not worked:
+                self._stop.wait(self.poll_interval)
+
+    def _kinds(self) -> tuple:
+        return tuple(self._handlers)
+
+    def _plan_one(self) -> bool:
+        """
+        Leases one job waiting to be planned and stores its tasks.
+        """
+        kinds = self._kinds()
+        if not kinds:
+            return False
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            job = db.execute(f"SELECT * FROM jobs WHERE status = ? AND available_at <= ? "
+                             f"AND kind IN ({','.join('?' * len(kinds))}) ORDER BY created LIMIT 1",
+                             (PLANNING, now, *kinds)).fetchone()
+            if job is None:
+                return False
+            db.execute("UPDATE jobs SET attempts = attempts + 1, available_at = ? WHERE id = ?",
+                       (now + self.lease, job["id"]))
+
+        _, plan, _ = self._handlers[job["kind"]]
+        try:
+            with metrics.command(f"job:{job['kind']}:plan"):
+                batch = []
+                for task in plan(json.loads(job["payload"])):
+                    batch.append(task)
+                    if len(batch) >= 500:
+                        self._store_plan_batch(job["id"], job["kind"], batch)
+                        batch = []
+                self._store_plan_batch(job["id"], job["kind"], batch)
+        except Exception as e:
+            failed = job["attempts"] + 1 >= self.max_attempts or not is_retryable(e)
+            log.warning("Planning the job failed: %s", e, extra={"job_id": job["id"], "attempt": job["attempts"] + 1})
+            with db:
+                db.execute("UPDATE jobs SET status = ?, available_at = ?, error = ? WHERE id = ?",
+                           (FAILED if failed else PLANNING, time.time() + self._delay(job["attempts"] + 1, e),
+                            str(e), job["id"]))
+            if failed:
+                self._notify(job["id"])
+            return True
+
+        with db:
+            db.execute("UPDATE jobs SET status = ? WHERE id = ?", (RUNNING, job["id"]))
+        self._check_complete(job["id"])
+        return True
+
+    def _store_plan_batch(self, job_id: str, kind: str, batch: list):
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            self._insert_tasks(db, job_id, kind, batch)
+            # Extend the planning lease: a large organization takes a while to list.
+            db.execute("UPDATE jobs SET available_at = ? WHERE id = ?", (time.time() + self.lease, job_id))
+
+    def _run_batch(self) -> bool:
+        """
+        Leases a batch of available tasks and runs them.
+        """
+        kinds = self._kinds()
+        if not kinds:
+            return False
+        now = time.time()
+        deadline = now + self.lease
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            tasks = db.execute(f"SELECT rowid, job_id, key, kind, payload, attempts FROM tasks "
+                               f"WHERE status IN (?, ?) AND available_at <= ? "
+                               f"AND kind IN ({','.join('?' * len(kinds))}) LIMIT ?",
+                               (PENDING, LEASED, now, *kinds, self.batch_size)).fetchall()
+            db.executemany("UPDATE tasks SET status = ?, attempts = attempts + 1, available_at = ? WHERE rowid = ?",
+                           ((LEASED, deadline, task["rowid"]) for task in tasks))
+        for task in tasks:
+            self._run_task(task, deadline)
+        for job_id in {task["job_id"] for task in tasks}:
+            self._check_complete(job_id)
+        return bool(tasks)
+
+    def _renew_lease(self, rowid: int, deadline: float) -> float:
+        """
+        Extends the lease of a task this worker still owns.
+
+        Returns:
+            float: The new deadline, or None if the lease expired and another worker may own the task.
+        """
+        renewed = time.time() + self.lease
+        db = self._connect()
+        with db:
+            cursor = db.execute("UPDATE tasks SET available_at = ? WHERE rowid = ? AND status = ? AND available_at = ?",
+                                (renewed, rowid, LEASED, deadline))
+        return renewed if cursor.rowcount else None
+
+    def _finish_task(self, rowid: int, deadline: float, status: str, available_at: float = None,
+                     result: str = None, error: str = None):
+        # Only while the lease is still ours: a worker that lost it must not overwrite the new owner.
+        db = self._connect()
+        with db:
+            cursor = db.execute("UPDATE tasks SET status = ?, available_at = COALESCE(?, available_at), "
+                                "result = ?, error = ? WHERE rowid = ? AND status = ? AND available_at = ?",
+                                (status, available_at, result, error, rowid, LEASED, deadline))
+        if not cursor.rowcount:
+            log.warning("Lost the lease of a task before recording its outcome", extra={"rowid": rowid})
+
+    def _run_task(self, task, deadline: float):
+        handler, _, _ = self._handlers[task["kind"]]
+        attempts = task["attempts"] + 1
+        if self.bucket:
+            self.bucket.acquire()
+        # The rate limiter (or a 429 pause) may have kept this task waiting: renew its lease
+        # now, and leave it alone if it expired in the meantime.
+        deadline = self._renew_lease(task["rowid"], deadline)
+        if deadline is None:
+            return
+        try:
+            with metrics.command(f"job:{task['kind']}"):
+                result = handler(json.loads(task["payload"]))
+        except Exception as e:
+            retry_after = retry_after_from(e)
+            if retry_after is not None and self.bucket:
+                # Rate limited: pause every worker, not just this one.
+                self.bucket.pause(retry_after)
+            if attempts >= self.max_attempts or not is_retryable(e):
+                self._finish_task(task["rowid"], deadline, FAILED, error=str(e))
+            else:
+                self._finish_task(task["rowid"], deadline, PENDING, available_at=time.time() + self._delay(attempts, e),
+                                  error=str(e))
+            return
+        self._finish_task(task["rowid"], deadline, DONE, result=result)
+
+    def _delay(self, attempts: int, error: Exception) -> float:
+        retry_after = retry_after_from(error)
+        if retry_after is not None:
+            return retry_after
+        # Exponential backoff with jitter so retries do not line up.
+        return min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+    def _check_complete(self, job_id: str):
+        """
+        Marks a running job as done once none of its tasks is left, and notifies exactly once.
+        """
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            cursor = db.execute("UPDATE jobs SET status = ?, finished = ? WHERE id = ? AND status = ? AND NOT EXISTS "
+                                "(SELECT 1 FROM tasks WHERE job_id = ? AND status IN (?, ?))",
+                                (DONE, time.time(), job_id, RUNNING, job_id, PENDING, LEASED))
+        if cursor.rowcount:
+            self._notify(job_id)
+
+    def _notify(self, job_id: str):
+        job = self.job(job_id)
+        _, _, on_complete = self._handlers.get(job["kind"], (None, None, None))
+        if on_complete:
+            try:
+                on_complete(job, self.progress(job_id))
+            except Exception:
+                log.exception("Completion callback failed", extra={"job_id": job_id})
+
+    def job(self, job_id: str) -> dict:
+        """
+        Returns a job as a dict (with its payload decoded), or None if it doesn't exist.
+        """
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def progress(self, job_id: str) -> dict:
+        """
+        Counts the tasks of a job by state.
+
+        Returns:
+            dict: Task counts ('pending', 'leased', 'done', 'failed') plus 'total'.
+        """
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for row in self._connect().execute("SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status",
+                                           (job_id,)):
+            counts[row[0]] = row[1]
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def results(self, job_id: str, status: str = None) -> list:
+        """
+        Returns the tasks of a job (key, status, attempts, result, error), optionally only those in one state.
+        """
+        query = "SELECT key, status, attempts, result, error FROM tasks WHERE job_id = ?"
+        params = (job_id,)
+        if status:
+            query += " AND status = ?"
+            params += (status,)
+        return [dict(row) for row in self._connect().execute(query, params)]
+
+    def describe(self, job_id: str) -> str:
+        """
+        A one-line, human readable progress report of a job.
+        """
+        job = self.job(job_id)
+        if job is None:
+            return f"No job with ID {job_id}"
+        progress = self.progress(job_id)
+        text = (f"Job {job_id} ({job['kind']}): {job['status']}. "
+                f"{progress[DONE]}/{progress['total']} done, {progress[FAILED]} failed, "
+                f"{progress[PENDING] + progress[LEASED]} pending")
+        if job["error"] and job["status"] == FAILED:
+            text += f". Error: {job['error']}"
+        return text
+
+
+class JobStatusCommand(Command):
+    """
+    'status <job>' shows the progress of a background job started from the same room.
+    """
+
+    def __init__(self, queue: JobQueue):
+        super().__init__(
+            command_keyword="status",
+            help_message="Show the progress of a background job: status <job ID>")
+        self.queue = queue
+
+    def execute(self, message, attachment_actions, activity):
+        job_id = message.strip()
+        if not job_id:
+            return quote_info("Usage: status <job ID>")
+        job = self.queue.job(job_id)
+        # Jobs are only visible from the room that started them.
+        if job is None or job["room_id"] != getattr(attachment_actions, "roomId", None):
+            return quote_info(f"No job with ID {job_id}")
+        return quote_info(self.queue.describe(job_id))
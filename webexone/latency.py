@@ -0,0 +1,105 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Latency percentiles over a rolling time window.
+
+Averages hide the slow requests users actually notice, so latencies are reported as
+percentiles (p50/p95/p99). 'LatencyWindow' keeps the samples of the last 'window'
+seconds (bounded in number), together with their outcome, to report percentiles and the
+error rate of a probe, an endpoint or a command.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+
+def percentile(values, p: float) -> float:
+    """
+    Returns the p-th percentile (0-100) of the values, interpolating between the closest ranks.
+
+    Args:
+        values (iterable): The samples. Sorted or not.
+        p (float): The percentile, e.g. 95.
+
+    Returns:
+        float: The percentile, or 0.0 when there are no values.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class LatencyWindow:
+    """
+    Thread-safe latency samples of the last 'window' seconds.
+
+    Example:
+        window = LatencyWindow(window=300)
+        window.add(0.120)
+        window.add(2.5, ok=False)
+        print(window.snapshot())   # {'count': 2, 'errors': 1, 'error_rate': 0.5, 'p50': ..., ...}
+    """
+
+    def __init__(self, window: float = 300, maxlen: int = 10000):
+        """
+        Args:
+            window (float): Seconds a sample is kept. None keeps every sample (up to 'maxlen').
+            maxlen (int): Maximum samples kept; the oldest are dropped first.
+        """
+        self.window = window
+        self._samples = deque(maxlen=maxlen)  # (timestamp, seconds, ok)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, ok: bool = True):
+        """
+        Records one sample.
+
+        Args:
+            seconds (float): The measured latency.
+            ok (bool): False if the request failed (it still counts towards the latency).
+        """
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds, ok))
+
+    def _current(self) -> list:
+        with self._lock:
+            if self.window is not None:
+                oldest = time.monotonic() - self.window
+                while self._samples and self._samples[0][0] < oldest:
+                    self._samples.popleft()
+            return list(self._samples)
+
+    def percentiles(self, ps=(50, 95, 99)) -> dict:
+        """
+        Returns {'p50': seconds, 'p95': seconds, ...} over the current window.
+        """
+        latencies = sorted(sample[1] for sample in self._current())
+        return {f"p{p:g}": percentile(latencies, p) for p in ps}
+
+    def snapshot(self, ps=(50, 95, 99)) -> dict:
+        """
+        Summarizes the current window.
+
+        Returns:
+            dict: 'count', 'errors', 'error_rate', 'max' and one 'p<N>' entry per percentile (seconds).
+        """
+        samples = self._current()
+        latencies = sorted(sample[1] for sample in samples)
+        errors = sum(1 for sample in samples if not sample[2])
+        snapshot = {"count": len(samples), "errors": errors,
+                    "error_rate": errors / len(samples) if samples else 0.0,
+                    "max": latencies[-1] if latencies else 0.0}
+        snapshot.update({f"p{p:g}": percentile(latencies, p) for p in ps})
+        return snapshot
+
+    def __len__(self):
+        return len(self._current())
@@ -0,0 +1,149 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Per-recipient delivery ledger for broadcasts.
+
+Every delivery attempt of a broadcast is appended to the broadcast's ledger file as one
+short line (status, recipient, optional error), and the last line of a recipient wins.
+Running the same broadcast again (same broadcast ID) skips everyone already delivered and
+only retries the failures, no matter how the previous run ended (exception, restart,
+expired token).
+
+The format is deliberately compact: about 30 bytes per recipient on disk and one small
+string per recipient in memory, so 100k+ recipients are no problem.
+
+    D<TAB>alice@example.com
+    F<TAB>bob@example.com<TAB>404 - Not Found
+"""
+
+import os
+import re
+import threading
+
+DELIVERED = "delivered"
+FAILED = "failed"
+
+_CODES = {DELIVERED: "D", FAILED: "F"}
+_STATUSES = {code: status for status, code in _CODES.items()}
+
+
+class DeliveryLedger:
+    """
+    The append-only delivery record of one broadcast.
+
+    Example:
+        ledger = DeliveryLedger("ledgers/feedback-2025-10-01.ledger")
+        if not ledger.delivered(email):
+            send(email)
+            ledger.record(email, DELIVERED)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The ledger file. Existing lines are loaded, new ones are appended.
+        """
+        self.path = path
+        self._status = {}  # recipient -> status code ('D' or 'F')
+        self._errors = {}  # recipient -> last error, for failed recipients only
+        self._lock = threading.Lock()
+        valid = 0  # Size of the file up to its last complete line.
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # The last line was cut short by a crash.
+                    valid += len(line)
+                    self._apply(line[:-1].decode().split("\t", 2))
+            if valid < os.path.getsize(path):
+                os.truncate(path, valid)
+        self._file = open(path, "a", buffering=1)  # Line buffered: every record reaches the file at once.
+
+    def _apply(self, fields: list):
+        if len(fields) < 2 or fields[0] not in _STATUSES or not fields[1]:
+            return  # Not a ledger line.
+        code, recipient = fields[0], fields[1]
+        self._status[recipient] = code
+        if code == "F":
+            self._errors[recipient] = fields[2] if len(fields) > 2 else ""
+        else:
+            self._errors.pop(recipient, None)
+
+    def record(self, recipient: str, status: str, error: str = ""):
+        """
+        Appends the outcome of a delivery attempt.
+
+        Args:
+            recipient (str): The recipient key (e.g. the person email).
+            status (str): DELIVERED or FAILED.
+            error (str): Optional. Why the delivery failed.
+        """
+        code = _CODES[status]
+        fields = [code, recipient]
+        if code == "F" and error:
+            fields.append(re.sub(r"\s+", " ", str(error))[:200])
+        with self._lock:
+            self._file.write("\t".join(fields) + "\n")
+            self._apply(fields)
+
+    def delivered(self, recipient: str) -> bool:
+        return self._status.get(recipient) == "D"
+
+    def status(self, recipient: str) -> str:
+        """
+        Returns DELIVERED, FAILED, or None if the recipient was never attempted.
+        """
+        code = self._status.get(recipient)
+        return _STATUSES[code] if code else None
+
+    def failures(self) -> dict:
+        """
+        Returns the recipients whose last attempt failed, with their error.
+        """
+        return dict(self._errors)
+
+    def summary(self) -> dict:
+        """
+        Counts the recipients by their last status.
+
+        Returns:
+            dict: {'delivered': n, 'failed': n, 'total': n}
+        """
+        delivered = sum(1 for code in self._status.values() if code == "D")
+        return {DELIVERED: delivered, FAILED: len(self._status) - delivered, "total": len(self._status)}
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class LedgerStore:
+    """
+    One ledger file per broadcast ID, kept open once used.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Folder of the ledger files. Created if it doesn't exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._ledgers = {}
+        self._lock = threading.Lock()
+
+    def get(self, broadcast_id: str) -> DeliveryLedger:
+        """
+        Returns the ledger of a broadcast, opening (or creating) its file on first use.
+        """
+        with self._lock:
+            ledger = self._ledgers.get(broadcast_id)
+            if ledger is None:
+                file_name = re.sub(r"[^\w.-]", "_", broadcast_id) + ".ledger"
+                ledger = DeliveryLedger(os.path.join(self.directory, file_name))
+                self._ledgers[broadcast_id] = ledger
+            return ledger
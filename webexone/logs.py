@@ -0,0 +1,199 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Structured, non-blocking logging for the bots and the shared helpers.
+
+'setup_logging()' routes every logger (ours, 'webex_bot', 'webexpythonsdk', ...) through a
+'QueueHandler': the calling thread only puts the record on an in-memory queue, and a
+single background 'QueueListener' thread formats and writes it. A broadcast loop never
+waits on stdout.
+
+- One JSON object per line ('ts', 'level', 'logger', 'message', 'thread', the fields
+  passed with 'extra=' and 'exc'), ready for a log aggregator. LOG_FORMAT="text" prints
+  plain lines for local runs instead.
+- LOG_LEVEL sets the level (default INFO).
+- Per-item events (one per recipient, per device, ...) are logged with
+  'extra=sampled(...)' and only a fraction LOG_SAMPLE_RATE of them is kept (default
+  0.01); warnings and errors are always kept.
+- Bearer tokens, token/secret fields and the values of the secret variables of the .env
+  file are redacted from every line before it is written.
+
+A process forked after 'setup_logging()' (the webhook workers) starts its own listener
+thread on a new queue: the parent's thread doesn't exist in the child.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import time
+
+# Environment variables whose values never appear in a log line.
+SECRET_VARIABLES = ("BOT_TOKEN", "WEBEX_ACCESS_TOKEN", "REFRESH_TOKEN", "SECRETID", "WEBHOOK_SECRET",
+                    "TOKEN_STORE_KEY")
+
+REDACTED = "[REDACTED]"
+_PATTERNS = (
+    re.compile(r"(?i)(bearer\s+)[\w.~+/=-]+"),
+    re.compile(r"""(?i)(["']?(?:access_token|refresh_token|client_secret|secret|password|authorization)["']?\s*[:=]\s*["']?)"""
+               r"""[^"'&\s,}]+"""),
+)
+
+# Attributes every LogRecord has; anything else was passed with 'extra='.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled"}
+
+_listener = None
+_handler = None
+
+
+def redact(text: str, secrets: tuple = ()) -> str:
+    """
+    Masks bearer tokens, token/secret fields and the given secret values in a text.
+    """
+    for secret in secrets:
+        text = text.replace(secret, REDACTED)
+    for pattern in _PATTERNS:
+        text = pattern.sub(lambda match: match.group(1) + REDACTED, text)
+    return text
+
+
+def sampled(**fields) -> dict:
+    """
+    The 'extra' of a per-item event, kept only for a fraction LOG_SAMPLE_RATE of the calls:
+
+        log.info("Feedback card sent", extra=sampled(email=email))
+    """
+    fields["sampled"] = True
+    return fields
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops most of the records marked with 'sampled()' (below WARNING), before they are queued.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sampled", False) and record.levelno < logging.WARNING:
+            return random.random() < self.rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one redacted JSON object per line.
+    """
+
+    def __init__(self, secrets: tuple = ()):
+        super().__init__()
+        self.secrets = secrets
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage(), self.secrets),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = redact(value, self.secrets) if isinstance(value, str) else value
+        if record.exc_text:
+            entry["exc"] = redact(record.exc_text, self.secrets)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Plain, redacted lines for local runs (LOG_FORMAT="text").
+    """
+
+    def __init__(self, secrets: tuple = ()):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self.secrets = secrets
+
+    def format(self, record: logging.LogRecord) -> str:
+        return redact(super().format(record), self.secrets)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Keep the caller's work minimal: merge the arguments and render the traceback
+        # (it can't be pickled or formatted later), leave the formatting to the listener.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = None, fmt: str = None, sample_rate: float = None, force: bool = False):
+    """
+    Installs the queue-based handler on the root logger. Calling it again does nothing,
+    unless 'force' is set.
+
+    Args:
+        level (str): Optional. Defaults to LOG_LEVEL or "INFO".
+        fmt (str): Optional. "json" (default, or LOG_FORMAT) or "text".
+        sample_rate (float): Optional. Fraction of the sampled events kept. Defaults to LOG_SAMPLE_RATE or 0.01.
+        force (bool): Optional. Removes the handlers other libraries added to the root logger since
+            (e.g. the 'coloredlogs' handler 'WebexBot' installs), so every record goes through the queue again.
+    """
+    global _handler
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if _listener is not None:
+        if force:
+            root = logging.getLogger()
+            root.handlers = [_handler]
+            root.setLevel(level)
+        return
+    fmt = (fmt or os.getenv("LOG_FORMAT", "json")).lower()
+    sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "0.01")) if sample_rate is None else sample_rate
+
+    secrets = tuple(value for value in (os.getenv(name) for name in SECRET_VARIABLES) if value and len(value) >= 8)
+    output = logging.StreamHandler()
+    output.setFormatter(TextFormatter(secrets) if fmt == "text" else JsonFormatter(secrets))
+
+    _handler = _QueueHandler(queue.SimpleQueue())
+    _handler.addFilter(SamplingFilter(sample_rate))
+    root = logging.getLogger()
+    root.handlers = [_handler]
+    root.setLevel(level)
+
+    _start_listener(output)
+    # Write what is still queued when the process exits.
+    atexit.register(_stop_listener)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def _start_listener(output: logging.Handler):
+    global _listener
+    _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_in_child():
+    # The parent's listener thread isn't running in a forked child: without a new one, the
+    # records would pile up in the queue forever. Records still queued at fork time belong
+    # to the parent, which writes them itself.
+    _handler.queue = queue.SimpleQueue()
+    _start_listener(_listener.handlers[0])
@@ -0,0 +1,209 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Bulk meeting scheduler for service apps.
+
+Reads a schedule of many hosts/titles/times and creates the meetings concurrently
+through the pooled HTTP session, under the Broadcaster's rate limit. Progress is
+written to a 'Checkpoint' file so an interrupted batch can be resumed:
+
+- rows already created are skipped,
+- rows that were in flight when the batch stopped (or when a request timed out) are
+  checked against the host's meetings first, and only re-submitted if the meeting
+  does not exist,
+- failed rows are retried (after the same check).
+
+Creates go through a session that never retries by itself ('get_unretried_session'):
+every retry goes through the check above. Rows that describe the same meeting (same
+host, title and times) are only submitted once.
+"""
+
+import csv
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+
+import requests
+
+from webexone.broadcast import DELIVERED, Broadcaster
+from webexone.checkpoint import Checkpoint
+from webexone.session import api_url, get_session, get_unretried_session
+
+DONE = "done"
+SUBMITTING = "submitting"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+
+
+@dataclass
+class MeetingRow:
+    """
+    One meeting of the schedule.
+    """
+    number: int
+    host_email: str
+    title: str
+    start: str
+    end: str
+
+    @property
+    def key(self) -> str:
+        """Stable identity of the row, used for the checkpoint."""
+        return hashlib.sha1(f"{self.host_email.lower()}|{self.title}|{self.start}|{self.end}".encode()).hexdigest()
+
+    def body(self) -> dict:
+        return {
+            'title': self.title,          # Maximum of 128 characters.
+            'start': self.start,          # ISO 8601 format.
+            'end': self.end,
+            'hostEmail': self.host_email,
+        }
+
+
+@dataclass
+class RowResult:
+    row: MeetingRow
+    status: str
+    detail: str = ""
+
+
+@dataclass
+class ScheduleReport:
+    """
+    Per-row status and throughput of a scheduling run.
+    """
+    results: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def created(self) -> int:
+        return sum(1 for r in self.results if r.status == "created")
+
+    @property
+    def meetings_per_second(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        counts = {}
+        for r in self.results:
+            counts[r.status] = counts.get(r.status, 0) + 1
+        totals = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        return f"{totals} in {self.elapsed:.1f}s ({self.meetings_per_second:.2f} meetings/s)"
+
+
+def load_schedule(path: str) -> list:
+    """
+    Reads a schedule from a CSV or JSON file with hostEmail, title, start and end (ISO 8601).
+
+    CSV:
+        hostEmail,title,start,end
+        host@example.com,Weekly sync,2025-10-01T10:00:00,2025-10-01T11:00:00
+
+    JSON: a list of objects with the same keys.
+
+    Returns:
+        list: MeetingRow objects, numbered from 1 in file order.
+    """
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+    return [MeetingRow(number, row["hostEmail"].strip(), row["title"].strip(), row["start"].strip(), row["end"].strip())
+            for number, row in enumerate(rows, start=1)]
+
+
+def find_existing_meeting(token_manager, row: MeetingRow):
+    """
+    Looks for a meeting of this host with the same title in the row's time window.
+
+    Returns:
+        str: The meeting ID, or None if no such meeting exists.
+    """
+    headers = {'Authorization': f'Bearer {token_manager.get_access_token()}'}
+    params = {'hostEmail': row.host_email, 'from': row.start, 'to': row.end}
+    response = get_session().get(api_url("meetings"), headers=headers, params=params)
+    response.raise_for_status()
+    for meeting in response.json().get("items", []):
+        if meeting.get("title") == row.title:
+            return meeting.get("id")
+    return None
+
+
+def schedule_meetings(token_manager, rows: list, checkpoint: Checkpoint,
+                      broadcaster: Broadcaster = None) -> ScheduleReport:
+    """
+    Creates the meetings of a schedule concurrently, resuming from the checkpoint.
+
+    Args:
+        token_manager (TokenManager): Provides a valid service app access token.
+        rows (list): MeetingRow objects (see 'load_schedule').
+        checkpoint (Checkpoint): Progress file. Rows recorded as done are not created again.
+        broadcaster (Broadcaster): Optional. Runs the requests concurrently under a rate limit.
+
+    Returns:
+        ScheduleReport: Per-row status and throughput.
+    """
+    broadcaster = broadcaster or Broadcaster(max_workers=8, rate=5)
+    report = ScheduleReport()
+    started = time.monotonic()
+    pending = []
+    first_rows = {}  # row key -> first row of the schedule with that key
+
+    for row in rows:
+        first = first_rows.setdefault(row.key, row)
+        if first is not row:
+            # Submitting both at the same time would book the meeting twice.
+            report.results.append(RowResult(row, DUPLICATE, f"same meeting as row {first.number}"))
+            continue
+        entry = checkpoint.get(row.key)
+        if entry and entry["status"] == DONE:
+            report.results.append(RowResult(row, "already scheduled", entry.get("id", "")))
+            continue
+        pending.append(row)
+
+    created = {}  # row key -> (status, meeting ID)
+
+    def create(row: MeetingRow):
+        if checkpoint.status(row.key) in (SUBMITTING, FAILED):
+            # A previous attempt stopped while in flight (crash, timeout): the meeting may exist already.
+            meeting_id = find_existing_meeting(token_manager, row)
+            if meeting_id:
+                checkpoint.record(row.key, DONE, id=meeting_id)
+                created[row.key] = ("already scheduled", meeting_id)
+                return
+        checkpoint.record(row.key, SUBMITTING)
+        token = token_manager.get_access_token()
+        headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+        session = get_unretried_session()
+        response = session.post(api_url("meetings"), headers=headers, data=json.dumps(row.body()))
+        if response.status_code == 401:
+            # Safety net for a token revoked before its expiry: refresh once and retry.
+            headers['Authorization'] = f'Bearer {token_manager.refresh(stale_token=token)}'
+            response = session.post(api_url("meetings"), headers=headers, data=json.dumps(row.body()))
+        if response.status_code != 200:
+            # Raised with the response, so the Broadcaster can honor 429 'Retry-After'.
+            raise requests.HTTPError(f"{response.status_code} - {response.text}", response=response)
+        meeting_id = response.json().get("id")
+        checkpoint.record(row.key, DONE, id=meeting_id)
+        created[row.key] = ("created", meeting_id)
+
+    # A retried row looks its meeting up first (SUBMITTING/FAILED in the checkpoint).
+    summary = broadcaster.run(pending, create, idempotent=True)
+    for result in summary.results:
+        row = result.recipient
+        if result.status == DELIVERED:
+            report.results.append(RowResult(row, *created[row.key]))
+        else:
+            checkpoint.record(row.key, FAILED, error=result.error)
+            report.results.append(RowResult(row, FAILED, result.error))
+
+    report.results.sort(key=lambda r: r.row.number)
+    report.elapsed = time.monotonic() - started
+    return report
@@ -0,0 +1,387 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Per-command latency and Webex API call metrics.
+
+Two hooks feed one process-wide registry ('metrics'):
+
+- every bot command (and every background job task) runs inside 'metrics.command(name)',
+  which records its wall time and errors, and makes it the "current command";
+- every HTTP response of the pooled session and of the SDK clients goes through a
+  'requests' response hook, which charges the API call (time, status, urllib3 retries,
+  429s, bytes sent and received) to the current command and to its endpoint.
+
+So 'stats' shows, e.g., how much of a device provisioning is spent in 'POST /devices'.
+Caches in front of the API ('PersonCache', 'PeopleIndex') register their hit/miss
+counters too, so the calls they save show up next to the calls made.
+The registry is exposed in the Prometheus text format on '/metrics' when METRICS_PORT
+is set ('create_bot' starts the server), and in chat with the 'stats' command, which only
+answers the people listed in STATS_ADMINS (it isn't added to the bot when that is unset).
+
+Metrics are per process: with several worker processes, give each one its own port.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from webex_bot.models.command import Command
+
+from webexone.latency import LatencyWindow
+
+log = logging.getLogger(__name__)
+
+# Name used for API calls made outside of any command (startup, background threads).
+NO_COMMAND = "none"
+
+_current = contextvars.ContextVar("webexone_command", default=None)
+
+# Counters exported for every registered cache, with their help text.
+CACHE_COUNTERS = {
+    "hits": "Lookups answered from the cache.",
+    "negative_hits": "Lookups answered by a cached \"not found\".",
+    "misses": "Lookups that went to the API.",
+    "evictions": "Entries evicted to make room.",
+    "coalesced": "Lookups that shared the API call of a concurrent identical lookup.",
+    "saved_calls": "API calls avoided by the cache and by request coalescing.",
+}
+
+
+class CommandStats:
+    """
+    Counters of one command (or job kind).
+    """
+
+    def __init__(self, window: float):
+        self.runs = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.latency = LatencyWindow(window=window)
+        self.api_calls = Counter()        # "METHOD /resource" -> calls
+        self.api_seconds = defaultdict(float)
+        self.statuses = Counter()         # HTTP status -> calls
+        self.retries = 0                  # Retries done by the connection pool (urllib3).
+        self.throttled = 0                # 429 answers, retried ones included.
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+def endpoint_of(method: str, url: str) -> str:
+    """
+    Returns "METHOD /resource" for an API URL, e.g. "POST /devices" (IDs and query strings left out).
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    if parts[:1] == ["v1"]:
+        parts = parts[1:]
+    return f"{method} /{parts[0] if parts else ''}"
+
+
+class Metrics:
+    """
+    Registry of command and API call metrics, plus free-form gauges.
+    """
+
+    def __init__(self, window: float = 900):
+        """
+        Args:
+            window (float): Seconds covered by the latency percentiles (counters are cumulative).
+        """
+        self.window = window
+        self.started = time.time()
+        self._commands = {}
+        self._gauges = {}  # (name, sorted labels) -> (value, help)
+        self._caches = defaultdict(list)  # cache name -> CacheStats of every instance
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> CommandStats:
+        stats = self._commands.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._commands.setdefault(name, CommandStats(self.window))
+        return stats
+
+    @contextmanager
+    def command(self, name: str):
+        """
+        Times a command and charges the API calls made inside it (in this thread) to it.
+
+        Example:
+            with metrics.command("provision"):
+                ...
+        """
+        stats = self._stats(name or NO_COMMAND)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield stats
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            stats.latency.add(elapsed, ok=not failed)
+            with self._lock:
+                stats.runs += 1
+                stats.errors += failed
+                stats.seconds += elapsed
+
+    def record_response(self, response, *args, **kwargs):
+        """
+        'requests' response hook: charges one API call to the current command.
+        """
+        stats = _current.get() or self._stats(NO_COMMAND)
+        endpoint = endpoint_of(response.request.method, response.request.url)
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        history = retries.history if retries is not None else ()
+        body = response.request.body
+        with self._lock:
+            stats.api_calls[endpoint] += 1
+            stats.api_seconds[endpoint] += response.elapsed.total_seconds()
+            stats.statuses[response.status_code] += 1
+            stats.retries += len(history)
+            stats.throttled += (response.status_code == 429) + sum(1 for attempt in history if attempt.status == 429)
+            stats.bytes_sent += len(body) if body else 0
+            # Content-Length only: reading the body here would break streamed responses.
+            stats.bytes_received += int(response.headers.get("Content-Length") or 0)
+
+    def instrument_session(self, session):
+        """
+        Adds the response hook to a 'requests.Session' (once).
+        """
+        if self.record_response not in session.hooks["response"]:
+            session.hooks["response"].append(self.record_response)
+        return session
+
+    def set_gauge(self, name: str, value: float, help: str = "", **labels):
+        """
+        Sets a gauge exported on '/metrics', e.g. set_gauge("webexone_concurrency_limit", 8, endpoint="POST /messages").
+        """
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = (value, help)
+
+    def register_cache(self, name: str, stats):
+        """
+        Exports the counters of a cache ('webexone.cache.CacheStats'). Instances registered with
+        the same name are added up.
+        """
+        with self._lock:
+            self._caches[name].append(stats)
+
+    def cache_totals(self) -> dict:
+        """
+        Returns the counters of every registered cache: name -> {"hits": ..., "saved_calls": ...}.
+        """
+        with self._lock:
+            caches = {name: list(instances) for name, instances in self._caches.items()}
+        return {name: {counter: sum(getattr(stats, counter) for stats in instances) for counter in CACHE_COUNTERS}
+                for name, instances in sorted(caches.items())}
+
+    def snapshot(self) -> dict:
+        """
+        Returns the stats of every command: command name -> CommandStats.
+        """
+        with self._lock:
+            return dict(self._commands)
+
+    def render_prometheus(self) -> str:
+        """
+        Renders the registry in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def family(name: str, kind: str, help: str):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        commands = sorted(self.snapshot().items())
+        family("webexone_command_seconds", "summary", "Wall time of the bot commands and job tasks.")
+        for name, stats in commands:
+            for quantile, seconds in stats.latency.percentiles((50, 95, 99)).items():
+                lines.append(f'webexone_command_seconds{{command="{_escape(name)}",quantile="{float(quantile[1:]) / 100:g}"}} {seconds:.6f}')
+            lines.append(f'webexone_command_seconds_sum{{command="{_escape(name)}"}} {stats.seconds:.6f}')
+            lines.append(f'webexone_command_seconds_count{{command="{_escape(name)}"}} {stats.runs}')
+        family("webexone_command_errors_total", "counter", "Commands and job tasks that raised.")
+        for name, stats in commands:
+            lines.append(f'webexone_command_errors_total{{command="{_escape(name)}"}} {stats.errors}')
+
+        family("webexone_api_calls_total", "counter", "Webex API calls by command and endpoint.")
+        for name, stats in commands:
+            for endpoint, calls in sorted(stats.api_calls.items()):
+                lines.append(f'webexone_api_calls_total{{command="{_escape(name)}",endpoint="{endpoint}"}} {calls}')
+        family("webexone_api_seconds_total", "counter", "Time spent in Webex API calls by command and endpoint.")
+        for name, stats in commands:
+            for endpoint, seconds in sorted(stats.api_seconds.items()):
+                lines.append(f'webexone_api_seconds_total{{command="{_escape(name)}",endpoint="{endpoint}"}} {seconds:.6f}')
+        family("webexone_api_responses_total", "counter", "Webex API responses by command and HTTP status.")
+        for name, stats in commands:
+            for status, calls in sorted(stats.statuses.items()):
+                lines.append(f'webexone_api_responses_total{{command="{_escape(name)}",status="{status}"}} {calls}')
+        for metric, attribute, help in (("webexone_api_retries_total", "retries", "Retries done by the connection pool."),
+                                        ("webexone_api_throttled_total", "throttled", "429 answers received."),
+                                        ("webexone_api_sent_bytes_total", "bytes_sent", "Request bodies sent."),
+                                        ("webexone_api_received_bytes_total", "bytes_received", "Response bodies received.")):
+            family(metric, "counter", help)
+            for name, stats in commands:
+                lines.append(f'{metric}{{command="{_escape(name)}"}} {getattr(stats, attribute)}')
+
+        caches = self.cache_totals()
+        for counter in CACHE_COUNTERS:
+            family(f"webexone_cache_{counter}_total", "counter", CACHE_COUNTERS[counter])
+            for name, totals in caches.items():
+                lines.append(f'webexone_cache_{counter}_total{{cache="{_escape(name)}"}} {totals[counter]}')
+
+        with self._lock:
+            gauges = sorted(self._gauges.items())
+        declared = set()
+        for (name, labels), (value, help) in gauges:
+            if name not in declared:
+                family(name, "gauge", help or name)
+                declared.add(name)
+            label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def wsgi_app(self, environ, start_response):
+        if environ.get("PATH_INFO", "/") != "/metrics":
+            start_response("404 Not Found", [("Content-Type", "text/plain")])
+            return [b"Not Found"]
+        start_response("200 OK", [("Content-Type", "text/plain; version=0.0.4")])
+        return [self.render_prometheus().encode()]
+
+    def start_server(self, port: int, host: str = "0.0.0.0"):
+        """
+        Serves '/metrics' from a background thread.
+
+        Returns:
+            The server (its 'server_address' has the actual port when 'port' is 0).
+        """
+        server = make_server(host, port, self.wsgi_app, server_class=_ThreadingWSGIServer,
+                             handler_class=_QuietRequestHandler)
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+    def report(self) -> str:
+        """
+        Summarizes every command and cache in one markdown message (used by the 'stats' command).
+        """
+        commands = sorted(self.snapshot().items(), key=lambda item: -item[1].seconds)
+        caches = self.cache_totals()
+        uptime = (time.time() - self.started) / 60
+        lines = [f"**Command stats** (last {uptime:.0f} minutes; percentiles over the last {self.window / 60:.0f} minutes)",
+                 ""]
+        if not commands:
+            lines = ["No commands have run yet."]
+        for name, stats in commands:
+            percentiles = stats.latency.percentiles((50, 95))
+            api_seconds = sum(stats.api_seconds.values())
+            calls = sum(stats.api_calls.values())
+            line = (f"- **{name}**: {stats.runs} run(s), {stats.errors} error(s), "
+                    f"p50 {percentiles['p50'] * 1000:.0f} ms, p95 {percentiles['p95'] * 1000:.0f} ms; "
+                    f"{calls} API call(s), {stats.throttled} x 429, {stats.retries} retries, "
+                    f"{stats.bytes_sent / 1024:.1f} KB sent / {stats.bytes_received / 1024:.1f} KB received")
+            if calls and stats.seconds:
+                # Where the time goes: share of the command's wall time spent in each endpoint.
+                top = sorted(stats.api_seconds.items(), key=lambda item: -item[1])[:3]
+                shares = ", ".join(f"{endpoint} {seconds / stats.seconds:.0%}" for endpoint, seconds in top)
+                line += f". API time {api_seconds / stats.seconds:.0%} of the total ({shares})"
+            lines.append(line)
+        if caches:
+            lines += ["", "**Caches**", ""]
+            for name, totals in caches.items():
+                lookups = totals["hits"] + totals["negative_hits"] + totals["misses"]
+                ratio = (totals["hits"] + totals["negative_hits"]) / lookups if lookups else 0.0
+                lines.append(f"- **{name}**: {totals['saved_calls']} API call(s) saved, {totals['hits']} hit(s), "
+                             f"{totals['negative_hits']} negative hit(s), {totals['misses']} miss(es), "
+                             f"{totals['coalesced']} coalesced ({ratio:.0%} hit ratio)")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass  # One access log line per scrape is just noise.
+
+
+# The process-wide registry.
+metrics = Metrics()
+
+
+class StatsCommand(Command):
+    """
+    Answers 'stats' with the latency and API call counters of every command, to its admins only.
+    """
+
+    def __init__(self, admins, registry: Metrics = None):
+        """
+        Args:
+            admins (iterable): Emails of the people allowed to see the stats.
+            registry (Metrics): Optional. Defaults to the process-wide registry.
+        """
+        super().__init__(command_keyword="stats",
+                         help_message="Latency and Webex API calls of every command (admins only)")
+        self.admins = {admin.lower() for admin in admins}
+        self.registry = registry or metrics
+
+    def execute(self, message, attachment_actions, activity):
+        # Typed commands pass the message, which carries the sender's email.
+        sender = getattr(attachment_actions, "personEmail", None) or activity.get("actor", {}).get("emailAddress")
+        if (sender or "").lower() not in self.admins:
+            return "Sorry, the stats are only available to the bot admins."
+        return self.registry.report()
+
+
+def instrument_bot(bot, registry: Metrics = None, admins=None):
+    """
+    Times every command the bot runs, adds the 'stats' command when there are admins to answer and,
+    when METRICS_PORT is set, serves '/metrics' on that port.
+
+    Args:
+        bot (WebexBot): The bot to instrument.
+        registry (Metrics): Optional. Defaults to the process-wide registry.
+        admins (iterable): Optional. Emails allowed to run 'stats'. Defaults to STATS_ADMINS (comma-separated).
+
+    Returns:
+        The same bot.
+    """
+    registry = registry or metrics
+    if admins is None:
+        admins = [admin.strip() for admin in os.getenv("STATS_ADMINS", "").split(",") if admin.strip()]
+    run_command = bot.run_command_and_handle_bot_exceptions
+
+    def timed_run_command(command, message, teams_message, activity):
+        with registry.command(command.command_keyword or command.card_callback_keyword):
+            return run_command(command, message, teams_message, activity)
+
+    bot.run_command_and_handle_bot_exceptions = timed_run_command
+    if admins:
+        bot.add_command(StatsCommand(admins, registry))
+
+    port = os.getenv("METRICS_PORT")
+    if port:
+        try:
+            server = registry.start_server(int(port))
+            log.info("Metrics served on http://%s:%s/metrics", *server.server_address[:2])
+        except OSError as e:
+            # Typically another worker process of the same bot already uses the port.
+            log.warning("Could not serve metrics on port %s: %s", port, e)
+    return bot
@@ -0,0 +1,362 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Local mock of the Webex REST API, for offline runs and reproducible benchmarks.
+
+Every script and helper honors WEBEX_BASE_URL, so pointing it at this server runs them
+without touching 'webexapis.com':
+
+    mock = MockWebex(org_size=5000, latency=0.05, throttle=0.01).start()
+    os.environ["WEBEX_BASE_URL"] = mock.base_url
+
+Emulated endpoints (only what these scripts use, with the answers Webex gives):
+
+- '/people' (list with 'max' and 'Link: next' pagination, 'email' and 'id' filters),
+  '/people/me' and '/people/{id}'. The organization is generated on the fly
+  ('user<N>@example.com'), so 'org_size' costs no memory.
+- '/messages' (create; list with the required 'roomId'),
+- '/rooms' and '/memberships' (create and list; a duplicate membership answers 409),
+- '/meetings' (create and list), '/devices' (create, 409 on a known MAC; list),
+- '/access_token' (refresh and authorization code grants).
+
+Every request waits 'latency' (+ up to 'jitter') seconds and a fraction 'throttle' of
+them is answered '429 Too Many Requests' with 'Retry-After'. A seed makes the jitter and
+the throttling reproducible. Requests are counted per endpoint ('stats()').
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+MAX_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = 100
+
+
+class MockWebex:
+    """
+    A threaded HTTP server answering like the Webex API.
+
+    Example:
+        with MockWebex(org_size=1000, latency=0.02) as mock:
+            os.environ["WEBEX_BASE_URL"] = mock.base_url
+            ...
+            print(mock.stats())
+    """
+
+    def __init__(self, org_size: int = 1000, latency: float = 0.0, jitter: float = 0.0, throttle: float = 0.0,
+                 retry_after: int = 1, seed: int = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            org_size (int): Number of people in the organization.
+            latency (float): Seconds every request waits before it is answered.
+            jitter (float): Extra random wait, up to this many seconds.
+            throttle (float): Fraction (0-1) of the requests answered with a 429.
+            retry_after (int): 'Retry-After' (seconds) of the 429 answers.
+            seed (int): Optional. Seed of the jitter and throttling, for reproducible runs.
+            host (str): Address to listen on.
+            port (int): Port to listen on. 0 picks a free port.
+        """
+        self.org_size = org_size
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.requests = Counter()   # "METHOD /resource" -> requests answered
+        self.throttled = Counter()  # "METHOD /resource" -> 429 answers
+        self.rooms = {}             # id -> room
+        self.memberships = {}       # (roomId, personId) -> membership
+        self.messages = []
+        self.meetings = []
+        self.devices = {}           # MAC address -> device
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+    def start(self):
+        """
+        Serves requests from a background thread. Returns the server itself.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-webex", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> dict:
+        """
+        Returns the requests answered and the 429s sent, per endpoint.
+        """
+        with self._lock:
+            return {"requests": dict(self.requests), "throttled": dict(self.throttled),
+                    "total": sum(self.requests.values()), "total_throttled": sum(self.throttled.values())}
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests.clear()
+            self.throttled.clear()
+
+    # --- Generated organization ---------------------------------------------------------
+
+    def person(self, index: int) -> dict:
+        return {"id": f"person-{index}", "emails": [f"user{index}@example.com"], "displayName": f"User {index}",
+                "firstName": "User", "lastName": str(index), "orgId": "org-1", "type": "person",
+                "created": "2025-01-01T00:00:00.000Z"}
+
+    def person_index(self, key: str):
+        """
+        Returns the index of a person from their ID or email, or None if not in the organization.
+        """
+        key = key.lower()
+        if key.startswith("person-"):
+            number = key[len("person-"):]
+        elif key.startswith("user") and key.endswith("@example.com"):
+            number = key[len("user"):-len("@example.com")]
+        else:
+            return None
+        if number.isdigit() and int(number) < self.org_size:
+            return int(number)
+        return None
+
+    # --- HTTP -----------------------------------------------------------------------------
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real API.
+            disable_nagle_algorithm = True  # Headers and body are separate writes: don't delay the body.
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                mock._dispatch(self, "GET")
+
+            def do_POST(self):
+                mock._dispatch(self, "POST")
+
+        return Handler
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str):
+        url = urlsplit(handler.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts[:1] == ["v1"]:
+            parts = parts[1:]
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw_body = handler.rfile.read(length) if length else b""
+        resource = parts[0] if parts else ""
+        endpoint = f"{method} /{resource}"
+
+        with self._lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            self.requests[endpoint] += 1
+            throttled = self.throttle and self.random.random() < self.throttle
+            if throttled:
+                self.throttled[endpoint] += 1
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            return self._send(handler, 429, {"message": "Too Many Requests"},
+                              headers={"Retry-After": str(self.retry_after)})
+
+        if resource != "access_token" and not handler.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send(handler, 401, {"message": "The request requires a valid access token set in the Authorization request header."})
+        try:
+            if resource == "access_token":
+                body = parse_qs(raw_body.decode())
+            else:
+                body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            return self._send(handler, 400, {"message": "Malformed request body"})
+
+        route = getattr(self, f"_{method.lower()}_{resource}", None)
+        if route is None:
+            return self._send(handler, 404, {"message": "The requested resource could not be found."})
+        status, payload, headers = route(parts[1:], query, body, handler)
+        self._send(handler, status, payload, headers)
+
+    def _send(self, handler, status: int, payload, headers: dict = None):
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.send_header("Trackingid", f"MOCK_{uuid.uuid4().hex[:12]}")
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _page(self, handler, query: dict, items, total: int) -> tuple:
+        """
+        Answers one page of a list, with a 'Link: next' header when more items follow.
+        'items' is called as items(start, stop) so generated lists are never built whole.
+        """
+        try:
+            page_size = min(int(query.get("max", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+            start = int(query.get("cursor", 0))
+        except ValueError:
+            return self._error(400, "'max' and 'cursor' must be integers")
+        if page_size < 1 or start < 0:
+            return self._error(400, "'max' must be positive and 'cursor' not negative")
+        stop = min(total, start + page_size)
+        headers = {}
+        if stop < total:
+            next_query = dict(query, cursor=stop, max=page_size)
+            host = handler.headers.get("Host")
+            path = urlsplit(handler.path).path
+            headers["Link"] = f'<http://{host}{path}?{urlencode(next_query)}>; rel="next"'
+        return 200, {"items": items(start, stop)}, headers
+
+    @staticmethod
+    def _error(status: int, message: str) -> tuple:
+        return status, {"message": message, "errors": [{"description": message}]}, None
+
+    # --- /people --------------------------------------------------------------------------
+
+    def _get_people(self, parts, query, body, handler):
+        if parts == ["me"]:
+            return 200, dict(self.person(0), id="bot-0", emails=["bot@webex.bot"], displayName="Mock Bot",
+                             type="bot"), None
+        if parts:
+            index = self.person_index(parts[0])
+            if index is None:
+                return self._error(404, "Person not found")
+            return 200, self.person(index), None
+
+        if "email" in query or "id" in query:
+            keys = [query["email"]] if "email" in query else query["id"].split(",")
+            people = [self.person(index) for index in map(self.person_index, keys) if index is not None]
+            return self._page(handler, query, lambda start, stop: people[start:stop], len(people))
+        return self._page(handler, query, lambda start, stop: [self.person(i) for i in range(start, stop)],
+                          self.org_size)
+
+    # --- /messages ------------------------------------------------------------------------
+
+    def _post_messages(self, parts, query, body, handler):
+        if not (body.get("roomId") or body.get("toPersonEmail") or body.get("toPersonId")):
+            return self._error(400, "Either roomId, toPersonEmail or toPersonId must be provided.")
+        if body.get("toPersonEmail") and self.person_index(body["toPersonEmail"]) is None:
+            return self._error(404, "Failed to get person")
+        message = dict(body, id=f"message-{uuid.uuid4().hex}", created=time.strftime("%Y-%m-%dT%H:%M:%S.000Z"))
+        with self._lock:
+            self.messages.append(message)
+        return 200, message, None
+
+    def _get_messages(self, parts, query, body, handler):
+        if "roomId" not in query:
+            return self._error(400, "roomId is required")
+        with self._lock:
+            messages = [message for message in self.messages if message.get("roomId") == query["roomId"]]
+        return self._page(handler, query, lambda start, stop: messages[start:stop], len(messages))
+
+    # --- /rooms and /memberships ----------------------------------------------------------
+
+    def _post_rooms(self, parts, query, body, handler):
+        if not body.get("title"):
+            return self._error(400, "title is required")
+        room = {"id": f"room-{uuid.uuid4().hex}", "title": body["title"], "type": "group", "isLocked": False,
+                "creatorId": "bot-0", "created": time.strftime("%Y-%m-%dT%H:%M:%S.000Z")}
+        with self._lock:
+            self.rooms[room["id"]] = room
+        return 200, room, None
+
+    def _get_rooms(self, parts, query, body, handler):
+        if parts:
+            room = self.rooms.get(parts[0])
+            return (200, room, None) if room else self._error(404, "Room not found")
+        with self._lock:
+            rooms = [room for room in self.rooms.values() if query.get("type", room["type"]) == room["type"]]
+        return self._page(handler, query, lambda start, stop: rooms[start:stop], len(rooms))
+
+    def _post_memberships(self, parts, query, body, handler):
+        if body.get("roomId") not in self.rooms:
+            return self._error(404, "Room not found")
+        index = self.person_index(body.get("personId") or body.get("personEmail") or "")
+        if index is None:
+            return self._error(404, "Person not found")
+        person = self.person(index)
+        membership = {"id": f"membership-{uuid.uuid4().hex}", "roomId": body["roomId"], "personId": person["id"],
+                      "personEmail": person["emails"][0], "isModerator": False}
+        with self._lock:
+            if (body["roomId"], person["id"]) in self.memberships:
+                return self._error(409, "User is already a participant")
+            self.memberships[(body["roomId"], person["id"])] = membership
+        return 200, membership, None
+
+    def _get_memberships(self, parts, query, body, handler):
+        with self._lock:
+            memberships = [m for m in self.memberships.values() if query.get("roomId", m["roomId"]) == m["roomId"]]
+        return self._page(handler, query, lambda start, stop: memberships[start:stop], len(memberships))
+
+    # --- /meetings and /devices -----------------------------------------------------------
+
+    def _post_meetings(self, parts, query, body, handler):
+        if not (body.get("title") and body.get("start") and body.get("end")):
+            return self._error(400, "title, start and end are required")
+        meeting = dict(body, id=uuid.uuid4().hex, meetingNumber=str(self.random.randint(10**9, 10**10 - 1)),
+                       webLink="https://example.webex.com/meet/mock", state="active")
+        with self._lock:
+            self.meetings.append(meeting)
+        return 200, meeting, None
+
+    def _get_meetings(self, parts, query, body, handler):
+        with self._lock:
+            meetings = list(self.meetings)
+        return self._page(handler, query, lambda start, stop: meetings[start:stop], len(meetings))
+
+    def _post_devices(self, parts, query, body, handler):
+        mac = (body.get("mac") or "").upper()
+        if not mac or not body.get("model"):
+            return self._error(400, "mac and model are required")
+        if self.person_index(body.get("personId") or "") is None:
+            return self._error(404, "Person not found")
+        device = {"id": f"device-{uuid.uuid4().hex}", "mac": mac, "product": body["model"],
+                  "personId": body["personId"], "connectionStatus": "disconnected"}
+        with self._lock:
+            if mac in self.devices:
+                return self._error(409, "MAC Address is duplicated")
+            self.devices[mac] = device
+        return 200, device, None
+
+    def _get_devices(self, parts, query, body, handler):
+        with self._lock:
+            devices = list(self.devices.values())
+        return self._page(handler, query, lambda start, stop: devices[start:stop], len(devices))
+
+    # --- /access_token --------------------------------------------------------------------
+
+    def _post_access_token(self, parts, query, body, handler):
+        grant_type = (body.get("grant_type") or [None])[0]
+        if grant_type not in ("refresh_token", "authorization_code") or not body.get("client_id"):
+            return self._error(400, "invalid_request")
+        return 200, {"access_token": f"mock-access-{uuid.uuid4().hex}", "expires_in": 1209599,
+                     "refresh_token": (body.get("refresh_token") or [f"mock-refresh-{uuid.uuid4().hex}"])[0],
+                     "refresh_token_expires_in": 7775999, "token_type": "Bearer"}, None
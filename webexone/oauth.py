@@ -0,0 +1,225 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Proactive OAuth token manager for service apps and integrations.
+
+Waiting for a '401 Unauthorized' before refreshing wastes a full request every time the
+access token expires. The 'TokenManager' tracks 'expires_in' instead and refreshes
+shortly before expiry, either on demand or from a background thread. Concurrent callers
+share a single refresh (single-flight), and the token pair is persisted to a local file
+with an atomic write, so a restarted service picks up where it left off.
+
+If the 'cryptography' package is installed and TOKEN_STORE_KEY is set (a Fernet key,
+see 'Fernet.generate_key()'), the token file is encrypted. Otherwise it is written as
+JSON readable only by the current user.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from webexone.session import api_url, get_session
+
+log = logging.getLogger(__name__)
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:  # Optional dependency: the token file is stored unencrypted without it.
+    Fernet = None
+
+# Refresh this many seconds before the access token expires (Webex access tokens last 14 days).
+DEFAULT_REFRESH_MARGIN = 3600
+# Lifetime assumed when a token response has no usable 'expires_in' (14 days).
+DEFAULT_EXPIRES_IN = 14 * 24 * 3600
+# Wait this long before retrying a failed background refresh.
+RETRY_INTERVAL = 60
+
+
+class TokenError(Exception):
+    """
+    Raised when Webex refuses to refresh the access token.
+    """
+    pass
+
+
+class TokenManager:
+    """
+    Keeps a valid access token at hand by refreshing it before it expires.
+
+    Example:
+        token_manager = TokenManager(client_id, client_secret, access_token, refresh_token,
+                                     store_path="service_app_tokens.json")
+        token_manager.start()                                       # Optional background refresh.
+        headers = {"Authorization": f"Bearer {token_manager.get_access_token()}"}
+    """
+
+    def __init__(self, client_id: str, client_secret: str, access_token: str = None,
+                 refresh_token: str = None, expires_at: float = None, store_path: str = None,
+                 refresh_margin: float = DEFAULT_REFRESH_MARGIN):
+        """
+        Args:
+            client_id (str): Client ID of the service app.
+            client_secret (str): Client secret of the service app.
+            access_token (str): Initial access token (e.g. from the .env file).
+            refresh_token (str): Initial refresh token (e.g. from the .env file).
+            expires_at (float): Optional. Epoch time the access token expires. When unknown,
+                                the token is refreshed on first use.
+            store_path (str): Optional. File the token pair is persisted to. If it exists, it
+                              takes precedence over the initial tokens.
+            refresh_margin (float): Refresh this many seconds before the token expires.
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.store_path = store_path
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._fernet = self._load_fernet()
+        if store_path and os.path.exists(store_path):
+            self._load()
+
+    def needs_refresh(self) -> bool:
+        """
+        True if the access token is unknown, expired or about to expire.
+        """
+        return (not self.access_token or self.expires_at is None
+                or time.time() >= self.expires_at - self.refresh_margin)
+
+    def get_access_token(self) -> str:
+        """
+        Returns a valid access token, refreshing it first if it is about to expire.
+        """
+        if self.needs_refresh():
+            self.refresh(stale_token=self.access_token)
+        return self.access_token
+
+    def refresh(self, stale_token: str = None) -> str:
+        """
+        Exchanges the refresh token for a new token pair.
+
+        Concurrent callers are single-flighted: only the first one calls Webex, the others wait
+        for it and reuse its result. Passing 'stale_token' (the token that was just rejected)
+        forces a refresh unless another caller already replaced that token.
+
+        Args:
+            stale_token (str): Optional. The access token the caller considers invalid.
+
+        Returns:
+            str: The new access token.
+
+        Raises:
+            TokenError: If Webex does not return a new token pair.
+        """
+        with self._lock:
+            if self.access_token != stale_token and not self.needs_refresh():
+                # Someone else refreshed while we were waiting for the lock.
+                return self.access_token
+
+            headers = {'accept': 'application/json', 'content-type': 'application/x-www-form-urlencoded'}
+            payload = {
+                "grant_type": "refresh_token",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "refresh_token": self.refresh_token,
+            }
+            response = get_session().post(api_url("access_token"), data=payload, headers=headers)
+            if response.status_code != 200:
+                raise TokenError(f"Token refresh failed: {response.status_code} - {response.text}")
+            results = response.json()
+            if not results.get("access_token"):
+                raise TokenError(f"Token refresh returned no access token: {sorted(results)}")
+            try:
+                expires_in = int(results["expires_in"])
+            except (KeyError, TypeError, ValueError):
+                expires_in = 0
+            if expires_in <= 0:
+                # Without a lifetime the token would look expired at once and be refreshed in a loop.
+                log.warning("Token response without a valid 'expires_in', assuming %ss", DEFAULT_EXPIRES_IN)
+                expires_in = DEFAULT_EXPIRES_IN
+
+            self.access_token = results["access_token"]
+            self.refresh_token = results.get("refresh_token", self.refresh_token)
+            self.expires_at = time.time() + expires_in
+            self._save()
+            return self.access_token
+
+    def start(self):
+        """
+        Starts a background thread that refreshes the token before it expires.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, name="token-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background refresh thread.
+        """
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.needs_refresh():
+                    self.refresh(stale_token=self.access_token)
+                # Never sooner than RETRY_INTERVAL: a lifetime shorter than the margin must not
+                # turn into a refresh every second.
+                wait = max(RETRY_INTERVAL, self.expires_at - self.refresh_margin - time.time())
+            except Exception as e:
+                log.warning("Background token refresh failed, retrying in %ss: %s", RETRY_INTERVAL, e)
+                wait = RETRY_INTERVAL
+            self._stop.wait(wait)
+
+    @staticmethod
+    def _load_fernet():
+        key = os.getenv("TOKEN_STORE_KEY")
+        if not key:
+            return None
+        if Fernet is None:
+            raise ImportError("TOKEN_STORE_KEY is set but the 'cryptography' package is not installed")
+        return Fernet(key.encode())
+
+    def _save(self):
+        """
+        Persists the token pair. The file is replaced atomically and only readable by its owner.
+        """
+        if not self.store_path:
+            return
+        data = json.dumps({
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "expires_at": self.expires_at,
+        }).encode()
+        if self._fernet:
+            data = self._fernet.encrypt(data)
+
+        directory = os.path.dirname(os.path.abspath(self.store_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")  # Created with 0600 permissions.
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.store_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _load(self):
+        with open(self.store_path, "rb") as f:
+            data = f.read()
+        if self._fernet:
+            data = self._fernet.decrypt(data)
+        tokens = json.loads(data)
+        self.access_token = tokens["access_token"]
+        self.refresh_token = tokens["refresh_token"]
+        self.expires_at = tokens.get("expires_at")
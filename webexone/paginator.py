@@ -0,0 +1,178 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Prefetching paginator for Webex list endpoints.
+
+Webex list endpoints (/people, /rooms, /memberships, ...) return one page of 'items'
+plus a 'Link: <...>; rel="next"' header pointing at the following page. Walking those
+links one request at a time means the caller sits idle for a full round trip between
+pages. The 'Paginator' asks for the next page in the background as soon as the current
+one arrives, so the network round trip overlaps with the caller's own work.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from webexone.session import get_session
+
+# Webex list endpoints accept up to 1000 items per page (the default is 100).
+# Fewer, larger pages means fewer round trips, which dominates listing time.
+DEFAULT_PAGE_SIZE = 1000
+
+
+@dataclass
+class PaginationStats:
+    """
+    Throughput of a pagination run, used to tune the page size against the tenant's latency.
+    """
+    pages: int = 0
+    items: int = 0
+    elapsed: float = 0.0          # Wall time from the first request until the last page was received.
+    request_time: float = 0.0     # Total time spent waiting on HTTP requests.
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def average_page_latency(self) -> float:
+        return self.request_time / self.pages if self.pages else 0.0
+
+    def __str__(self):
+        return (f"{self.pages} pages, {self.items} items in {self.elapsed:.2f}s "
+                f"({self.pages_per_second:.2f} pages/s, {self.items_per_second:.1f} items/s, "
+                f"{self.average_page_latency * 1000:.0f} ms/page)")
+
+
+def with_page_size(url: str, page_size: int) -> str:
+    """
+    Adds a 'max' query parameter to the URL unless it already has one.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if page_size and not any(key == "max" for key, _ in query):
+        query.append(("max", str(page_size)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class Paginator:
+    """
+    Walks the 'Link: next' pages of a Webex list endpoint, prefetching the next page.
+
+    Example (sync):
+        paginator = Paginator(api_url("people"), access_token)
+        for page in paginator.pages():
+            ...
+        print(paginator.stats)
+
+    Example (async):
+        async for person in Paginator(api_url("people"), access_token):
+            ...
+    """
+
+    def __init__(self, url: str, access_token: str, page_size: int = DEFAULT_PAGE_SIZE,
+                 prefetch: bool = True, timeout: float = 30):
+        """
+        Args:
+            url (str): The first page URL (e.g. api_url("people")).
+            access_token (str): The Webex access token for authentication.
+            page_size (int): Items per page, added as 'max' unless the URL already sets it.
+            prefetch (bool): Request the next page while the caller processes the current one.
+            timeout (float): Timeout (seconds) for a single page request.
+        """
+        self.url = with_page_size(url, page_size)
+        self.access_token = access_token
+        self.prefetch = prefetch
+        self.timeout = timeout
+        self.stats = PaginationStats()
+
+    def fetch(self, url: str) -> requests.Response:
+        """
+        Requests one page.
+
+        Raises:
+            requests.HTTPError: If the API request fails (status code other than 200).
+        """
+        headers = {
+            'Authorization': f"Bearer {self.access_token}"
+        }
+        started = time.monotonic()
+        response = get_session().get(url, headers=headers, timeout=self.timeout)
+        self.stats.request_time += time.monotonic() - started
+        response.raise_for_status()
+        return response
+
+    def _page_received(self, response: requests.Response, started: float):
+        """
+        Updates the stats for a received page and returns its items and the next page URL.
+        """
+        items = response.json().get("items", [])
+        next_link = response.links.get("next")
+        self.stats.pages += 1
+        self.stats.items += len(items)
+        self.stats.elapsed = time.monotonic() - started
+        return items, next_link["url"] if next_link else None
+
+    def pages(self):
+        """
+        Yields the 'items' of each page, fetching the next page in the background.
+
+        Yields:
+            list: The items (dicts) of one page.
+        """
+        self.stats = PaginationStats()
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.fetch, self.url)
+            while future is not None:
+                items, next_url = self._page_received(future.result(), started)
+                # Ask for the next page before handing this one to the caller.
+                future = executor.submit(self.fetch, next_url) if next_url and self.prefetch else None
+                yield items
+                if next_url and not self.prefetch:
+                    future = executor.submit(self.fetch, next_url)
+
+    def __iter__(self):
+        """
+        Yields individual items across all pages.
+        """
+        for page in self.pages():
+            yield from page
+
+    async def apages(self):
+        """
+        Async version of 'pages()'. Requests run in a worker thread so the event loop is never blocked.
+
+        Yields:
+            list: The items (dicts) of one page.
+        """
+        self.stats = PaginationStats()
+        started = time.monotonic()
+        task = asyncio.ensure_future(asyncio.to_thread(self.fetch, self.url))
+        while task is not None:
+            items, next_url = self._page_received(await task, started)
+            task = asyncio.ensure_future(asyncio.to_thread(self.fetch, next_url)) if next_url and self.prefetch else None
+            yield items
+            if next_url and not self.prefetch:
+                task = asyncio.ensure_future(asyncio.to_thread(self.fetch, next_url))
+
+    async def __aiter__(self):
+        """
+        Async iterator over individual items across all pages.
+        """
+        async for page in self.apages():
+            for item in page:
+                yield item
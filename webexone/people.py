@@ -0,0 +1,48 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Streaming access to the Webex People API.
+
+'webex.people.list()' returns a lazy GeneratorContainer that only requests the next page
+when the current one has been consumed. Wrapping it in 'list()' throws that away: the
+whole directory is downloaded and held in memory before the first person can be used.
+These helpers keep the listing lazy, so work starts as soon as the first page arrives
+and memory stays flat regardless of the size of the organization.
+"""
+
+
+def iter_people(webex, page_size: int = None, **filters):
+    """
+    Yields people one by one, requesting further pages only when needed.
+
+    Args:
+        webex (WebexAPI): The client used to list people.
+        page_size (int): Optional. Number of people requested per page ('max' parameter).
+        **filters: Passed on to 'webex.people.list()' (e.g. email, displayName, id).
+
+    Yields:
+        webexpythonsdk.models.Person: One person at a time.
+    """
+    yield from webex.people.list(max=page_size, **filters)
+
+
+def first_person(webex, email: str = None, **filters):
+    """
+    Returns the first person matching the filters and stops paging right away.
+
+    This is the fast path for lookups like "find the person with this email":
+    only one person is requested and no further page is ever fetched.
+
+    Args:
+        webex (WebexAPI): The client used to list people.
+        email (str): Optional. The email address to look up.
+        **filters: Other filters passed on to 'webex.people.list()'.
+
+    Returns:
+        webexpythonsdk.models.Person: The first matching person, or None if nobody matches.
+    """
+    return next(iter_people(webex, page_size=1, email=email, **filters), None)
@@ -0,0 +1,331 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Rate limiting helpers shared by the scripts that fan out Webex API calls.
+
+- 'TokenBucket' caps the requests started per second by a fan-out.
+- 'AdaptiveLimit' caps the requests in flight to one endpoint with AIMD (additive increase,
+  multiplicative decrease): the limit grows by one per window of healthy answers and is
+  cut sharply on a 429 (the endpoint is also held for its 'Retry-After') or when the
+  latency climbs well above its baseline. '/messages', '/people' and '/devices' throttle
+  differently, so 'get_concurrency()' keeps one limit per "METHOD /resource" and the
+  pooled sessions (see 'webexone.session') apply it to every request.
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+
+from webexone.metrics import metrics
+
+# Webex answers '429 Too Many Requests' with a 'Retry-After' header (in seconds).
+# If the header is missing or malformed, the Webex SDK falls back to 15 seconds; so do we.
+DEFAULT_RETRY_AFTER = 15
+
+_concurrency = None
+_concurrency_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket limiting how many requests per second are sent.
+
+    Every request takes one token. Tokens refill at 'rate' per second up to 'capacity',
+    which allows short bursts while keeping the long-term rate under control.
+    When Webex answers with a 429, 'pause' stops handing out tokens to every worker
+    until the 'Retry-After' period has passed.
+    """
+
+    def __init__(self, rate: float, capacity: int = None):
+        """
+        Args:
+            rate (float): Number of tokens (requests) added per second.
+            capacity (int): Maximum number of tokens stored for bursts. Defaults to one second worth of tokens.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+        self.rate = float(rate)
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available (and any 'Retry-After' pause is over), then takes it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    # Refill the bucket with the tokens earned since the last update.
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Stops handing out tokens for the given number of seconds (e.g. a 429 'Retry-After').
+
+        Args:
+            seconds (float): How long every caller of 'acquire' must wait.
+        """
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._paused_until:
+                self._paused_until = resume_at
+                # Do not let tokens pile up while paused, otherwise all workers
+                # would burst straight back into the rate limit when it ends.
+                self._tokens = 0.0
+                self._updated = resume_at
+
+
+class AdaptiveLimit:
+    """
+    An AIMD concurrency limit for the requests to one endpoint.
+
+    Example:
+        limit = AdaptiveLimit("POST /messages")
+        started = limit.acquire()
+        response = session.post(...)
+        limit.release(started, response.status_code, retry_after=response.headers.get("Retry-After"))
+    """
+
+    def __init__(self, endpoint: str, initial: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 backoff: float = 0.5, latency_backoff: float = 0.9, latency_tolerance: float = 2.0):
+        """
+        Args:
+            endpoint (str): The endpoint, e.g. "POST /messages" (the label of the exported gauge).
+            initial (int): Requests in flight allowed at first.
+            min_limit (int): The limit never goes below this.
+            max_limit (int): The limit never goes above this.
+            backoff (float): Factor applied to the limit on a 429 (or a 503).
+            latency_backoff (float): Factor applied to the limit when the latency rises.
+            latency_tolerance (float): The latency "rises" when its moving average exceeds the
+                                       baseline (the lowest recent latency) by this factor.
+        """
+        self.endpoint = endpoint
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self.baseline = None      # Lowest recent latency, drifting slowly up.
+        self.smoothed = None      # Moving average of the latency.
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._publish()
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request to the endpoint may start (and any 'Retry-After' hold is over).
+
+        Returns:
+            float: The start time, to pass to 'release'.
+        """
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return time.monotonic()
+                self._condition.wait(wait if wait > 0 else None)
+
+    def release(self, started: float, status_code: int = None, retry_after: float = None, retried: bool = False):
+        """
+        Ends a request and adjusts the limit from its outcome.
+
+        Args:
+            started (float): What 'acquire' returned.
+            status_code (int): The HTTP status, or None if the request failed without an answer.
+            retry_after (float): Optional. The 'Retry-After' of a 429, in seconds.
+            retried (bool): The connection pool retried the request (its latency includes the retries).
+        """
+        now = time.monotonic()
+        latency = now - started
+        with self._condition:
+            # Only the first congestion signal of a window counts: requests started before the last
+            # decrease were sent under the old limit and would otherwise cut it again and again.
+            fresh = started >= self._last_decrease
+            if status_code in (429, 503):
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + float(retry_after))
+                if fresh:
+                    self._decrease(self.backoff, now)
+            elif status_code is not None and status_code < 500 and not retried:
+                self._observe(latency)
+                if self.smoothed > self.baseline * self.latency_tolerance:
+                    if fresh:
+                        self._decrease(self.latency_backoff, now)
+                elif self.in_flight >= self.limit / 2:
+                    # Grow only while the limit is actually used: about +1 per 'limit' healthy answers.
+                    self._set(self.limit + 1 / self.limit)
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _observe(self, latency: float):
+        if self.baseline is None:
+            self.baseline = self.smoothed = latency
+            return
+        self.smoothed += 0.2 * (latency - self.smoothed)
+        # Follow drops at once and rises slowly, so a slow period raises the baseline eventually.
+        self.baseline = latency if latency < self.baseline else self.baseline + 0.01 * (latency - self.baseline)
+
+    def _decrease(self, factor: float, now: float):
+        self._last_decrease = now
+        self._set(self.limit * factor)
+        # Start the next latency comparison from the current level.
+        self.smoothed = self.baseline
+
+    def _set(self, limit: float):
+        previous = int(self.limit)
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+        if int(self.limit) != previous:
+            self._publish()
+
+    def _publish(self):
+        metrics.set_gauge("webexone_concurrency_limit", int(self.limit),
+                          "Adaptive limit of the requests in flight per endpoint.", endpoint=self.endpoint)
+
+
+class AdaptiveConcurrency:
+    """
+    One 'AdaptiveLimit' per endpoint, created on first use.
+    """
+
+    def __init__(self, **options):
+        """
+        Args:
+            **options: Passed on to every 'AdaptiveLimit' (initial, min_limit, max_limit, ...).
+        """
+        self.options = options
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> AdaptiveLimit:
+        limit = self._limits.get(endpoint)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.get(endpoint)
+                if limit is None:
+                    limit = self._limits[endpoint] = AdaptiveLimit(endpoint, **self.options)
+        return limit
+
+    def limits(self) -> dict:
+        """
+        Returns the current limit of every endpoint seen so far: endpoint -> requests in flight allowed.
+        """
+        with self._lock:
+            return {endpoint: int(limit.limit) for endpoint, limit in sorted(self._limits.items())}
+
+
+def get_concurrency():
+    """
+    Returns the process-wide per-endpoint limits, or None when ADAPTIVE_CONCURRENCY is "0".
+
+    Settings (read on first use): ADAPTIVE_CONCURRENCY_INITIAL (default 4) and
+    ADAPTIVE_CONCURRENCY_MAX (default 64) requests in flight per endpoint.
+    """
+    global _concurrency
+    if os.getenv("ADAPTIVE_CONCURRENCY", "1") == "0":
+        return None
+    if _concurrency is None:
+        with _concurrency_lock:
+            if _concurrency is None:
+                _concurrency = AdaptiveConcurrency(initial=int(os.getenv("ADAPTIVE_CONCURRENCY_INITIAL", "4")),
+                                                   max_limit=int(os.getenv("ADAPTIVE_CONCURRENCY_MAX", "64")))
+    return _concurrency
+
+
+def status_code_from(error: Exception):
+    """
+    Returns the HTTP status code carried by an exception, if any.
+
+    Works for the Webex SDK 'ApiError' (which has 'status_code') and for
+    'requests' exceptions (which carry the 'response').
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+    return status_code
+
+
+def retry_after_from(error: Exception):
+    """
+    Returns the number of seconds Webex asked us to wait, or None if the error is not a 429.
+
+    Args:
+        error (Exception): The exception raised by the API call.
+
+    Returns:
+        float: Seconds to wait before retrying, or None.
+    """
+    # The Webex SDK already parses the header for us on 'RateLimitError'.
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+
+    if status_code_from(error) != 429:
+        return None
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(1.0, float(headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except (TypeError, ValueError):
+        return float(DEFAULT_RETRY_AFTER)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Decides whether a failed API call is worth retrying.
+
+    Rate limits (429), server side errors (5xx) and network problems are transient.
+    Anything else (400, 401, 404, ...) will fail again, so it is not retried.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    status_code = status_code_from(error)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+def with_retries(function, max_retries: int = 5, backoff: float = 1.0, max_backoff: float = 60.0):
+    """
+    Calls 'function()' and retries it on transient failures, waiting for the 'Retry-After' of a 429.
+
+    For the single calls of a bulk path that don't go through a 'Broadcaster' (e.g. a listing).
+
+    Returns:
+        What 'function()' returns.
+    """
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            return function()
+        except Exception as e:
+            if attempts > max_retries or not is_retryable(e):
+                raise
+            retry_after = retry_after_from(e)
+            if retry_after is None:
+                # Exponential backoff with jitter so retries do not line up.
+                retry_after = min(max_backoff, backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+            time.sleep(retry_after)
@@ -0,0 +1,223 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Bulk room provisioning: create rooms and add their members in parallel batches.
+
+A room plan lists room titles and the emails of their members. Provisioning runs in
+three steps, each of them batched or concurrent instead of one call at a time:
+
+1. All member emails are resolved at once through a 'PeopleIndex'.
+2. Missing rooms are created concurrently under a rate limit. Rooms the bot already
+   has with the same title are reused, so re-running a plan never duplicates rooms.
+3. Missing memberships are added concurrently. Existing members are skipped.
+"""
+
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from webexone.broadcast import DELIVERED, Broadcaster
+from webexone.directory import PeopleIndex
+from webexone.ratelimit import status_code_from, with_retries
+
+CREATED = "created"
+EXISTS = "exists"
+FAILED = "failed"
+NOT_FOUND = "not found"
+
+
+@dataclass
+class RoomSpec:
+    """
+    A room to provision and the emails of its members.
+    """
+    title: str
+    members: list = field(default_factory=list)
+
+
+@dataclass
+class ItemResult:
+    """
+    The outcome of provisioning one room or one membership.
+    """
+    kind: str            # "room" or "membership"
+    title: str
+    email: str = ""
+    status: str = ""
+    detail: str = ""
+
+
+@dataclass
+class ProvisioningReport:
+    """
+    Per-item results and throughput of a provisioning run.
+    """
+    results: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def count(self, kind: str, status: str) -> int:
+        return sum(1 for r in self.results if r.kind == kind and r.status == status)
+
+    @property
+    def items_per_second(self) -> float:
+        done = sum(1 for r in self.results if r.status == CREATED)
+        return done / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"Rooms: {self.count('room', CREATED)} created, {self.count('room', EXISTS)} existing, "
+                f"{self.count('room', FAILED)} failed. "
+                f"Memberships: {self.count('membership', CREATED)} created, "
+                f"{self.count('membership', EXISTS)} existing, {self.count('membership', NOT_FOUND)} unknown emails, "
+                f"{self.count('membership', FAILED)} failed. "
+                f"{self.elapsed:.1f}s ({self.items_per_second:.1f} items/s)")
+
+    def write_csv(self, path: str):
+        """
+        Writes the per-item results to a CSV file.
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["kind", "title", "email", "status", "detail"])
+            for r in self.results:
+                writer.writerow([r.kind, r.title, r.email, r.status, r.detail])
+
+
+def load_room_specs(path: str) -> list:
+    """
+    Reads a room plan from a CSV or JSON file.
+
+    CSV: a 'title' column and a 'members' column with emails separated by ';'.
+    One room may span several rows; its members are merged.
+        title,members
+        Cohort A,alice@example.com;bob@example.com
+
+    JSON: a list of objects with 'title' and 'members' (a list of emails).
+        [{"title": "Cohort A", "members": ["alice@example.com", "bob@example.com"]}]
+
+    Returns:
+        list: RoomSpec objects, one per distinct title.
+    """
+    specs = {}
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            rows = [(item["title"], item.get("members", [])) for item in json.load(f)]
+    else:
+        with open(path, newline="") as f:
+            rows = [(row["title"], (row.get("members") or "").split(";")) for row in csv.DictReader(f)]
+
+    for title, members in rows:
+        spec = specs.setdefault(title.strip(), RoomSpec(title.strip()))
+        for member in members:
+            member = member.strip()
+            if member and member.lower() not in (m.lower() for m in spec.members):
+                spec.members.append(member)
+    return list(specs.values())
+
+
+def provision_rooms(webex, specs: list, people_index: PeopleIndex = None,
+                    broadcaster: Broadcaster = None) -> ProvisioningReport:
+    """
+    Creates the rooms of a plan and adds their members, skipping anything that already exists.
+
+    Args:
+        webex (WebexAPI): The client used to create rooms and memberships. Create it with
+                          'wait_on_rate_limit=False' so 429s reach the broadcaster's limiter.
+        specs (list): RoomSpec objects (see 'load_room_specs').
+        people_index (PeopleIndex): Optional. Index used to resolve member emails in batch.
+        broadcaster (Broadcaster): Optional. Runs the requests concurrently under a rate limit.
+
+    Returns:
+        ProvisioningReport: Per-item results and throughput.
+    """
+    if people_index is None:  # Not 'or': an index that is still empty is falsy.
+        people_index = PeopleIndex(webex)
+    broadcaster = broadcaster or Broadcaster(max_workers=8, rate=5, keep_results=True)
+    report = ProvisioningReport()
+    started = time.monotonic()
+
+    # 1. Resolve every member email in one batch.
+    people = people_index.resolve_many(email for spec in specs for email in spec.members)
+
+    # 2. Reuse rooms the bot already has with the same title, create the others concurrently.
+    # The listings are retried on 429s too: the client doesn't wait on rate limits by itself.
+    rooms = {room.title: room for room in with_retries(lambda: list(webex.rooms.list(type="group", max=1000)))}
+    existing_titles = {spec.title for spec in specs if spec.title in rooms}
+    for title in existing_titles:
+        report.results.append(ItemResult("room", title, status=EXISTS, detail=rooms[title].id))
+
+    # Titles whose create failed after it may have reached Webex (5xx, timeout). Before such a
+    # create is retried, the title is looked up again so a room created anyway isn't duplicated.
+    uncertain = set()
+
+    def create_room(spec):
+        if spec.title in uncertain:
+            listing = with_retries(lambda: list(webex.rooms.list(type="group", max=1000)))
+            existing = next((room for room in listing if room.title == spec.title), None)
+            if existing is not None:
+                rooms[spec.title] = existing
+                return
+        try:
+            rooms[spec.title] = webex.rooms.create(title=spec.title)
+        except Exception as e:
+            # A 5xx or a timeout may come after the room was created; a 4xx (429 included) may not.
+            status_code = status_code_from(e)
+            if status_code is None or status_code >= 500:
+                uncertain.add(spec.title)
+            raise
+
+    summary = broadcaster.run([spec for spec in specs if spec.title not in existing_titles], create_room,
+                              idempotent=True)
+    for result in summary.results:
+        spec = result.recipient
+        if result.status == DELIVERED:
+            report.results.append(ItemResult("room", spec.title, status=CREATED, detail=rooms[spec.title].id))
+        else:
+            report.results.append(ItemResult("room", spec.title, status=FAILED, detail=result.error))
+
+    # 3. Find the current members of rooms that already existed, then add the missing ones concurrently.
+    def member_ids(title):
+        listing = with_retries(lambda: list(webex.memberships.list(roomId=rooms[title].id, max=1000)))
+        return title, {m.personId for m in listing}
+
+    with ThreadPoolExecutor(max_workers=broadcaster.max_workers) as executor:
+        current_members = dict(executor.map(member_ids, existing_titles))
+
+    memberships = []
+    for spec in specs:
+        if spec.title not in rooms:
+            continue  # Room creation failed.
+        for member_email in spec.members:
+            person = people.get(member_email)
+            if person is None:
+                report.results.append(ItemResult("membership", spec.title, member_email, NOT_FOUND))
+            elif person.id in current_members.get(spec.title, ()):
+                report.results.append(ItemResult("membership", spec.title, member_email, EXISTS))
+            else:
+                memberships.append((spec.title, member_email, person.id))
+
+    def add_member(membership):
+        title, _, person_id = membership
+        try:
+            webex.memberships.create(roomId=rooms[title].id, personId=person_id)
+        except Exception as e:
+            # 409 Conflict: the person became a member in the meantime.
+            if status_code_from(e) != 409:
+                raise
+
+    # Adding a member twice only gets a 409.
+    summary = broadcaster.run(memberships, add_member, idempotent=True)
+    for result in summary.results:
+        title, member_email, _ = result.recipient
+        if result.status == DELIVERED:
+            report.results.append(ItemResult("membership", title, member_email, CREATED))
+        else:
+            report.results.append(ItemResult("membership", title, member_email, FAILED, result.error))
+
+    report.elapsed = time.monotonic() - started
+    return report
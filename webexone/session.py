@@ -0,0 +1,212 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Shared, pooled HTTP session for the scripts that call the Webex REST API directly.
+
+Bare 'requests.get()'/'requests.post()' calls open a brand new TCP + TLS connection for
+every request. A single 'requests.Session' with a keep-alive connection pool reuses
+connections across calls, which removes the handshake from every request after the first.
+
+Settings can be tuned through environment variables (read when the session is created):
+
+- HTTP_POOL_SIZE: Connections kept alive per host (default 20).
+- HTTP_TIMEOUT: Timeout in seconds for a single request (default 30).
+- HTTP_RETRIES: Retries for connection errors, 429 and 503 answers (default 3).
+- WEBEX_BASE_URL: Base URL of the Webex API (default https://webexapis.com/v1/).
+- ADAPTIVE_CONCURRENCY: "0" turns off the adaptive per-endpoint limit of the requests in
+  flight (see 'webexone.ratelimit.AdaptiveLimit'), applied by the session and the SDK clients.
+"""
+
+import os
+import threading
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from webexone.metrics import endpoint_of, metrics
+from webexone.ratelimit import get_concurrency
+
+DEFAULT_BASE_URL = "https://webexapis.com/v1/"
+DEFAULT_POOL_SIZE = 20
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+
+_session = None
+_unretried_session = None
+_session_lock = threading.Lock()
+
+
+def api_url(path: str) -> str:
+    """
+    Builds an absolute Webex API URL, e.g. api_url("people") -> "https://webexapis.com/v1/people".
+
+    The base URL can be pointed elsewhere (e.g. a local mock server) with WEBEX_BASE_URL.
+    """
+    base_url = os.getenv("WEBEX_BASE_URL", DEFAULT_BASE_URL)
+    if not base_url.endswith("/"):
+        base_url += "/"
+    return urljoin(base_url, path.lstrip("/"))
+
+
+class WebexRetry(Retry):
+    """
+    A 'Retry' that replays non-idempotent requests (POST, PATCH) on a 429 only.
+
+    A 429 means Webex refused the request without processing it. A 503 from a proxy or a
+    busy backend may come after a message, room or device was created, and replaying it
+    would create a duplicate.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code != 429 and method.upper() not in Retry.DEFAULT_ALLOWED_METHODS:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def build_adapter(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                  retry_statuses: tuple = (429, 503), concurrency=None) -> HTTPAdapter:
+    """
+    Creates a connection-pooling adapter with the default retry behavior.
+
+    Only failures where Webex did not process the request are retried for every method:
+    - connection errors (the request never reached the server),
+    - 429 Too Many Requests (honoring the 'Retry-After' header).
+    503 Service Unavailable is only retried for idempotent methods (see 'WebexRetry'): a POST
+    may already have been applied. Read timeouts are not retried for the same reason.
+
+    Args:
+        pool_size (int): Number of connections kept alive per host.
+        retries (int): Maximum number of retries per request.
+        retry_statuses (tuple): Status codes retried by the adapter. Pass an empty tuple when the caller
+                                handles rate limits itself (e.g. the Webex SDK or the Broadcaster).
+        concurrency (AdaptiveConcurrency): Optional. Per-endpoint limits of the requests in flight
+                                           (see 'get_concurrency()').
+
+    Returns:
+        HTTPAdapter: The adapter to mount on a 'requests.Session'.
+    """
+    retry = WebexRetry(total=retries,
+                       connect=retries,
+                       read=0,
+                       status=retries,
+                       status_forcelist=retry_statuses,
+                       allowed_methods=None,         # Any method; 'WebexRetry' narrows the statuses per method.
+                       backoff_factor=0.5,
+                       respect_retry_after_header=bool(retry_statuses),
+                       raise_on_status=False)        # Hand the last response back instead of raising.
+    if concurrency is not None:
+        return LimitedAdapter(concurrency, pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+
+class LimitedAdapter(HTTPAdapter):
+    """
+    An adapter that waits for a slot of the request's endpoint before sending it, and feeds
+    the answer (status, 'Retry-After', latency) back to the endpoint's adaptive limit.
+    """
+
+    def __init__(self, concurrency, **kwargs):
+        super().__init__(**kwargs)
+        self.concurrency = concurrency
+
+    def send(self, request, **kwargs):
+        limit = self.concurrency.get(endpoint_of(request.method, request.url))
+        started = limit.acquire()
+        status_code = retry_after = None
+        retried = False
+        try:
+            response = super().send(request, **kwargs)
+            status_code = response.status_code
+            retry_after = response.headers.get("Retry-After")
+            retries = getattr(response.raw, "retries", None)
+            history = retries.history if retries is not None else ()
+            retried = bool(history)
+            # A 429 absorbed by the pool's own retries is still a congestion signal.
+            if any(attempt.status == 429 for attempt in history):
+                status_code = 429
+            return response
+        finally:
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            limit.release(started, status_code, retry_after=retry_after, retried=retried)
+
+
+class PooledSession(requests.Session):
+    """
+    A 'requests.Session' with a keep-alive connection pool, retries and a default timeout.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES):
+        """
+        Args:
+            pool_size (int): Number of connections kept alive per host.
+            timeout (float): Default timeout (seconds) applied to requests that do not set one.
+            retries (int): Maximum number of retries per request.
+        """
+        super().__init__()
+        self.timeout = timeout
+        adapter = build_adapter(pool_size, retries, concurrency=get_concurrency())
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def get_session() -> PooledSession:
+    """
+    Returns the process-wide pooled session, creating it on first use.
+
+    Returns:
+        PooledSession: The shared session. It is safe to use from several threads.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = PooledSession(pool_size=int(os.getenv("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                                         timeout=float(os.getenv("HTTP_TIMEOUT", DEFAULT_TIMEOUT)),
+                                         retries=int(os.getenv("HTTP_RETRIES", DEFAULT_RETRIES)))
+                # Every API call made through the session is counted (see 'webexone.metrics').
+                metrics.instrument_session(_session)
+    return _session
+
+
+def get_unretried_session() -> PooledSession:
+    """
+    Returns a process-wide pooled session that never replays a request (no retries at all).
+
+    For creates the caller retries itself after checking they didn't go through (e.g. the
+    meeting scheduler), so the connection pool can't send the same POST twice behind its back.
+    """
+    global _unretried_session
+    if _unretried_session is None:
+        with _session_lock:
+            if _unretried_session is None:
+                _unretried_session = PooledSession(pool_size=int(os.getenv("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                                                   timeout=float(os.getenv("HTTP_TIMEOUT", DEFAULT_TIMEOUT)),
+                                                   retries=0)
+                metrics.instrument_session(_unretried_session)
+    return _unretried_session
+
+
+def _close_inherited_connections():
+    # A forked worker process must not share keep-alive sockets with its parent.
+    # Closing the session drops the inherited connections; new ones are opened on demand.
+    for session in (_session, _unretried_session):
+        if session is not None:
+            session.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_close_inherited_connections)
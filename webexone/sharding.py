@@ -0,0 +1,409 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Horizontally scaled bots: several worker processes share the load of one bot.
+
+Every worker process opens its own websocket and receives every activity. Activities are
+split into a fixed number of partitions by room (or person) ID, and each partition is
+owned by exactly one worker at a time, so a conversation is always handled by the same
+worker, in order. Ownership is coordinated through a small lease table in a SQLite file
+(the "broker"):
+
+- every worker heartbeats its leases and claims its fair share of the partitions,
+- a partition whose owner stopped heartbeating is claimed by another worker once its
+  lease expires,
+- a worker that stops cleanly releases its partitions right away, and the first worker
+  below its fair share that receives an activity of a released partition claims it.
+
+Activities of partitions owned by another worker are dropped before the message is even
+fetched, so the per-activity work is really divided between the workers. Activities of a
+partition nobody owns (its owner died and the lease hasn't expired yet, or it was just
+released) are kept by every worker until one of them claims the partition: that worker
+handles them, the others drop theirs.
+
+The broker file must be reachable by every worker: a local file for several processes on
+one host, a shared volume for several hosts. 'create_bot' picks the sharded bot when
+BOT_PARTITIONS is set:
+
+    BOT_PARTITIONS=16 python 06-usecases/01_feedback.py   # Start this as many times as needed.
+"""
+
+import asyncio
+import atexit
+import logging
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from webex_bot.webex_bot import WebexBot
+
+from webexone.logs import setup_logging
+from webexone.metrics import instrument_bot
+
+log = logging.getLogger(__name__)
+
+# Activities of an unowned partition kept, at most, until a worker claims it.
+MAX_DEFERRED = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    partition INTEGER PRIMARY KEY,
+    owner TEXT,
+    lease_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    seen REAL NOT NULL
+);
+"""
+
+
+def partition_of(key: str, partitions: int) -> int:
+    """
+    Maps a room or person ID to a partition. Stable across processes and hosts
+    (unlike Python's 'hash', which is randomized per process).
+    """
+    return zlib.crc32(key.encode()) % partitions
+
+
+class PartitionBroker:
+    """
+    Leases partitions to worker processes through a SQLite file.
+    """
+
+    def __init__(self, path: str, partitions: int, worker_id: str = None, lease: float = 15.0):
+        """
+        Args:
+            path (str): The broker database file, shared by every worker.
+            partitions (int): Number of partitions. Must be the same for every worker.
+            worker_id (str): Optional. Unique name of this worker. Defaults to hostname and PID.
+            lease (float): Seconds a partition stays owned without a heartbeat.
+        """
+        self.path = path
+        self.partitions = partitions
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease = lease
+        self.owned = frozenset()
+        self.owners = {}
+        self.share = partitions
+        self._local = threading.local()
+        db = self._connect()
+        db.executescript(SCHEMA)
+        db.executemany("INSERT OR IGNORE INTO partitions (partition) VALUES (?)",
+                       ((number,) for number in range(partitions)))
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def fair_share(self, live_workers: int) -> int:
+        return math.ceil(self.partitions / max(1, live_workers))
+
+    def heartbeat(self) -> frozenset:
+        """
+        Renews this worker's leases, claims free partitions up to its fair share and releases
+        the partitions above it (when new workers joined).
+
+        Returns:
+            frozenset: The partitions owned by this worker.
+        """
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("INSERT OR REPLACE INTO workers (id, seen) VALUES (?, ?)", (self.worker_id, now))
+            db.execute("DELETE FROM workers WHERE seen < ?", (now - self.lease,))
+            live = db.execute("SELECT COUNT(*) FROM workers").fetchone()[0]
+            share = self.fair_share(live)
+
+            owned = [row[0] for row in db.execute(
+                "SELECT partition FROM partitions WHERE owner = ? AND lease_until >= ? ORDER BY partition",
+                (self.worker_id, now))]
+            if len(owned) > share:
+                # Hand the extra partitions over to the new workers.
+                extra = owned[share:]
+                owned = owned[:share]
+                db.executemany("UPDATE partitions SET owner = NULL, lease_until = 0 WHERE partition = ?",
+                               ((number,) for number in extra))
+            elif len(owned) < share:
+                free = [row[0] for row in db.execute(
+                    "SELECT partition FROM partitions WHERE owner IS NULL OR lease_until < ? ORDER BY partition LIMIT ?",
+                    (now, share - len(owned)))]
+                owned += free
+            db.executemany("UPDATE partitions SET owner = ?, lease_until = ? WHERE partition = ?",
+                           ((self.worker_id, now + self.lease, number) for number in owned))
+            owners = {partition: (owner, seen) for partition, owner, seen in db.execute(
+                "SELECT partitions.partition, partitions.owner, workers.seen FROM partitions "
+                "JOIN workers ON workers.id = partitions.owner WHERE partitions.lease_until >= ?", (now,))}
+        self.owners = owners
+        self.owned = frozenset(owned)
+        self.share = share
+        return self.owned
+
+    def try_claim(self, partition: int) -> bool:
+        """
+        Claims a single partition if nobody owns it (e.g. it was just released by another worker)
+        and this worker is below its fair share.
+
+        Returns:
+            bool: True if this worker owns the partition now.
+        """
+        if len(self.owned) >= self.share:
+            return False
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            claimed = db.execute("UPDATE partitions SET owner = ?, lease_until = ? "
+                                 "WHERE partition = ? AND (owner IS NULL OR lease_until < ?)",
+                                 (self.worker_id, now + self.lease, partition, now)).rowcount
+        if claimed:
+            self.owned = self.owned | {partition}
+            self.owners = {**self.owners, partition: (self.worker_id, now)}
+        return bool(claimed)
+
+    def owner(self, partition: int):
+        """
+        The live worker owning a partition, as of the last heartbeat.
+
+        Returns:
+            str: The worker ID, or None if nobody owns the partition, or its owner hasn't
+            heartbeated for half a lease (it most likely died, its lease just hasn't expired yet).
+        """
+        owner, seen = self.owners.get(partition, (None, 0))
+        if owner == self.worker_id or time.time() - seen <= self.lease / 2:
+            return owner
+        return None
+
+    def release(self):
+        """
+        Gives up every partition of this worker (clean shutdown).
+        """
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("UPDATE partitions SET owner = NULL, lease_until = 0 WHERE owner = ?", (self.worker_id,))
+            db.execute("DELETE FROM workers WHERE id = ?", (self.worker_id,))
+        self.owned = frozenset()
+        self.owners = {}
+
+
+class _RoutingExecutor(ThreadPoolExecutor):
+    """
+    The event loop's default executor: runs the given function inline, in the event loop thread,
+    and everything else on the pool.
+    """
+
+    def __init__(self, inline, **kwargs):
+        super().__init__(**kwargs)
+        self.inline = inline
+
+    def submit(self, fn, /, *args, **kwargs):
+        if fn != self.inline:
+            return super().submit(fn, *args, **kwargs)
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class ShardedWebexBot(WebexBot):
+    """
+    A 'WebexBot' that only handles the activities of the partitions it owns.
+
+    Activities of the same partition are handled one at a time, in the order they arrived,
+    so a conversation never sees its replies reordered. Different partitions run in parallel.
+    'WebexBot' hands every websocket message to a thread pool, so two messages could reach their
+    partition in any order: the activities are put in their partition's lane in the event loop
+    thread instead, before the hop to the pool.
+    """
+
+    def __init__(self, broker: PartitionBroker, partition_by: str = "room", max_workers: int = 8,
+                 heartbeat_interval: float = None, **kwargs):
+        """
+        Args:
+            broker (PartitionBroker): Coordinates partition ownership with the other workers.
+            partition_by (str): "room" (default) or "person": what an activity is partitioned by.
+            max_workers (int): Partitions processed at the same time by this worker.
+            heartbeat_interval (float): Optional. Seconds between heartbeats. Defaults to a third of the lease.
+            **kwargs: Passed on to 'WebexBot'.
+        """
+        super().__init__(**kwargs)
+        self.broker = broker
+        self.partition_by = partition_by
+        self.heartbeat_interval = heartbeat_interval or broker.lease / 3
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="partition")
+        self._lanes = {}  # partition -> deque of pending websocket messages
+        self._deferred = {}  # partition -> deque of the messages received while nobody owned it
+        self._claim_attempts = {}  # partition -> time of the last claim attempt
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        broker.heartbeat()
+        threading.Thread(target=self._heartbeat_loop, name="partition-heartbeat", daemon=True).start()
+        atexit.register(self.shutdown)
+
+    def partition_key(self, activity: dict) -> str:
+        if self.partition_by == "person":
+            return activity.get("actor", {}).get("id", "")
+        return activity.get("target", {}).get("globalId", "")
+
+    def run(self):
+        # 'WebexBot.run' hands each websocket message over with 'loop.run_in_executor(None, ...)':
+        # route it to its lane right there, in the event loop thread, so the lanes keep the
+        # order the messages arrived in.
+        asyncio.get_event_loop().set_default_executor(
+            _RoutingExecutor(self._process_incoming_websocket_message, thread_name_prefix="websocket"))
+        super().run()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.broker.heartbeat()
+            except sqlite3.Error as e:
+                log.warning("Partition heartbeat failed: %s", e)
+            # Let the lanes of the deferred partitions check whether a worker claimed them.
+            with self._lock:
+                deferred = list(self._deferred)
+            for partition in deferred:
+                self._enqueue(partition, None)
+
+    def _process_incoming_websocket_message(self, msg):
+        """
+        Routes a websocket activity to its partition's lane. Runs in the event loop thread: no I/O here.
+        """
+        activity = msg.get("data", {}).get("activity")
+        if msg.get("data", {}).get("eventType") != "conversation.activity" or not activity:
+            return
+        self._enqueue(partition_of(self.partition_key(activity), self.broker.partitions), msg)
+
+    def _enqueue(self, partition: int, msg):
+        # A None message only makes the lane look at its deferred messages again.
+        with self._lock:
+            lane = self._lanes.get(partition)
+            if lane is not None:
+                # This partition is already being processed: keep the order.
+                lane.append(msg)
+                return
+            self._lanes[partition] = deque([msg])
+        self._executor.submit(self._drain, partition)
+
+    def _owner(self, partition: int):
+        if partition in self.broker.owned:
+            return self.broker.worker_id
+        owner = self.broker.owner(partition)
+        if owner is None and self._claim(partition):
+            return self.broker.worker_id
+        return owner
+
+    def _claim(self, partition: int) -> bool:
+        # Try at most once per second per partition, so a busy partition owned by
+        # another worker doesn't turn every activity into a database write.
+        now = time.monotonic()
+        with self._lock:
+            if now - self._claim_attempts.get(partition, 0) < 1.0:
+                return False
+            self._claim_attempts[partition] = now
+        try:
+            return self.broker.try_claim(partition)
+        except sqlite3.Error as e:
+            log.warning("Could not claim the partition: %s", e, extra={"partition": partition})
+            return False
+
+    def _drain(self, partition: int):
+        # Only one '_drain' runs per partition at a time (the one that created its lane).
+        while True:
+            with self._lock:
+                lane = self._lanes[partition]
+                if not lane:
+                    del self._lanes[partition]
+                    return
+                msg = lane.popleft()
+
+            owner = self._owner(partition)
+            if owner is None:
+                # Nobody owns the partition right now: keep the activity until somebody does.
+                if msg is not None:
+                    with self._lock:
+                        deferred = self._deferred.setdefault(partition, deque(maxlen=MAX_DEFERRED))
+                        if len(deferred) == deferred.maxlen:
+                            log.warning("Too many activities waiting for the partition to be claimed, "
+                                        "dropping the oldest", extra={"partition": partition})
+                        deferred.append(msg)
+                continue
+
+            with self._lock:
+                messages = list(self._deferred.pop(partition, ()))
+            if owner != self.broker.worker_id:
+                # Another worker owns it and handles its own copy of these activities.
+                continue
+            if msg is not None:
+                messages.append(msg)
+            for message in messages:
+                try:
+                    super()._process_incoming_websocket_message(message)
+                except Exception:
+                    log.exception("Error processing an activity", extra={"partition": partition})
+
+    def shutdown(self):
+        """
+        Stops heartbeating and releases the partitions, so the other workers take them over immediately.
+        """
+        if not self._stop.is_set():
+            self._stop.set()
+            self.broker.release()
+
+
+def create_bot(**kwargs) -> WebexBot:
+    """
+    Creates the bot of an entry point script: a 'WebhookBot' when BOT_INGRESS is "webhook",
+    a 'ShardedWebexBot' when BOT_PARTITIONS is set, a plain 'WebexBot' otherwise.
+    Every command is timed and the 'stats' command is added for STATS_ADMINS (see 'webexone.metrics'), and
+    logging goes through the buffered JSON pipeline (see 'webexone.logs', LOG_LEVEL).
+
+    Environment:
+        BOT_INGRESS: "websocket" (default) or "webhook" (see 'webexone.webhooks', uses WEBHOOK_SECRET).
+        BOT_PARTITIONS: Number of partitions (e.g. 16). Use the same value for every worker.
+        BOT_PARTITION_BY: "room" (default) or "person".
+        BOT_BROKER_PATH: The broker file shared by the workers (default 'bot_partitions.sqlite3').
+        METRICS_PORT: Optional. Port of the Prometheus '/metrics' endpoint.
+        STATS_ADMINS: Optional. Emails allowed to run 'stats', comma-separated.
+
+    Args:
+        **kwargs: Passed on to 'WebexBot' (teams_bot_token, bot_name, approved_domains, ...).
+    """
+    setup_logging()
+    bot = _build_bot(**kwargs)
+    # 'WebexBot.__init__' adds its own (blocking, unredacted) 'coloredlogs' handler to the root
+    # logger: take it out again so everything goes through the queue.
+    setup_logging(force=True)
+    return instrument_bot(bot)
+
+
+def _build_bot(**kwargs) -> WebexBot:
+    if os.getenv("BOT_INGRESS", "websocket").lower() == "webhook":
+        # Imported here: the webhook mode is optional and pulls in the WSGI server.
+        from webexone.webhooks import WebhookBot
+        return WebhookBot(webhook_secret=os.getenv("WEBHOOK_SECRET"), **kwargs)
+
+    partitions = os.getenv("BOT_PARTITIONS")
+    if not partitions:
+        return WebexBot(**kwargs)
+    broker = PartitionBroker(os.getenv("BOT_BROKER_PATH", "bot_partitions.sqlite3"), int(partitions))
+    log.info("Starting bot worker", extra={"worker_id": broker.worker_id, "partitions": partitions})
+    return ShardedWebexBot(broker, partition_by=os.getenv("BOT_PARTITION_BY", "room"), **kwargs)
@@ -0,0 +1,347 @@
+"""
+Webex One 2025 - Exploring the possibilities of Webex APIs
+
+- Adam Weeks
+- Diego Manuel Jimenez Moreno
+- Phil Bellanti
+
+Webhook ingress for bots, as an alternative to the websocket loop of 'WebexBot.run()'.
+
+A websocket bot holds one connection per process and can't sit behind a load balancer.
+'WebhookBot' instead receives Webex webhooks over HTTP and runs the very same 'Command'
+classes ('add_command' works as usual):
+
+- every payload's 'X-Spark-Signature' (HMAC-SHA1 of the body with the webhook secret) is
+  verified before anything else,
+- the message or attachment action the webhook points to is fetched with the shared,
+  pooled client of the bot token,
+- the server is pre-forked into several worker processes sharing one listening socket
+  (WEBHOOK_PROCESSES), each serving requests on threads,
+- redelivered webhooks are ignored, whichever worker process they land on: the IDs of the
+  handled webhooks are kept for 10 minutes in a SQLite file shared by the workers
+  (WEBHOOK_DEDUPE_PATH), so a redelivery is also ignored after a restart.
+
+Payloads can be recorded to a JSON Lines file (WEBHOOK_RECORD_PATH) and replayed later
+against a local receiver with 'replay()' (CLI: '03-bots/10_webhook_replay.py').
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from webex_bot.webex_bot import WebexBot
+
+from webexone.cache import MISSING, PersonCache, TTLCache
+from webexone.clients import get_client
+from webexone.session import get_session
+
+log = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Spark-Signature"
+
+# Resources/events the bot subscribes to.
+WEBHOOKS = (("messages", "created"), ("attachmentActions", "created"))
+
+# Seconds a handled webhook ID is remembered (Webex redelivers within minutes).
+DEDUPE_TTL = 600
+
+
+class DeliveryStore:
+    """
+    IDs of the webhooks already handled, shared by every worker process through a SQLite file.
+    """
+
+    def __init__(self, path: str, ttl: float = DEDUPE_TTL):
+        """
+        Args:
+            path (str): The SQLite database file. Created if it doesn't exist.
+            ttl (float): Seconds an ID is remembered.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._inserts = 0
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS deliveries (key TEXT PRIMARY KEY, received REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the SQLite connection of the current thread in this process (connections
+        can't be shared between threads, nor inherited by a forked worker).
+        """
+        pid, db = getattr(self._local, "db", (None, None))
+        if pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = (os.getpid(), db)
+        return db
+
+    def first_delivery(self, key: str) -> bool:
+        """
+        Records a webhook ID. Returns False if any worker already recorded it within the TTL.
+        """
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT received FROM deliveries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] > now - self.ttl:
+                return False
+            db.execute("INSERT OR REPLACE INTO deliveries (key, received) VALUES (?, ?)", (key, now))
+        self._inserts += 1
+        if self._inserts % 1000 == 0:
+            # Keep the file small: forget the IDs older than the TTL now and then.
+            with db:
+                db.execute("DELETE FROM deliveries WHERE received <= ?", (now - self.ttl,))
+        return True
+
+
+def sign(body: bytes, secret: str) -> str:
+    """
+    Computes the signature Webex sends in 'X-Spark-Signature' for a payload.
+    """
+    return hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+
+
+def verify_signature(body: bytes, signature: str, secret: str) -> bool:
+    """
+    Checks a webhook payload against its 'X-Spark-Signature' header (constant-time comparison).
+    """
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature)
+
+
+def register_webhooks(webex, target_url: str, secret: str, name: str = "WebexOne2025 bot"):
+    """
+    Creates (or updates) the bot's webhooks so they point at 'target_url' and use 'secret'.
+    Webhooks are matched by name, resource and event, so calling this again never duplicates them.
+    """
+    existing = {(w.resource, w.event): w for w in webex.webhooks.list() if w.name == name}
+    for resource, event in WEBHOOKS:
+        webhook = existing.get((resource, event))
+        if webhook is None:
+            webex.webhooks.create(name=name, targetUrl=target_url, resource=resource, event=event, secret=secret)
+        elif webhook.targetUrl != target_url or webhook.status != "active":
+            webex.webhooks.update(webhook.id, name=name, targetUrl=target_url, secret=secret, status="active")
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass  # One access log line per webhook is just noise.
+
+
+class WebhookBot(WebexBot):
+    """
+    A 'WebexBot' fed by webhooks instead of a websocket.
+
+    Example:
+        bot = WebhookBot(webhook_secret=secret, teams_bot_token=bot_token, bot_name="WebexOne2025")
+        bot.add_command(AutoProvisioning())
+        bot.run()   # Serves http://WEBHOOK_HOST:WEBHOOK_PORT/
+    """
+
+    def __init__(self, webhook_secret: str, max_workers: int = 8, **kwargs):
+        """
+        Args:
+            webhook_secret (str): The secret the webhooks were registered with.
+            max_workers (int): Webhooks processed at the same time by each worker process.
+            **kwargs: Passed on to 'WebexBot' (teams_bot_token, bot_name, approved_domains, ...).
+        """
+        if not webhook_secret:
+            raise ValueError("A webhook secret is required to verify the payload signatures")
+        super().__init__(**kwargs)
+        self.webhook_secret = webhook_secret
+        self.max_workers = max_workers
+        self._executor = None
+        self._seen = TTLCache(maxsize=10000, ttl=DEDUPE_TTL)  # IDs of the webhooks this process handled.
+        self._seen_lock = threading.Lock()
+        # The same IDs, shared with the other worker processes.
+        self._deliveries = DeliveryStore(os.getenv("WEBHOOK_DEDUPE_PATH", "webhook_deliveries.sqlite3"))
+        self._room_types = TTLCache(maxsize=4096, ttl=3600)
+        # Senders of card submissions, looked up once even when many of their webhooks arrive together.
+        self._people = PersonCache(self.teams)
+        self._record_path = os.getenv("WEBHOOK_RECORD_PATH")
+        self._record_lock = threading.Lock()
+
+    def _get_device_url(self):
+        # No websocket is opened in webhook mode, so no device is registered.
+        return None
+
+    def get_me_info(self):
+        # Called once by 'WebexBot.__init__': switch the bot to the shared pooled client
+        # (which honors WEBEX_BASE_URL) before its first API call.
+        self.teams = get_client(self.access_token)
+        return super().get_me_info()
+
+    def handle(self, body: bytes, signature: str) -> int:
+        """
+        Verifies and accepts one webhook payload. The command runs in the background.
+
+        Returns:
+            int: The HTTP status to answer with.
+        """
+        if not verify_signature(body, signature, self.webhook_secret):
+            log.warning("Rejected a webhook with an invalid signature")
+            return 401
+        try:
+            payload = json.loads(body)
+            data = payload["data"]
+            key = (payload["resource"], data["id"])
+        except (ValueError, KeyError, TypeError):
+            return 400
+
+        with self._seen_lock:
+            if self._seen.get(key) is not MISSING:
+                return 200  # Redelivery of a webhook this process already handled.
+            self._seen.set(key, True)
+        try:
+            if not self._deliveries.first_delivery("/".join(key)):
+                return 200  # Redelivery of a webhook another worker already handled.
+        except sqlite3.Error as e:
+            # Better to run a command twice than to drop it.
+            log.warning("Could not check the webhook against the shared deliveries: %s", e)
+
+        with self._seen_lock:
+            if self._executor is None:
+                # Created on first use, so each pre-forked worker gets its own threads.
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="webhook")
+        if self._record_path:
+            with self._record_lock, open(self._record_path, "a") as f:
+                f.write(json.dumps({"body": body.decode(), "signature": signature}) + "\n")
+
+        self._executor.submit(self._process, payload)
+        return 200
+
+    def _process(self, payload: dict):
+        data = payload["data"]
+        try:
+            if payload["resource"] == "messages" and payload["event"] == "created":
+                if data.get("personEmail") == self.bot_email:
+                    return  # Our own message: don't even fetch it.
+                teams_message = self.teams.messages.get(data["id"])
+                self.process_incoming_message(teams_message, self._activity(payload, teams_message))
+            elif payload["resource"] == "attachmentActions" and payload["event"] == "created":
+                attachment_actions = self.teams.attachment_actions.get(data["id"])
+                self.process_incoming_card_action(attachment_actions, self._activity(payload, attachment_actions))
+        except Exception:
+            log.exception("Error processing a webhook", extra={"resource": payload.get("resource"), "id": data.get("id")})
+
+    def _activity(self, payload: dict, item) -> dict:
+        """
+        Builds the subset of a websocket activity that 'WebexBot' reads from a webhook payload.
+        """
+        data = payload["data"]
+        email = getattr(item, "personEmail", None) or self._person_email(item.personId)
+        activity = {
+            "actor": {"id": data.get("personId"), "emailAddress": email,
+                      "type": "BOT" if email and email.endswith("@webex.bot") else "PERSON"},
+            "target": {"globalId": data.get("roomId"),
+                       "tags": ["ONE_ON_ONE"] if self._room_type(data) == "direct" else []},
+        }
+        if payload["resource"] == "messages":
+            # Reply in the thread of the message (or of its parent if it already is a reply).
+            parent_id = getattr(item, "parentId", None)
+            if parent_id:
+                activity["parent"] = {"type": "reply", "id": parent_id}
+            else:
+                activity["id"] = item.id
+        return activity
+
+    def _room_type(self, data: dict) -> str:
+        if data.get("roomType"):
+            return data["roomType"]
+        room_type = self._room_types.get(data["roomId"])
+        if room_type is MISSING:
+            room_type = self.teams.rooms.get(data["roomId"]).type
+            self._room_types.set(data["roomId"], room_type)
+        return room_type
+
+    def _person_email(self, person_id: str) -> str:
+        person = self._people.get(person_id)
+        return person.emails[0] if person and person.emails else None
+
+    def wsgi_app(self, environ, start_response):
+        """
+        The WSGI application receiving the webhooks (POST, any path).
+        """
+        if environ["REQUEST_METHOD"] != "POST":
+            start_response("405 Method Not Allowed", [("Content-Type", "text/plain")])
+            return [b"Method Not Allowed"]
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        body = environ["wsgi.input"].read(length)
+        status = self.handle(body, environ.get("HTTP_X_SPARK_SIGNATURE", ""))
+        reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized"}[status]
+        start_response(f"{status} {reason}", [("Content-Type", "text/plain")])
+        return [reason.encode()]
+
+    def run(self):
+        """
+        Serves the webhooks. Registers them first when WEBHOOK_URL (the public URL of this receiver) is set.
+
+        Environment:
+            WEBHOOK_HOST / WEBHOOK_PORT: Address to listen on (default 0.0.0.0:8080).
+            WEBHOOK_PROCESSES: Number of worker processes sharing the listening socket (default 1).
+            WEBHOOK_DEDUPE_PATH: File of the handled webhook IDs, shared by the workers
+                                 (default 'webhook_deliveries.sqlite3').
+            WEBHOOK_URL: Optional. Public URL the webhooks are registered with.
+        """
+        target_url = os.getenv("WEBHOOK_URL")
+        if target_url:
+            register_webhooks(self.teams, target_url, self.webhook_secret)
+
+        server = make_server(os.getenv("WEBHOOK_HOST", "0.0.0.0"), int(os.getenv("WEBHOOK_PORT", "8080")),
+                             self.wsgi_app, server_class=_ThreadingWSGIServer,
+                             handler_class=_QuietRequestHandler)
+        processes = int(os.getenv("WEBHOOK_PROCESSES", "1"))
+        if processes > 1 and not hasattr(os, "fork"):
+            raise RuntimeError("WEBHOOK_PROCESSES > 1 requires a platform with os.fork()")
+        # Pre-fork: every child accepts connections on the socket opened above.
+        for _ in range(processes - 1):
+            if os.fork() == 0:
+                break
+        log.info("Webhook worker listening on %s:%s", *server.server_address[:2], extra={"pid": os.getpid()})
+        server.serve_forever()
+
+
+def replay(url: str, path: str, secret: str = None) -> list:
+    """
+    Posts recorded webhook payloads to a receiver, e.g. a local 'WebhookBot'.
+
+    Args:
+        url (str): The receiver URL.
+        path (str): JSON Lines file written with WEBHOOK_RECORD_PATH, or a JSON list of payloads.
+        secret (str): Optional. Re-signs every payload with this secret (needed for hand-written
+                      payloads, or when the receiver uses another secret than the recording).
+
+    Returns:
+        list: The HTTP status of every delivery.
+    """
+    with open(path) as f:
+        if path.lower().endswith(".json"):
+            records = [{"body": json.dumps(payload)} for payload in json.load(f)]
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    statuses = []
+    for record in records:
+        body = record["body"].encode()
+        signature = sign(body, secret) if secret else record.get("signature", "")
+        response = get_session().post(url, data=body, headers={"Content-Type": "application/json",
+                                                               SIGNATURE_HEADER: signature})
+        statuses.append(response.status_code)
+    return statuses